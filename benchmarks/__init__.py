@@ -0,0 +1 @@
+# Scripts de medição de desempenho do painel SPAECE (executar a partir da raiz: python -m benchmarks.<script>)
@@ -0,0 +1,83 @@
+import argparse                                     # Lib nativa para a linha de comando
+import json                                         # Lib nativa para troca de resultados entre processos
+import os
+import subprocess                                   # Lib nativa para medir cada modo em um processo novo (partida do servidor)
+import sys
+import tempfile
+import time
+
+from benchmarks.latencia import PAGINAS, abre_pagina, servidor_local, _erros
+from benchmarks.sintetico import gera_memoria
+from spaece.carregamento import ARQUIVO_CE, ARQUIVO_MUN
+
+
+# Tempo até a primeira renderização de cada página (sessão nova com os filtros padrão) logo após a partida do processo:
+# 'frio' = sem cache em disco e sem aquecimento (primeira partida após um deploy), 'reinício' = CSVs já em disco, mas
+# sem aquecimento, 'aquecido' = sem cache em disco, com spaece.aquecimento antes da primeira sessão (a duração do
+# aquecimento é relatada à parte: é o tempo a mais da partida). Cada modo roda em um processo novo; as tabelas são
+# servidas por um servidor HTTP local. Relata também as etapas desenhadas na renderização (falhas do cache de figuras).
+# Uso: python -m benchmarks.aquecimento [--escala 1] [--paginas ce mun crede]
+
+MODOS = ['frio', 'reinício', 'aquecido']
+
+
+## Funcao que mede, no processo atual, o aquecimento (se pedido) e a primeira renderização de cada página
+def mede(modo, paginas, timeout):
+    from spaece.aquecimento import aquece
+    from spaece.cache_figuras import estatisticas_figuras
+
+    resultado = {'modo': modo, 'aquecimento_ms': None, 'paginas': {}}
+    if modo == 'aquecido':
+        resultado['aquecimento_ms'] = aquece()['total_ms']
+    for pagina in paginas:
+        falhas = estatisticas_figuras()['falhas']
+        inicio = time.perf_counter()
+        arvore = abre_pagina(PAGINAS[pagina]['script'], timeout)
+        resultado['paginas'][pagina] = {'primeira_renderizacao_ms': round((time.perf_counter() - inicio) * 1000, 1),
+                                        'etapas_desenhadas': estatisticas_figuras()['falhas'] - falhas,
+                                        'erros': _erros(arvore)}
+    return resultado
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--paginas', nargs='+', default=list(PAGINAS), choices=list(PAGINAS))
+    parser.add_argument('--escala', type=int, default=1, help='Escala da tabela municipal sintética')
+    parser.add_argument('--timeout', type=float, default=300, help='Segundos máximos da primeira execução de cada página')
+    parser.add_argument('--modo', choices=MODOS, help='(uso interno) mede um único modo no processo atual')
+    args = parser.parse_args()
+
+    if args.modo:
+        print(json.dumps(mede(args.modo, args.paginas, args.timeout), ensure_ascii=False))
+        sys.exit(0)
+
+    with tempfile.TemporaryDirectory() as pasta:
+        dados = os.path.join(pasta, 'dados')
+        os.makedirs(dados)
+        gera_memoria(1, 'estado').to_csv(os.path.join(dados, ARQUIVO_CE), index=False)
+        gera_memoria(args.escala, 'municipio').to_csv(os.path.join(dados, ARQUIVO_MUN), index=False)
+        servidor = servidor_local(dados)
+
+        resultados = []
+        for modo in MODOS:
+            # 'reinício' reaproveita o cache em disco do 'frio'; os demais partem sem nada em disco
+            cache = os.path.join(pasta, 'cache_aquecido' if modo == 'aquecido' else 'cache')
+            ambiente = {**os.environ, 'SPAECE_URL_BASE': f'http://127.0.0.1:{servidor.server_address[1]}',
+                        'SPAECE_DIRETORIO_CACHE': cache, 'SPAECE_DIRETORIO_SNAPSHOT': os.path.join(pasta, 'snapshot'),
+                        'SPAECE_DIRETORIO_ARTEFATOS': os.path.join(pasta, 'artefatos', modo), 'SPAECE_AQUECIMENTO': '0'}
+            ambiente.pop('SPAECE_MEDICAO', None)
+            saida = subprocess.run([sys.executable, '-m', 'benchmarks.aquecimento', '--modo', modo, '--paginas', *args.paginas,
+                                    '--timeout', str(args.timeout)], capture_output=True, text=True, check=True, env=ambiente)
+            resultados.append(json.loads(saida.stdout.strip().splitlines()[-1]))
+        servidor.shutdown()
+
+    print(f"{'modo':>9} {'aquecimento':>12} | " + ' | '.join(f'{p:>24}' for p in args.paginas))
+    falhas = []
+    for r in resultados:
+        aquecimento = f"{r['aquecimento_ms']:.0f} ms" if r['aquecimento_ms'] is not None else '-'
+        celulas = [f"{v['primeira_renderizacao_ms']:>8.0f} ms ({v['etapas_desenhadas']} desenhadas)" for v in r['paginas'].values()]
+        print(f"{r['modo']:>9} {aquecimento:>12} | " + ' | '.join(f'{c:>24}' for c in celulas))
+        falhas += [f"{r['modo']} / {p}: {', '.join(v['erros'])}" for p, v in r['paginas'].items() if v['erros']]
+    if falhas:
+        print('\n'.join(['FALHAS:'] + falhas))
+        sys.exit(1)
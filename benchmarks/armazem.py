@@ -0,0 +1,49 @@
+import argparse                                     # Lib nativa para a linha de comando
+import json
+import subprocess                                   # Lib nativa para medir cada modo em um processo novo
+import sys
+
+from benchmarks.comum import rss_mb
+
+
+# Simula N sessões simultâneas, cada uma mantendo a tabela e os recortes derivados de uma rerun
+# (dados_filtrados, tabela da etapa com coluna formatada), e mede o crescimento da memória residente.
+#   copias:     cada sessão com o seu próprio dataframe (como no pd.read_csv por rerun)
+#   compartilhado: todas as sessões recebendo visões do armazém (obtem_tabela)
+# Uso: python -m benchmarks.armazem --sessoes 1 10 50 (com SPAECE_URL_BASE / SPAECE_DIRETORIO_SNAPSHOT configurados)
+
+
+def sessao(dados):
+    filtrados = dados[(dados['Rede'] == dados['Rede'].iloc[0]) & (dados['Componente'] == dados['Componente'].iloc[0])]
+    etapa = filtrados[filtrados['Etapa'] == '5º Ano do Ensino Fundamental']
+    participacao = etapa[['Edição', 'Participação (%)']]
+    participacao['Participação Formatada'] = participacao['Participação (%)'].astype(str)
+    return dados, filtrados, etapa, participacao
+
+
+def mede(modo, sessoes):
+    from spaece.armazem import obtem_tabela
+    from spaece.carregamento import ARQUIVO_MUN, COLUNAS_MUN
+
+    base = obtem_tabela(ARQUIVO_MUN, COLUNAS_MUN)
+    rss_antes = rss_mb()
+    mantidas = [sessao(base.copy(deep=True) if modo == 'copias' else obtem_tabela(ARQUIVO_MUN, COLUNAS_MUN))
+                for _ in range(sessoes)]
+    return {'modo': modo, 'sessoes': len(mantidas), 'rss_mb': round(rss_mb() - rss_antes, 1)}
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--sessoes', type=int, nargs='+', default=[1, 10, 50])
+    parser.add_argument('--modo', choices=['copias', 'compartilhado'], help='(uso interno) mede um único modo')
+    args = parser.parse_args()
+
+    if args.modo:
+        print(json.dumps(mede(args.modo, args.sessoes[0])))
+    else:
+        for sessoes in args.sessoes:
+            for modo in ['copias', 'compartilhado']:
+                saida = subprocess.run([sys.executable, '-m', 'benchmarks.armazem', '--modo', modo, '--sessoes', str(sessoes)],
+                                       capture_output=True, text=True, check=True)
+                r = json.loads(saida.stdout)
+                print(f"{r['sessoes']:>4} sessões | {r['modo']:>13}: RSS +{r['rss_mb']:.1f} MB")
@@ -0,0 +1,65 @@
+import argparse                                     # Lib nativa para a linha de comando
+import io
+import os
+import tempfile
+import time
+import tracemalloc                                  # Lib nativa para o pico de memória alocada
+
+import pandas as pd
+
+from benchmarks.indice import replica
+from spaece.artefatos import ArmazemArtefatos, FORMATOS
+
+
+# Downloads: conversão antecipada (CSV + XLSX em memória via pandas, como as páginas faziam a cada interação)
+# contra a geração sob demanda no armazém de artefatos (1ª vez gera o arquivo; a 2ª só reaproveita).
+# Com --por-formato, compara a geração de cada formato (tempo e tamanho do arquivo).
+# Informa o tempo e, com --memoria, o pico de memória alocada (tracemalloc; deixa tudo bem mais lento).
+# Uso: python -m benchmarks.artefatos --csv memoria_mun_todas_etapas_v5.csv --escalas 1 10 100 [--memoria | --por-formato]
+
+
+def antecipada(dados):
+    csv = dados.to_csv(index=False).encode('utf-8')
+    saida = io.BytesIO()
+    with pd.ExcelWriter(saida, engine='xlsxwriter') as writer:
+        dados.to_excel(writer, index=False)
+    return csv, saida.getvalue()
+
+def sob_demanda(armazem, dados):
+    return armazem.obtem(dados, 'csv'), armazem.obtem(dados, 'xlsx')
+
+def mede(funcao, memoria=False):
+    if not memoria:
+        inicio = time.perf_counter()
+        funcao()
+        return f'{(time.perf_counter() - inicio) * 1000:9.1f} ms'
+    tracemalloc.start()
+    funcao()
+    pico = tracemalloc.get_traced_memory()[1] / 2**20
+    tracemalloc.stop()
+    return f'{pico:7.1f} MB'
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--csv', required=True, help='CSV de memória municipal')
+    parser.add_argument('--escalas', type=int, nargs='+', default=[1, 10, 100])
+    parser.add_argument('--memoria', action='store_true', help='Mede o pico de memória em vez do tempo')
+    parser.add_argument('--por-formato', action='store_true', help='Compara CSV, XLSX, Parquet e Arrow IPC')
+    args = parser.parse_args()
+
+    original = pd.read_csv(args.csv)
+    for escala in args.escalas:
+        dados = replica(original, escala)
+        with tempfile.TemporaryDirectory() as diretorio:
+            armazem = ArmazemArtefatos(diretorio)
+            if args.por_formato:
+                medidas = []
+                for formato in FORMATOS:
+                    inicio = time.perf_counter()
+                    caminho = armazem.obtem(dados, formato)
+                    medidas.append(f'{formato} {(time.perf_counter() - inicio) * 1000:8.1f} ms {os.path.getsize(caminho) / 2**20:6.2f} MB')
+                print(f'{escala:>4}x ({len(dados):>8} linhas) | ' + ' | '.join(medidas))
+                continue
+            print(f'{escala:>4}x ({len(dados):>8} linhas) | antecipada {mede(lambda: antecipada(dados), args.memoria)} | '
+                  f'sob demanda 1ª {mede(lambda: sob_demanda(armazem, dados), args.memoria)} | 2ª {mede(lambda: sob_demanda(armazem, dados), args.memoria)}')
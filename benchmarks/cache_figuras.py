@@ -0,0 +1,50 @@
+import argparse                                     # Lib nativa para a linha de comando
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.comum import cronometra
+from spaece.cache_figuras import CacheFiguras, normaliza_filtros
+from spaece.cubo import CuboAgregados
+from spaece.esquema import aplica_esquema
+from spaece.etapas import ETAPAS, calcula_etapas
+from spaece.graficos import graficos_etapa
+from spaece.indice import IndiceFiltro
+
+
+# Tempo de uma etapa com as figuras construídas do zero (falha) e lidas do cache (acerto), e a taxa de acerto
+# de uma sequência de visitas com popularidade dos municípios em lei de potência (Zipf).
+# Uso: python -m benchmarks.cache_figuras --csv memoria_mun_todas_etapas_v5.csv --visitas 2000 --capacidade 64
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--csv', required=True, help='CSV de memória municipal')
+    parser.add_argument('--visitas', type=int, default=2000)
+    parser.add_argument('--capacidade', type=int, default=64)
+    parser.add_argument('--repeticoes', type=int, default=10)
+    args = parser.parse_args()
+
+    dados = aplica_esquema(pd.read_csv(args.csv))
+    indice, cubo = IndiceFiltro(dados), CuboAgregados(dados)
+    espec = ETAPAS[1]
+    titulos = {'proficiencia': '', 'participacao': '', 'padrao': '', 'distribuicao': ''}
+    municipios = list(dados['Município'].cat.categories)
+
+    def figuras(municipio, componente):
+        filtros = {'Rede': dados['Rede'].iloc[0], 'Município': municipio, 'Componente': componente}
+        tabelas = calcula_etapas(indice, cubo, filtros, (0, 500), [espec])[espec['etapa']]
+        return normaliza_filtros(filtros), lambda: graficos_etapa(espec, tabelas, componente, titulos, 'municipio')
+
+    cache = CacheFiguras(args.capacidade)
+    chave, construtor = figuras(municipios[0], 'Língua Portuguesa')
+    cache.obtem(chave, construtor)
+    print(f'falha (constrói as figuras) {cronometra(construtor, args.repeticoes):7.2f} ms | '
+          f'acerto (lê do cache) {cronometra(lambda: cache.obtem(chave, construtor), args.repeticoes):7.2f} ms')
+
+    cache = CacheFiguras(args.capacidade)
+    sorteio = np.random.default_rng(0)
+    for _ in range(args.visitas):
+        municipio = municipios[min(sorteio.zipf(1.5), len(municipios)) - 1]
+        cache.obtem(*figuras(municipio, sorteio.choice(['Língua Portuguesa', 'Matemática'])))
+    print(cache.estatisticas())
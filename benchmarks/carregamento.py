@@ -0,0 +1,59 @@
+import argparse                                     # Lib nativa para a linha de comando
+import json                                         # Lib nativa para troca de resultados entre processos
+import subprocess                                   # Lib nativa para medir cada modo em um processo novo (carga a frio)
+import sys
+import time
+
+from benchmarks.comum import rss_mb
+
+
+# Compara a carga a frio (tempo e memória residente) da tabela como as páginas a pedem (obtem_tabela -> carrega_tabela,
+# com as colunas da página e todas as Redes / Componentes / Etapas): leitura do CSV já em disco (sem snapshot) e
+# leitura do snapshot Parquet. O snapshot é lido inteiro (as páginas compartilham uma tabela por versão entre
+# sessões), então o ganho vem só da leitura colunar e das colunas descartadas, não de partições puladas.
+# Uso: python -m benchmarks.carregamento --tabela mun --csv memoria_mun_todas_etapas_v5.csv --snapshot snapshot
+
+TABELAS = {'ce': 'COLUNAS_CE', 'mun': 'COLUNAS_MUN'}
+
+
+def mede(modo, tabela, csv, snapshot):
+    import os
+    os.environ['SPAECE_DIRETORIO_SNAPSHOT'] = snapshot
+    from spaece import carregamento
+    from spaece.ingestao import TABELAS as ARQUIVOS
+    from spaece.snapshot import carrega_tabela, existe_snapshot
+
+    arquivo, colunas = ARQUIVOS[tabela], getattr(carregamento, TABELAS[tabela])
+    if modo == 'snapshot' and not existe_snapshot(arquivo):
+        raise SystemExit(f'Snapshot de {arquivo} não encontrado em {snapshot} (python -m spaece.snapshot --destino {snapshot})')
+
+    rss_antes = rss_mb()
+    inicio = time.perf_counter()
+    if modo == 'csv':
+        # Mesmo caminho de carrega_tabela sem snapshot, a partir da cópia em disco (sem revalidar com o servidor)
+        dados = carregamento.le_memoria(csv)
+        dados = dados[[c for c in dados.columns if c in colunas]]
+    else:
+        dados = carrega_tabela(arquivo, colunas)
+    tempo = (time.perf_counter() - inicio) * 1000
+    return {'modo': modo, 'linhas': len(dados), 'colunas': dados.shape[1], 'tempo_ms': round(tempo, 1),
+            'rss_mb': round(rss_mb() - rss_antes, 1), 'memoria_df_mb': round(dados.memory_usage(deep=True).sum() / 2**20, 2)}
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--tabela', choices=sorted(TABELAS), required=True, help='Tabela de memória (ce ou mun)')
+    parser.add_argument('--csv', required=True, help='Caminho do CSV de memória da tabela')
+    parser.add_argument('--snapshot', default='snapshot', help='Pasta dos snapshots Parquet')
+    parser.add_argument('--modo', choices=['csv', 'snapshot'], help='(uso interno) mede um único modo')
+    args = parser.parse_args()
+
+    if args.modo:
+        print(json.dumps(mede(args.modo, args.tabela, args.csv, args.snapshot)))
+    else:
+        for modo in ['csv', 'snapshot']:
+            saida = subprocess.run([sys.executable, '-m', 'benchmarks.carregamento', '--tabela', args.tabela, '--csv', args.csv,
+                                    '--snapshot', args.snapshot, '--modo', modo], capture_output=True, text=True, check=True)
+            r = json.loads(saida.stdout)
+            print(f"{r['modo']:>9}: {r['linhas']:>7} linhas x {r['colunas']:>2} colunas | {r['tempo_ms']:>8.1f} ms | "
+                  f"RSS +{r['rss_mb']:.1f} MB | dataframe {r['memoria_df_mb']:.2f} MB")
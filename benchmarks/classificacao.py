@@ -0,0 +1,45 @@
+import argparse                                     # Lib nativa para a linha de comando
+
+import pandas as pd
+
+from benchmarks.comum import cronometra
+from benchmarks.indice import replica
+from spaece.classificacao import classifica_padroes, agrupa_por_faixa
+from spaece.cubo import constroi_cubo
+from spaece.etapas import ETAPAS
+
+
+# Classificação nos padrões de desempenho e separação dos traços das barras para todas as células do cubo:
+# pd.cut + um filtro por faixa para cada (etapa, componente), como nos gráficos, contra um único np.digitize
+# e uma única ordenação por faixa.
+# Uso: python -m benchmarks.classificacao --csv memoria_mun_todas_etapas_v5.csv --escalas 1 10 100
+
+
+def por_faixa(cubo):
+    tracos = []
+    for espec in ETAPAS:
+        for componente, cortes in espec['cortes'].items():
+            tabela = cubo[(cubo['Etapa'] == espec['etapa']) & (cubo['Componente'] == componente)].copy()
+            tabela['Intervalo'] = pd.cut(tabela['Proficiência Média'].round(1), bins=cortes, labels=False)
+            for i in range(len(cortes) - 1):
+                data = tabela[tabela['Intervalo'] == i]
+                tracos.append((data['Edição'], data['Proficiência Média']))
+    return tracos
+
+def vetorizado(cubo):
+    faixas = classifica_padroes(cubo)
+    return agrupa_por_faixa(faixas, 5, cubo['Edição'], cubo['Proficiência Média'])
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--csv', required=True, help='CSV de memória municipal')
+    parser.add_argument('--escalas', type=int, nargs='+', default=[1, 10, 100])
+    parser.add_argument('--repeticoes', type=int, default=5)
+    args = parser.parse_args()
+
+    original = pd.read_csv(args.csv)
+    for escala in args.escalas:
+        cubo = constroi_cubo(replica(original, escala))
+        print(f'{escala:>4}x ({len(cubo):>8} células) | pd.cut + filtro por faixa {cronometra(lambda: por_faixa(cubo), args.repeticoes):8.2f} ms | '
+              f'np.digitize + ordenação {cronometra(lambda: vetorizado(cubo), args.repeticoes):7.2f} ms')
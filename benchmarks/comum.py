@@ -0,0 +1,21 @@
+import os                                           # Lib nativa para leitura do /proc
+import resource                                     # Lib nativa para o pico de memória do processo
+import time                                         # Módulo para medição de tempo
+
+
+## Funcao que devolve a memória residente (RSS) atual do processo, em MB
+def rss_mb():
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 2**20
+    except OSError:  # Fora do Linux, usa o pico de memória (em KB no Linux, em bytes no macOS)
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 2**10
+
+## Funcao que executa `funcao` `repeticoes` vezes e devolve o menor tempo (em ms)
+def cronometra(funcao, repeticoes=5):
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao()
+        tempos.append((time.perf_counter() - inicio) * 1000)
+    return min(tempos)
@@ -0,0 +1,48 @@
+import argparse                                     # Lib nativa para a linha de comando
+import time
+
+import pandas as pd
+
+from benchmarks.comum import cronometra
+from benchmarks.indice import replica
+from spaece.cubo import CuboAgregados
+from spaece.indice import IndiceFiltro
+
+
+# Compara as tabelas por edição de uma etapa montadas a cada rerun (seleção + groupby + recortes)
+# com a leitura direta do cubo de agregados pré-computado.
+# Uso: python -m benchmarks.cubo --csv memoria_mun_todas_etapas_v5.csv --escalas 1 10 100
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--csv', required=True, help='CSV de memória municipal')
+    parser.add_argument('--escalas', type=int, nargs='+', default=[1, 10, 100])
+    parser.add_argument('--repeticoes', type=int, default=20)
+    args = parser.parse_args()
+
+    original = pd.read_csv(args.csv)
+    colunas_barras = ['Edição', '% Muito Crítico', '% Crítico', '% Intermediário', '% Adequado']
+    for escala in args.escalas:
+        dados = replica(original, escala)
+        filtros = {'Rede': dados['Rede'].iloc[0], 'Componente': dados['Componente'].iloc[0],
+                   'Município': dados['Município'].iloc[0], 'Edição': dados['Edição'].unique(),
+                   'Etapa': '5º Ano do Ensino Fundamental'}
+        indice = IndiceFiltro(dados)
+
+        inicio = time.perf_counter()
+        cubo = CuboAgregados(dados)
+        construcao = (time.perf_counter() - inicio) * 1000
+
+        def por_rerun():
+            etapa = indice.seleciona(filtros, (0, 500))
+            proficiencia = etapa.groupby('Edição', observed=True)['Proficiência Média'].mean().reset_index()
+            return proficiencia, etapa[colunas_barras], etapa[['Edição', 'Participação (%)']]
+
+        def do_cubo():
+            etapa = cubo.seleciona(filtros, (0, 500))
+            return etapa[['Edição', 'Proficiência Média']], etapa[colunas_barras], etapa[['Edição', 'Participação (%)']]
+
+        print(f'{escala:>4}x ({len(dados):>8} linhas, {len(cubo.tabela):>8} células) | '
+              f'por rerun {cronometra(por_rerun, args.repeticoes):6.3f} ms | '
+              f'cubo {cronometra(do_cubo, args.repeticoes):6.3f} ms | construção do cubo {construcao:8.1f} ms')
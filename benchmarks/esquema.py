@@ -0,0 +1,43 @@
+import argparse                                     # Lib nativa para a linha de comando
+
+import pandas as pd
+
+from benchmarks.comum import cronometra
+from spaece.esquema import aplica_esquema
+
+
+# Compara a memória de cada dataframe e o tempo da máscara de `dados_filtrados` antes (texto / object)
+# e depois do esquema categórico compacto.
+# Uso: python -m benchmarks.esquema --csv memoria_ce_totas_etapas.csv --csv memoria_mun_todas_etapas_v5.csv
+
+
+def mascara(dados, rede, componente, edicao, municipio=None):
+    filtro = ((dados['Rede'] == rede) &
+              (dados['Componente'] == componente) &
+              (dados['Edição'].isin(edicao)) &
+              (dados['Proficiência Média'].between(0, 500)))
+    if municipio is not None:
+        filtro &= (dados['Município'] == municipio)
+    return dados[filtro]
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--csv', action='append', required=True, help='CSV de memória (pode repetir)')
+    parser.add_argument('--repeticoes', type=int, default=50)
+    args = parser.parse_args()
+
+    for caminho in args.csv:
+        original = pd.read_csv(caminho)
+        compacto = aplica_esquema(original.copy())
+
+        rede = original['Rede'].iloc[0]
+        componente = original['Componente'].iloc[0]
+        edicao = original['Edição'].unique()
+        municipio = original['Município'].iloc[0] if 'Município' in original.columns else None
+
+        print(f'{caminho} ({len(original)} linhas)')
+        for nome, dados in [('original', original), ('categórico', compacto)]:
+            memoria = dados.memory_usage(deep=True).sum() / 2**20
+            tempo = cronometra(lambda: mascara(dados, rede, componente, edicao, municipio), args.repeticoes)
+            print(f'  {nome:>10}: {memoria:8.2f} MB | máscara {tempo:7.3f} ms')
@@ -0,0 +1,44 @@
+import argparse                                     # Lib nativa para a linha de comando
+
+import pandas as pd
+
+from benchmarks.comum import cronometra
+from benchmarks.indice import replica
+from spaece.cubo import CuboAgregados
+from spaece.etapas import ETAPAS, calcula_etapas
+from spaece.indice import IndiceFiltro
+
+
+# Compara as tabelas das quatro etapas montadas etapa a etapa (uma seleção no índice e uma no cubo por etapa)
+# com o cálculo de todas as etapas em uma única passada (`calcula_etapas`).
+# Uso: python -m benchmarks.etapas --csv memoria_mun_todas_etapas_v5.csv --escalas 1 10 100
+
+
+def por_etapa(indice, cubo, filtros, proficiencia):
+    tabelas = {}
+    for espec in ETAPAS:
+        selecao = {**filtros, 'Etapa': espec['etapa']}
+        dados = indice.seleciona(selecao, proficiencia).rename(columns=espec['renomeia'])
+        etapa = cubo.seleciona(selecao, proficiencia)
+        tabelas[espec['etapa']] = (dados, etapa[['Edição', 'Proficiência Média']].round(1),
+                                   etapa[['Edição'] + espec['padroes']], etapa[['Edição', 'Participação (%)']])
+    return tabelas
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--csv', required=True, help='CSV de memória municipal')
+    parser.add_argument('--escalas', type=int, nargs='+', default=[1, 10, 100])
+    parser.add_argument('--repeticoes', type=int, default=20)
+    args = parser.parse_args()
+
+    original = pd.read_csv(args.csv)
+    for escala in args.escalas:
+        dados = replica(original, escala)
+        indice, cubo = IndiceFiltro(dados), CuboAgregados(dados)
+        filtros = {'Rede': dados['Rede'].iloc[0], 'Componente': dados['Componente'].iloc[0],
+                   'Município': dados['Município'].iloc[0], 'Edição': dados['Edição'].unique()}
+
+        print(f'{escala:>4}x ({len(dados):>8} linhas) | '
+              f'etapa a etapa {cronometra(lambda: por_etapa(indice, cubo, filtros, (0, 500)), args.repeticoes):6.3f} ms | '
+              f'passada única {cronometra(lambda: calcula_etapas(indice, cubo, filtros, (0, 500)), args.repeticoes):6.3f} ms')
@@ -0,0 +1,38 @@
+import argparse                                     # Lib nativa para a linha de comando
+import multiprocessing
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from benchmarks.indice import replica
+from spaece.exportacao_lote import executa_exportacao
+
+
+# Exportação em lote de todos os municípios, etapas e componentes com 1, 2, ... processos.
+# A tabela municipal é replicada (municípios renomeados) e as CREDEs multiplicadas para simular mais tarefas.
+# Uso: python -m benchmarks.exportacao_lote --csv memoria_mun_todas_etapas_v5.csv --escala 10 --processos 1 2 4
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--csv', required=True, help='CSV de memória municipal')
+    parser.add_argument('--escala', type=int, default=10)
+    parser.add_argument('--formatos', nargs='+', default=['xlsx', 'csv', 'parquet'])
+    parser.add_argument('--processos', type=int, nargs='+', default=[1, 2, 4])
+    args = parser.parse_args()
+
+    dados = replica(pd.read_csv(args.csv), args.escala)
+    dados['CREDE'] = (dados['CREDE'].astype(str) + ' - ' + dados['Município'].astype(str).str.extract(r'(\d+)$', expand=False)).astype('category')
+    print(f'{len(dados)} linhas, {dados["CREDE"].nunique()} CREDEs, {os.cpu_count()} núcleos')
+
+    for formato in args.formatos:
+        for processos in args.processos:
+            with tempfile.TemporaryDirectory() as pasta, \
+                    ProcessPoolExecutor(max_workers=processos, mp_context=multiprocessing.get_context('spawn')) as executor:
+                executor.submit(int).result()           # Inicia os processos fora da medição
+                inicio = time.perf_counter()
+                executa_exportacao(dados, formato, os.path.join(pasta, 'lote.zip'), executor=executor)
+                print(f'{formato:>8} | {processos} processo(s) {(time.perf_counter() - inicio) * 1000:9.1f} ms')
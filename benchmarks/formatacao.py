@@ -0,0 +1,49 @@
+import argparse                                     # Lib nativa para a linha de comando
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.comum import cronometra
+from benchmarks.indice import replica
+from spaece.esquema import aplica_esquema
+from spaece.formatacao import formata_decimal, formata_numero, rotulos_categoricos
+
+
+# Formatação no padrão brasileiro: `apply` com f-string por elemento (como nos gráficos e métricas)
+# contra a formatação vetorizada (uma vez por valor distinto). Mede os percentuais de todas as linhas
+# da tabela replicada e contagens sintéticas com muitos valores distintos (pior caso da versão vetorizada).
+# Uso: python -m benchmarks.formatacao --csv memoria_mun_todas_etapas_v5.csv --escalas 1 10 100
+
+
+def formata_numero_por_elemento(valor, prefixo=''):
+    for unidade in ['', 'mil', 'milhões']:
+        if valor < 1000:
+            valor_str = f'{valor:.2f}'.replace('.', '|').replace(',', '.').replace('|', ',')
+            if valor.is_integer():
+                return f'{prefixo} {valor_str.replace(",00", "")} {unidade}'
+            return f'{prefixo} {valor_str} {unidade}'
+        valor = valor / 1000
+
+def decimal_por_elemento(serie):
+    return serie.apply(lambda x: f'{x:.1f}'.replace('.', ','))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--csv', required=True, help='CSV de memória municipal')
+    parser.add_argument('--escalas', type=int, nargs='+', default=[1, 10, 100])
+    parser.add_argument('--repeticoes', type=int, default=3)
+    args = parser.parse_args()
+
+    original = pd.read_csv(args.csv)
+    for escala in args.escalas:
+        dados = aplica_esquema(replica(original, escala))
+        serie = dados['Participação (%)']
+        contagens = pd.Series(np.random.default_rng(0).integers(0, 5_000_000, len(dados)).astype(np.float64))
+
+        print(f'{escala:>4}x ({len(dados):>8} linhas)')
+        print(f'      decimal   | apply por elemento {cronometra(lambda: decimal_por_elemento(serie), args.repeticoes):9.2f} ms | '
+              f'vetorizado {cronometra(lambda: formata_decimal(serie, 1, milhar=False), args.repeticoes):8.2f} ms | '
+              f'categórico {cronometra(lambda: rotulos_categoricos(serie), args.repeticoes):8.2f} ms')
+        print(f'      contagens | apply por elemento {cronometra(lambda: contagens.apply(formata_numero_por_elemento), args.repeticoes):9.2f} ms | '
+              f'vetorizado {cronometra(lambda: formata_numero(contagens), args.repeticoes):8.2f} ms')
@@ -0,0 +1,53 @@
+import argparse                                     # Lib nativa para a linha de comando
+import time
+
+import pandas as pd
+
+from benchmarks.comum import cronometra
+from spaece.esquema import aplica_esquema
+from spaece.indice import IndiceFiltro
+
+
+# Compara a máscara booleana de `dados_filtrados` (5 colunas inteiras + filtro da etapa) com a consulta
+# ao índice, replicando o arquivo municipal (municípios renomeados, simulando nível escola) a cada escala.
+# Uso: python -m benchmarks.indice --csv memoria_mun_todas_etapas_v5.csv --escalas 1 10 100
+
+
+def replica(dados, escala):
+    partes = []
+    for i in range(escala):
+        parte = dados.copy()
+        parte['Município'] = parte['Município'] + f' {i}'
+        partes.append(parte)
+    return aplica_esquema(pd.concat(partes, ignore_index=True))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--csv', required=True, help='CSV de memória municipal')
+    parser.add_argument('--escalas', type=int, nargs='+', default=[1, 10, 100])
+    parser.add_argument('--repeticoes', type=int, default=20)
+    args = parser.parse_args()
+
+    original = pd.read_csv(args.csv)
+    for escala in args.escalas:
+        dados = replica(original, escala)
+        rede, componente = dados['Rede'].iloc[0], dados['Componente'].iloc[0]
+        municipio, etapa = dados['Município'].iloc[0], '5º Ano do Ensino Fundamental'
+        edicao = dados['Edição'].unique()
+
+        def mascara():
+            filtrados = dados[(dados['Rede'] == rede) & (dados['Município'] == municipio) &
+                              (dados['Componente'] == componente) & (dados['Edição'].isin(edicao)) &
+                              (dados['Proficiência Média'].between(0, 500))]
+            return filtrados[filtrados['Etapa'] == etapa]
+
+        inicio = time.perf_counter()
+        indice = IndiceFiltro(dados)
+        construcao = (time.perf_counter() - inicio) * 1000
+        filtros = {'Rede': rede, 'Município': municipio, 'Componente': componente, 'Edição': edicao, 'Etapa': etapa}
+
+        print(f'{escala:>4}x ({len(dados):>8} linhas) | máscara {cronometra(mascara, args.repeticoes):8.3f} ms | '
+              f'consulta {cronometra(lambda: indice.posicoes(filtros), args.repeticoes):6.3f} ms | '
+              f'consulta + take {cronometra(lambda: indice.seleciona(filtros, (0, 500)), args.repeticoes):6.3f} ms | '
+              f'construção do índice {construcao:8.1f} ms')
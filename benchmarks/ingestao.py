@@ -0,0 +1,74 @@
+import argparse                                     # Lib nativa para a linha de comando
+import os
+import tempfile
+import time
+
+os.environ.setdefault('SPAECE_INTERVALO_REVALIDACAO', '0')  # Revalida a cada carga: o CSV servido é trocado entre as medições
+
+from benchmarks.latencia import servidor_local
+from benchmarks.sintetico import gera_memoria, EDICOES
+from spaece import armazem
+from spaece.carregamento import ARQUIVO_MUN, COLUNAS_MUN
+from spaece.hierarquia import cubos_hierarquia, acrescenta_hierarquia, indice_crede, acrescenta_indice_crede
+from spaece.ingestao import acrescenta_edicao
+from spaece.snapshot import constroi_snapshot
+
+
+# Custo de publicar uma edição nova na tabela municipal sintética: ingestão incremental (grava só as linhas da edição
+# e atualiza tabela, índices e cubos do armazém) contra a reconstrução completa (snapshot refeito a partir do CSV inteiro
+# e armazém recarregado com todos os derivados reconstruídos). A última edição do gerador faz o papel da edição nova.
+# Uso: python -m benchmarks.ingestao [--escalas 1 10 100]
+
+
+## Funcao que pede ao armazém a tabela e todos os derivados usados pelas páginas (como uma sessão após a atualização)
+def carrega_derivados():
+    armazem.obtem_tabela(ARQUIVO_MUN, COLUNAS_MUN)
+    armazem.obtem_indice(ARQUIVO_MUN, COLUNAS_MUN)
+    armazem.obtem_cubo(ARQUIVO_MUN, COLUNAS_MUN)
+    armazem.obtem_derivado(ARQUIVO_MUN, COLUNAS_MUN, 'hierarquia', cubos_hierarquia, acrescenta_hierarquia)
+    armazem.obtem_derivado(ARQUIVO_MUN, COLUNAS_MUN, 'indice_crede', indice_crede, acrescenta_indice_crede)
+
+def _ms(funcao):
+    inicio = time.perf_counter()
+    funcao()
+    return (time.perf_counter() - inicio) * 1000
+
+## Funcao que mede, em uma escala, a ingestão incremental da última edição e a reconstrução completa
+def mede_escala(escala, pasta):
+    dados = gera_memoria(escala)
+    nova = dados['Edição'] == EDICOES[-1]
+    csv_nova = os.path.join(pasta, 'nova_edicao.csv')
+    dados[~nova].to_csv(os.path.join(pasta, 'servidor', ARQUIVO_MUN), index=False)
+    dados[nova].to_csv(csv_nova, index=False)
+
+    os.environ['SPAECE_DIRETORIO_SNAPSHOT'] = os.path.join(pasta, f'snapshot_{escala}')
+    constroi_snapshot(ARQUIVO_MUN)
+    carrega_derivados()
+
+    resultado = {'escala': escala, 'linhas': len(dados), 'linhas_edicao': int(nova.sum())}
+    resultado['ingestao_ms'] = _ms(lambda: acrescenta_edicao(ARQUIVO_MUN, csv_nova))
+    resultado['atualizacao_ms'] = _ms(carrega_derivados)
+
+    dados.to_csv(os.path.join(pasta, 'servidor', ARQUIVO_MUN), index=False)
+    resultado['reconstrucao_ms'] = _ms(lambda: constroi_snapshot(ARQUIVO_MUN))
+    resultado['recarga_ms'] = _ms(carrega_derivados)
+    return resultado
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--escalas', type=int, nargs='+', default=[1, 10], help='Escalas da tabela municipal sintética')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as pasta:
+        os.makedirs(os.path.join(pasta, 'servidor'))
+        servidor = servidor_local(os.path.join(pasta, 'servidor'))
+        os.environ['SPAECE_URL_BASE'] = f'http://127.0.0.1:{servidor.server_address[1]}'
+        os.environ['SPAECE_DIRETORIO_CACHE'] = os.path.join(pasta, 'cache')
+
+        print(f"{'escala':>6} {'linhas':>9} {'edição':>8} | {'incremental: grava':>18} {'atualiza':>9} | {'completa: reconstrói':>20} {'recarrega':>10}")
+        for escala in args.escalas:
+            r = mede_escala(escala, pasta)
+            print(f"{r['escala']:>6} {r['linhas']:>9} {r['linhas_edicao']:>8} | {r['ingestao_ms']:>15.0f} ms {r['atualizacao_ms']:>6.0f} ms | "
+                  f"{r['reconstrucao_ms']:>17.0f} ms {r['recarga_ms']:>7.0f} ms")
+        servidor.shutdown()
@@ -0,0 +1,291 @@
+import argparse                                     # Lib nativa para a linha de comando
+import functools
+import json
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.comum import rss_mb
+from benchmarks.sintetico import gera_memoria
+from spaece.carregamento import ARQUIVO_CE, ARQUIVO_MUN
+from spaece.etapas import ETAPAS, REDES, COMPONENTES, etapa_avaliada
+
+
+# Latência ponta a ponta das páginas: cada página é executada pela API de testes do Streamlit (sem navegador),
+# com as tabelas servidas por um servidor HTTP local no lugar do GitHub (dados sintéticos ou uma pasta de CSVs),
+# para uma matriz de filtros: redes, componentes, etapas avaliadas, amostra de municípios, subconjuntos de edições e
+# intervalos de proficiência. Cada combinação começa em uma sessão nova; a primeira execução medida é a que aplica os filtros
+# (frio para aqueles filtros) e as seguintes são reruns. Relata p50 / p95 do tempo do script (medido pelo próprio
+# script, spaece/medicao.py) e o pico de memória (RSS) por combinação, e falha se passar da linha de base gravada.
+# Uso: python -m benchmarks.latencia [--paginas ce mun crede] [--municipios 3] [--repeticoes 5] [--escala 1 | --dados pasta]
+#                                     [--linha-de-base latencia.json [--grava-linha-de-base]] [--json resultados.json]
+
+# filtro: seletor do local da página (amostrado em --municipios), None quando a página não tem um
+PAGINAS = {'ce': {'script': 'SPAECE_CE.py', 'filtro': None},
+           'mun': {'script': os.path.join('pages', 'SPAECE_ MUNICÍPIOS.py'), 'filtro': 'Município'},
+           'crede': {'script': os.path.join('pages', 'SPAECE_CREDES.py'), 'filtro': 'CREDE'}}
+
+# Subconjuntos de edições (None = "Todas as edições") e intervalos de proficiência (None = "Todas as proficiências médias")
+EDICOES = {'todas': None, 'última': lambda opcoes: opcoes[-1:], 'três primeiras': lambda opcoes: opcoes[:3]}
+PROFICIENCIAS = {'todas': None, '150-250': (150, 250)}
+
+
+## ------------------------ SERVIDOR LOCAL (NO LUGAR DO GITHUB) ------------------------ ##
+
+class _Arquivos(SimpleHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+## Funcao que serve os arquivos da pasta em uma porta livre e devolve o servidor (em segundo plano)
+def servidor_local(pasta):
+    servidor = ThreadingHTTPServer(('127.0.0.1', 0), functools.partial(_Arquivos, directory=pasta))
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    return servidor
+
+
+## ------------------------ EXECUÇÃO DAS PÁGINAS PELA API DE TESTES ------------------------ ##
+
+# streamlit.testing.v1.AppTest (Streamlit >= 1.28); nas versões anteriores, o executor de testes que o precedeu
+try:
+    from streamlit.testing.v1 import AppTest
+except ImportError:
+    AppTest = None
+
+def _runtime_de_testes():
+    # O executor anterior ao AppTest espera um Runtime (como nos testes do próprio Streamlit)
+    from unittest.mock import MagicMock
+    from streamlit.runtime import Runtime
+    from streamlit.runtime.caching.storage.dummy_cache_storage import MemoryCacheStorageManager
+    from streamlit.runtime.media_file_manager import MediaFileManager
+    from streamlit.runtime.memory_media_file_storage import MemoryMediaFileStorage
+    if Runtime._instance is None:
+        runtime = MagicMock(spec=Runtime)
+        runtime.media_file_mgr = MediaFileManager(MemoryMediaFileStorage('/mock/media'))
+        runtime.cache_storage_manager = MemoryCacheStorageManager()
+        Runtime._instance = runtime
+
+## Funcao que abre a página em uma sessão nova (primeira execução) e devolve a árvore de elementos
+def abre_pagina(script, timeout):
+    if AppTest is not None:
+        return AppTest.from_file(script, default_timeout=timeout).run()
+    from streamlit import source_util
+    from streamlit.testing.local_script_runner import LocalScriptRunner
+    _runtime_de_testes()
+    with source_util._pages_cache_lock:             # As páginas são descobertas a partir do script principal de cada sessão
+        source_util._cached_pages = None
+    return LocalScriptRunner(script).run(timeout=timeout)
+
+## Funcao que reexecuta a página com os valores atuais dos widgets
+def executa(arvore, timeout):
+    if AppTest is None:
+        # O executor anterior não reconhece selectbox com format_func (opções formatadas, valor cru): mantém a opção padrão
+        for selectbox in arvore.get('selectbox'):
+            if str(selectbox.value) not in selectbox.options:
+                selectbox.set_value(selectbox.options[selectbox.proto.default])
+    return arvore.run(timeout=timeout)
+
+def _widget(arvore, tipo, rotulo):
+    return next((w for w in arvore.sidebar.get(tipo) if w.label.strip() == rotulo), None)
+
+def _erros(arvore):
+    return [str(getattr(e, 'message', e)) for e in arvore.get('exception')]
+
+
+## ------------------------ MEDIÇÃO ------------------------ ##
+
+class _PicoMemoria:
+    # Amostra a memória residente do processo em segundo plano e guarda o maior valor
+
+    def __init__(self, intervalo=0.005):
+        self.intervalo = intervalo
+        self.pico = rss_mb()
+        self._parar = threading.Event()
+        self._thread = threading.Thread(target=self._amostra, daemon=True)
+
+    def _amostra(self):
+        while not self._parar.wait(self.intervalo):
+            self.pico = max(self.pico, rss_mb())
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *args):
+        self._parar.set()
+        self._thread.join()
+        self.pico = max(self.pico, rss_mb())
+
+## Funcao que lê os registros da medição gravados desde a última leitura (arquivo JSON lines do spaece/medicao.py)
+def _novos_registros(arquivo, posicao):
+    with open(arquivo, encoding='utf-8') as f:
+        f.seek(posicao)
+        linhas = f.read()
+        return [json.loads(l) for l in linhas.splitlines() if l], f.tell()
+
+def _percentis(valores):
+    return round(float(np.percentile(valores, 50)), 2), round(float(np.percentile(valores, 95)), 2)
+
+## Funcao que mede uma combinação de filtros em uma sessão nova; devolve p50 / p95 (ms), pico de RSS e a mediana de cada trecho
+def mede_combinacao(pagina, rede, componente, etapa, local, edicoes, proficiencia, repeticoes, arquivo_medicao, timeout):
+    # Sessão nova; os checkboxes de "todas" são desmarcados antes, para que o multiselect / slider apareçam
+    arvore = abre_pagina(PAGINAS[pagina]['script'], timeout)
+    _widget(arvore, 'checkbox', 'Todas as edições').set_value(EDICOES[edicoes] is None)
+    _widget(arvore, 'checkbox', 'Todas as proficiências médias').set_value(PROFICIENCIAS[proficiencia] is None)
+    arvore = executa(arvore, timeout)
+
+    _widget(arvore, 'selectbox', 'Rede').set_value(rede)
+    _widget(arvore, 'selectbox', 'Componente').set_value(componente)
+    if local is not None:
+        _widget(arvore, 'selectbox', PAGINAS[pagina]['filtro']).set_value(local)
+    if EDICOES[edicoes] is not None:
+        multiselect = _widget(arvore, 'multiselect', 'Edição')
+        multiselect.set_value(EDICOES[edicoes](multiselect.options))
+    if PROFICIENCIAS[proficiencia] is not None:
+        _widget(arvore, 'slider', 'Selecione um intervalo').set_value(PROFICIENCIAS[proficiencia])
+    radio = next((r for r in arvore.get('radio') if etapa in r.options), None)
+    if radio is not None:                           # Sem o seletor no modo 'abas' (todas as etapas desenhadas)
+        radio.set_value(etapa)
+
+    tempos, trechos, erros = [], {}, []
+    posicao = os.path.getsize(arquivo_medicao) if os.path.exists(arquivo_medicao) else 0
+    with _PicoMemoria() as memoria:
+        for _ in range(repeticoes):
+            arvore = executa(arvore, timeout)
+            erros.extend(_erros(arvore))
+            registros, posicao = _novos_registros(arquivo_medicao, posicao)
+            if registros:
+                tempos.append(registros[-1]['total_ms'])
+                por_nome = {}
+                for trecho in registros[-1]['trechos']:
+                    por_nome[trecho['nome']] = por_nome.get(trecho['nome'], 0) + trecho['duracao_ms']
+                for nome, duracao in por_nome.items():
+                    trechos.setdefault(nome, []).append(duracao)
+
+    p50, p95 = _percentis(tempos) if tempos else (None, None)
+    return {'p50_ms': p50, 'p95_ms': p95, 'pico_mb': round(memoria.pico, 1), 'execucoes': len(tempos),
+            'tempos_ms': tempos, 'trechos_p50_ms': {nome: round(float(np.median(v)), 2) for nome, v in trechos.items()},
+            'erros': sorted(set(erros))}
+
+## Funcao que devolve a chave (texto) de uma combinação, usada no relatório e na linha de base
+def chave_combinacao(pagina, rede, componente, etapa, local, edicoes, proficiencia):
+    return ' | '.join([pagina, rede, componente, etapa, local or '-', f'edições: {edicoes}', f'proficiência: {proficiencia}'])
+
+## Funcao que executa a matriz de combinações das páginas pedidas
+def executa_matriz(paginas, redes, componentes, etapas, municipios, repeticoes, arquivo_medicao, timeout, semente=0, progresso=print):
+    combinacoes = {}
+    for pagina in paginas:
+        locais = [None]
+        if PAGINAS[pagina]['filtro'] is not None:
+            # Amostra de municípios / CREDEs a partir das opções do próprio filtro da página
+            opcoes = _widget(abre_pagina(PAGINAS[pagina]['script'], timeout), 'selectbox', PAGINAS[pagina]['filtro']).options
+            locais = random.Random(semente).sample(opcoes, min(municipios, len(opcoes)))
+        for rede in redes:
+            for componente in componentes:
+                for espec in [e for e in ETAPAS if e['etapa'] in etapas and etapa_avaliada(e, rede, componente)]:
+                    for local in locais:
+                        for edicoes in EDICOES:
+                            for proficiencia in PROFICIENCIAS:
+                                chave = chave_combinacao(pagina, rede, componente, espec['etapa'], local, edicoes, proficiencia)
+                                combinacoes[chave] = {'pagina': pagina, **mede_combinacao(pagina, rede, componente, espec['etapa'], local,
+                                                                                          edicoes, proficiencia, repeticoes, arquivo_medicao, timeout)}
+                                progresso(f'{chave}: p50 {combinacoes[chave]["p50_ms"]} ms, p95 {combinacoes[chave]["p95_ms"]} ms, '
+                                          f'pico {combinacoes[chave]["pico_mb"]} MB')
+
+    resumo = {}
+    for pagina in paginas:
+        tempos = [t for c in combinacoes.values() if c['pagina'] == pagina for t in c['tempos_ms']]
+        p50, p95 = _percentis(tempos) if tempos else (None, None)
+        resumo[pagina] = {'p50_ms': p50, 'p95_ms': p95, 'pico_mb': max(c['pico_mb'] for c in combinacoes.values() if c['pagina'] == pagina)}
+    return {'paginas': resumo, 'combinacoes': combinacoes}
+
+
+## ------------------------ LINHA DE BASE ------------------------ ##
+
+## Funcao que compara os resultados com a linha de base e devolve as regressões (textos)
+# Regressão: valor > base * (1 + tolerancia) + folga (folga absoluta para não acusar ruído em tempos pequenos)
+def compara_linha_de_base(resultados, base, tolerancia=0.25, folga_ms=25, folga_mb=50):
+    regressoes = []
+    pares = [(f'página {p}', v, base['paginas'].get(p)) for p, v in resultados['paginas'].items()] + \
+            [(c, v, base['combinacoes'].get(c)) for c, v in resultados['combinacoes'].items()]
+    for nome, atual, anterior in pares:
+        if anterior is None:
+            continue
+        for medida, folga in [('p50_ms', folga_ms), ('p95_ms', folga_ms), ('pico_mb', folga_mb)]:
+            if atual.get(medida) is None or anterior.get(medida) is None:
+                continue
+            limite = anterior[medida] * (1 + tolerancia) + folga
+            if atual[medida] > limite:
+                regressoes.append(f'{nome}: {medida} {atual[medida]} > {limite:.1f} (base {anterior[medida]})')
+    return regressoes
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--paginas', nargs='+', default=list(PAGINAS), choices=list(PAGINAS))
+    parser.add_argument('--redes', nargs='+', default=REDES, choices=REDES)
+    parser.add_argument('--componentes', nargs='+', default=COMPONENTES, choices=COMPONENTES)
+    parser.add_argument('--etapas', nargs='+', default=[e['etapa'] for e in ETAPAS], choices=[e['etapa'] for e in ETAPAS])
+    parser.add_argument('--municipios', type=int, default=2, help='Tamanho da amostra de municípios / CREDEs (páginas de municípios e de CREDEs)')
+    parser.add_argument('--repeticoes', type=int, default=5, help='Execuções medidas por combinação')
+    parser.add_argument('--escala', type=int, default=1, help='Escala dos dados sintéticos (ignorada com --dados)')
+    parser.add_argument('--dados', help='Pasta com os CSVs de memória a servir (padrão: dados sintéticos)')
+    parser.add_argument('--semente', type=int, default=0)
+    parser.add_argument('--timeout', type=float, default=120, help='Segundos máximos de cada execução da página')
+    parser.add_argument('--json', help='Grava os resultados completos neste arquivo')
+    parser.add_argument('--linha-de-base', help='Arquivo JSON da linha de base (comparada ao final, se existir)')
+    parser.add_argument('--grava-linha-de-base', action='store_true', help='Grava os resultados como a nova linha de base')
+    parser.add_argument('--tolerancia', type=float, default=0.25, help='Aumento relativo tolerado (0.25 = 25%%)')
+    parser.add_argument('--folga-ms', type=float, default=25)
+    parser.add_argument('--folga-mb', type=float, default=50)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as pasta:
+        # Tabelas servidas localmente; cache, artefatos e snapshot em pastas temporárias (carga a frio pelo CSV)
+        dados = args.dados
+        if dados is None:
+            dados = os.path.join(pasta, 'dados')
+            os.makedirs(dados)
+            gera_memoria(1, 'estado', args.semente).to_csv(os.path.join(dados, ARQUIVO_CE), index=False)
+            gera_memoria(args.escala, 'municipio', args.semente).to_csv(os.path.join(dados, ARQUIVO_MUN), index=False)
+        servidor = servidor_local(dados)
+        arquivo_medicao = os.path.join(pasta, 'medicao.jsonl')
+        os.environ.pop('SPAECE_MEDICAO', None)
+        os.environ.update({'SPAECE_URL_BASE': f'http://127.0.0.1:{servidor.server_address[1]}',
+                           'SPAECE_DIRETORIO_CACHE': os.path.join(pasta, 'cache'),
+                           'SPAECE_DIRETORIO_ARTEFATOS': os.path.join(pasta, 'artefatos'),
+                           'SPAECE_DIRETORIO_SNAPSHOT': os.path.join(pasta, 'snapshot'),
+                           'SPAECE_ARQUIVO_MEDICAO': arquivo_medicao})
+
+        inicio = time.perf_counter()
+        resultados = executa_matriz(args.paginas, args.redes, args.componentes, args.etapas, args.municipios, args.repeticoes,
+                                    arquivo_medicao, args.timeout, args.semente)
+        servidor.shutdown()
+
+    tabela = pd.DataFrame([{'combinação': c, **{m: v[m] for m in ['p50_ms', 'p95_ms', 'pico_mb']}}
+                           for c, v in resultados['combinacoes'].items()]).set_index('combinação')
+    print(tabela.to_string())
+    print(pd.DataFrame(resultados['paginas']).T.to_string())
+    print(f'{len(tabela)} combinações em {time.perf_counter() - inicio:.1f} s')
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(resultados, f, ensure_ascii=False, indent=2)
+
+    falhas = [f'{c}: {", ".join(v["erros"])}' for c, v in resultados['combinacoes'].items() if v['erros']]
+    if args.linha_de_base and os.path.exists(args.linha_de_base) and not args.grava_linha_de_base:
+        with open(args.linha_de_base, encoding='utf-8') as f:
+            falhas += compara_linha_de_base(resultados, json.load(f), args.tolerancia, args.folga_ms, args.folga_mb)
+    elif args.linha_de_base and args.grava_linha_de_base:
+        with open(args.linha_de_base, 'w', encoding='utf-8') as f:
+            json.dump(resultados, f, ensure_ascii=False, indent=2)
+        print(f'Linha de base gravada em {args.linha_de_base}')
+
+    if falhas:
+        print('\n'.join(['FALHAS:'] + falhas))
+        sys.exit(1)
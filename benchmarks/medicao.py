@@ -0,0 +1,43 @@
+import argparse                                     # Lib nativa para a linha de comando
+import os
+import tempfile
+
+from benchmarks.comum import cronometra
+from spaece.medicao import finaliza_medicao, inicia_medicao, trecho
+
+
+# Custo de um trecho de medição (`with trecho(...)`) desligado e ligado, com e sem o arquivo JSON lines.
+# Um rerun marca algumas dezenas de trechos: o custo por rerun é o custo por trecho vezes esse número.
+# Uso: python -m benchmarks.medicao --trechos 100000
+
+
+def marca(n):
+    for _ in range(n):
+        with trecho('estágio'):
+            pass
+
+def rerun(n):
+    inicia_medicao('benchmark')
+    marca(n)
+    finaliza_medicao()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--trechos', type=int, default=100000)
+    args = parser.parse_args()
+
+    for variavel in ('SPAECE_MEDICAO', 'SPAECE_ARQUIVO_MEDICAO'):
+        os.environ.pop(variavel, None)
+    base = cronometra(lambda: [None for _ in range(args.trechos)])
+    desligada = cronometra(lambda: rerun(args.trechos))
+
+    os.environ['SPAECE_MEDICAO'] = '1'
+    ligada = cronometra(lambda: rerun(args.trechos))
+
+    with tempfile.TemporaryDirectory() as pasta:
+        os.environ['SPAECE_ARQUIVO_MEDICAO'] = os.path.join(pasta, 'medicao.jsonl')
+        com_arquivo = cronometra(lambda: rerun(args.trechos))
+
+    for nome, ms in [('laço vazio', base), ('desligada', desligada), ('ligada (painel)', ligada), ('ligada + JSON lines', com_arquivo)]:
+        print(f'{nome:<22} {ms:9.1f} ms  ({ms * 1000 / args.trechos:.3f} µs por trecho)')
@@ -0,0 +1,27 @@
+import argparse                                     # Lib nativa para a linha de comando
+
+import pandas as pd
+
+from benchmarks.comum import cronometra
+from spaece.normalizacao import capitalizar_nome, normaliza_categorias
+
+
+# Micro-benchmark de capitalizar_nome sobre a coluna Município do arquivo municipal completo:
+# aplicação linha a linha (como era feito a cada rerun) x uma vez por categoria.
+# Uso: python -m benchmarks.normalizacao --csv memoria_mun_todas_etapas_v5.csv
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--csv', required=True, help='CSV de memória municipal')
+    parser.add_argument('--repeticoes', type=int, default=10)
+    args = parser.parse_args()
+
+    municipios = pd.read_csv(args.csv, usecols=['Município'])['Município']
+    categorico = municipios.astype('category')
+    print(f'{len(municipios)} linhas, {municipios.nunique()} municípios distintos')
+
+    por_linha = cronometra(lambda: municipios.apply(capitalizar_nome), args.repeticoes)
+    por_categoria = cronometra(lambda: normaliza_categorias(categorico, capitalizar_nome), args.repeticoes)
+    print(f'  apply por linha:      {por_linha:8.2f} ms')
+    print(f'  uma vez por categoria: {por_categoria:8.2f} ms ({por_linha / por_categoria:.0f}x)')
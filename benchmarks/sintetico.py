@@ -0,0 +1,102 @@
+import argparse                                     # Lib nativa para a linha de comando
+import os
+
+import numpy as np
+import pandas as pd
+
+from spaece.carregamento import ARQUIVO_CE, ARQUIVO_MUN, ARQUIVO_ESC, COLUNAS_CE, COLUNAS_MUN, COLUNAS_ESC
+from spaece.etapas import ETAPAS
+
+
+# Gerador de tabelas de memória sintéticas, com as mesmas colunas (e os mesmos valores crus: nomes em
+# maiúsculas, percentuais com 2 casas, padrões que não se aplicam à etapa vazios) dos CSVs do GitHub.
+# Escala 1 = 184 municípios em 20 CREDEs; na escala k cada município vira k unidades (nível escola),
+# todas com o mesmo Código da CREDE / CREDE do município de origem. No nível 'escola' o Município fica com o nome
+# do município de origem e cada unidade ganha uma coluna Escola (tabela de resultados por escola).
+# Uso: python -m benchmarks.sintetico --destino dados_sinteticos --escalas 1 10 100 [--escolas 100]
+
+MUNICIPIOS = 184
+CREDES = 20
+EDICOES = list(range(2008, 2020)) + [2022]
+
+# Proficiência média típica de cada etapa (centro da distribuição sintética)
+PROFICIENCIA_BASE = {'2º Ano do Ensino Fundamental': 140, '5º Ano do Ensino Fundamental': 200,
+                     '9º Ano do Ensino Fundamental': 250, '3ª Série do Ensino Médio': 270}
+
+
+## Funcao que gera a tabela municipal (nivel='municipio'), por escola (nivel='escola', `escala` escolas por município) ou estadual (nivel='estado') na escala pedida
+def gera_memoria(escala=1, nivel='municipio', semente=0, municipios=MUNICIPIOS):
+    rng = np.random.default_rng(semente)
+    combinacoes = [(espec, componente, rede.upper()) for espec in ETAPAS for componente in espec['componentes'] for rede in espec['redes']]
+    unidades = municipios * escala if nivel != 'estado' else 1
+    por_combinacao = unidades * len(EDICOES)
+    total = len(combinacoes) * por_combinacao
+
+    # Grade completa (combinação, unidade, edição) sem laço por linha
+    combinacao = np.repeat(np.arange(len(combinacoes)), por_combinacao)
+    unidade = np.tile(np.repeat(np.arange(unidades), len(EDICOES)), len(combinacoes))
+    dados = {
+        'Etapa': np.array([c[0]['etapa'] for c in combinacoes], dtype=object)[combinacao],
+        'Componente': np.array([c[1] for c in combinacoes], dtype=object)[combinacao],
+        'Rede': np.array([c[2] for c in combinacoes], dtype=object)[combinacao],
+        'Edição': np.tile(EDICOES, len(combinacoes) * unidades),
+    }
+    if nivel != 'estado':
+        municipio = unidade // escala
+        dados['Código da CREDE'] = municipio % CREDES + 1
+        dados['CREDE'] = np.array([f'CREDE {c}' for c in range(1, CREDES + 1)], dtype=object)[municipio % CREDES]
+    if nivel == 'municipio':
+        nomes = np.array([f'MUNICIPIO {m:03d} DE TESTE' + (f' - ESCOLA {u % escala:03d}' if escala > 1 else '')
+                          for u, m in enumerate(np.repeat(np.arange(municipios), escala))], dtype=object)
+        dados['Município'] = nomes[unidade]
+    elif nivel == 'escola':
+        dados['Município'] = np.array([f'MUNICIPIO {m:03d} DE TESTE' for m in range(municipios)], dtype=object)[municipio]
+        escolas = np.array([f'ESCOLA {u % escala:03d} DE MUNICIPIO {u // escala:03d}' for u in range(unidades)], dtype=object)
+        dados['Escola'] = escolas[unidade]
+
+    base = np.array([PROFICIENCIA_BASE[c[0]['etapa']] for c in combinacoes])[combinacao]
+    dados['Proficiência Média'] = np.round(base + rng.normal(0, 25, total), 2)
+    dados['Desvio Padrão'] = np.round(rng.uniform(20, 50, total), 2)
+    dados['Indicação do Padrão de Desempenho'] = np.full(total, 'Intermediário', dtype=object)
+
+    # Percentuais dos padrões: só as colunas da etapa de cada linha são preenchidas (soma 100)
+    for espec in ETAPAS:
+        linhas = np.isin(combinacao, [i for i, c in enumerate(combinacoes) if c[0] is espec])
+        percentuais = rng.dirichlet(np.ones(len(espec['padroes'])), linhas.sum()) * 100
+        for j, coluna in enumerate(espec['padroes']):
+            dados.setdefault(coluna, np.full(total, np.nan))[linhas] = np.round(percentuais[:, j], 2)
+
+    previstos = rng.integers(200, 5000, total) // (escala if nivel != 'estado' else 1) + 1
+    avaliados = (previstos * rng.uniform(0.7, 0.99, total)).astype(np.int64)
+    dados['Nº de Alunos Previstos'] = previstos
+    dados['Nº de Alunos Avaliados'] = avaliados
+    dados['Participação (%)'] = np.round(avaliados / previstos * 100, 2)
+
+    colunas = {'municipio': COLUNAS_MUN, 'escola': COLUNAS_ESC}.get(nivel, COLUNAS_CE)
+    return pd.DataFrame(dados)[colunas]
+
+## Funcao que grava os CSVs sintéticos (estadual + municipal em cada escala) e devolve os caminhos
+def salva_memoria(destino, escalas=(1,), semente=0, escolas=None):
+    os.makedirs(destino, exist_ok=True)
+    caminhos = [os.path.join(destino, ARQUIVO_CE)]
+    gera_memoria(1, 'estado', semente).to_csv(caminhos[0], index=False)
+    for escala in escalas:
+        nome = ARQUIVO_MUN if escala == 1 else f'{os.path.splitext(ARQUIVO_MUN)[0]}_{escala}x.csv'
+        caminhos.append(os.path.join(destino, nome))
+        gera_memoria(escala, 'municipio', semente).to_csv(caminhos[-1], index=False)
+    if escolas:
+        caminhos.append(os.path.join(destino, ARQUIVO_ESC))
+        gera_memoria(escolas, 'escola', semente).to_csv(caminhos[-1], index=False)
+    return caminhos
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--destino', default='dados_sinteticos', help='Pasta de saída dos CSVs')
+    parser.add_argument('--escalas', type=int, nargs='+', default=[1, 10, 100])
+    parser.add_argument('--escolas', type=int, help='Também grava a tabela por escola, com este número de escolas por município')
+    parser.add_argument('--semente', type=int, default=0)
+    args = parser.parse_args()
+
+    for caminho in salva_memoria(args.destino, args.escalas, args.semente, args.escolas):
+        print(f'{caminho} ({os.path.getsize(caminho) / 2**20:.1f} MB)')
@@ -0,0 +1,170 @@
+import argparse                                     # Lib nativa para a linha de comando
+import io
+import json
+import os
+import tempfile
+
+import pandas as pd
+import pyarrow as pa
+
+from benchmarks.comum import cronometra
+from benchmarks.sintetico import gera_memoria
+from spaece.artefatos import FORMATOS
+from spaece.comparacao import calcula_comparacao, municipios_por_crede
+from spaece.cubo import CuboAgregados
+from spaece.esquema import le_csv
+from spaece.etapas import ETAPAS, calcula_etapas, etapa_avaliada
+from spaece.hierarquia import cubos_hierarquia
+from spaece.graficos import graficos_comparacao, graficos_etapa, grafico_linhas, titulos_etapa
+from spaece.indice import IndiceFiltro
+from spaece.normalizacao import capitalizar_nome, normaliza_memoria
+from spaece.paginacao import TabelaPaginada
+
+
+# Suíte do pipeline da página de municípios, etapa por etapa, sobre tabelas sintéticas (sem rede: nada é baixado).
+# Cada estágio é medido na forma original das páginas e na atual, para mostrar qual deles cresce primeiro
+# com o número de linhas (escala 10 / 100 = nível escola):
+#   carga, normalização, filtragem (dados_filtrados), tabelas por etapa, figuras, comparação entre municípios,
+#   envio da tabela e conversões para download.
+# Uso: python -m benchmarks.suite --escalas 1 10 100 [--json resultados.json]
+
+
+## ------------------------ FORMAS ORIGINAIS (COMO NAS PÁGINAS ANTES DAS OTIMIZAÇÕES) ------------------------ ##
+
+def normalizacao_original(dados):
+    dados['Rede'] = dados['Rede'].str.capitalize()
+    dados['Município'] = dados['Município'].apply(capitalizar_nome)
+    return dados
+
+def filtragem_original(dados, rede, municipio, componente, edicao, proficiencia):
+    return dados[(dados['Rede'] == rede) & (dados['Município'].isin(municipio)) & (dados['Componente'] == componente) &
+                 (dados['Edição'].isin(edicao)) & (dados['Proficiência Média'].between(proficiencia[0], proficiencia[1]))]
+
+def etapas_original(dados_filtrados):
+    tabelas = {}
+    for espec in ETAPAS:
+        dados = dados_filtrados[dados_filtrados['Etapa'] == espec['etapa']].rename(columns=espec['renomeia'])
+        proficiencia = dados.groupby('Edição')['Proficiência Média'].mean().reset_index()
+        proficiencia['Proficiência Média'] = proficiencia['Proficiência Média'].round(1)
+        padroes = [espec['renomeia'].get(c, c) for c in espec['padroes']]
+        tabelas[espec['etapa']] = (dados, proficiencia, dados[['Edição'] + padroes], dados[['Edição', 'Participação (%)']])
+    return tabelas
+
+def serializa_tabela(df):
+    # Mesma conversão do st.dataframe (tabela Arrow em formato IPC) enviada ao navegador
+    tabela = pa.Table.from_pandas(df)
+    saida = pa.BufferOutputStream()
+    with pa.RecordBatchStreamWriter(saida, tabela.schema) as writer:
+        writer.write_table(tabela)
+    return saida.getvalue()
+
+def converte_csv(df):
+    return df.to_csv(index=False).encode('utf-8')
+
+def converte_xlsx(df):
+    saida = io.BytesIO()
+    with pd.ExcelWriter(saida, engine='xlsxwriter') as writer:
+        df.to_excel(writer, index=False)
+    return saida.getvalue()
+
+
+## ------------------------ SUÍTE ------------------------ ##
+
+## Funcao que mede todos os estágios em uma escala e devolve {estágio: ms}
+def executa_suite(escala, repeticoes=3, formatos=('csv', 'xlsx', 'parquet', 'arrow')):
+    resultados = {}
+    mede = lambda nome, funcao, n=repeticoes: resultados.__setitem__(nome, round(cronometra(funcao, n), 2))
+
+    with tempfile.TemporaryDirectory() as pasta:
+        caminho = os.path.join(pasta, 'memoria.csv')
+        gera_memoria(escala).to_csv(caminho, index=False)
+
+        # Carga
+        mede('carga: read_csv (original)', lambda: pd.read_csv(caminho), 1)
+        mede('carga: le_csv (esquema compacto)', lambda: le_csv(caminho), 1)
+        bruto, compacto = pd.read_csv(caminho), le_csv(caminho)
+
+        # Normalização dos nomes
+        mede('normalização: apply por linha (original)', lambda: normalizacao_original(bruto.copy()), 1)
+        mede('normalização: por categoria', lambda: normaliza_memoria(compacto.copy()), 1)
+        original, dados = normalizacao_original(bruto), normaliza_memoria(compacto)
+
+        # Estruturas construídas uma vez por versão dos dados
+        mede('versão: índice dos filtros', lambda: IndiceFiltro(dados), 1)
+        mede('versão: cubo de agregados', lambda: CuboAgregados(dados), 1)
+        mede('versão: hierarquia ponderada (CREDE / estado)', lambda: cubos_hierarquia(dados), 1)
+        indice, cubo = IndiceFiltro(dados), CuboAgregados(dados)
+
+        # Filtragem (dados_filtrados) e tabelas por etapa para um município (todas as suas escolas) / rede / componente
+        rede, componente = 'Municipal', 'Língua Portuguesa'
+        nome = dados['Município'].iloc[0].split(' - ')[0]
+        municipio = [m for m in dados['Município'].cat.categories if m.startswith(nome)]
+        edicao, proficiencia = dados['Edição'].unique(), (0, 500)
+        filtros = {'Rede': rede, 'Município': municipio, 'Componente': componente, 'Edição': edicao}
+        mede('filtragem: máscara booleana (original)', lambda: filtragem_original(original, rede, municipio, componente, edicao, proficiencia))
+        mede('filtragem: índice', lambda: indice.seleciona(filtros, proficiencia))
+        filtrados = filtragem_original(original, rede, municipio, componente, edicao, proficiencia)
+        mede('etapas: groupby por etapa (original)', lambda: etapas_original(filtrados))
+        mede('etapas: calcula_etapas (cubo)', lambda: calcula_etapas(indice, cubo, filtros, proficiencia))
+        tabelas = calcula_etapas(indice, cubo, filtros, proficiencia)
+
+        # Figuras das quatro etapas
+        avaliadas = [espec for espec in ETAPAS if etapa_avaliada(espec, rede, componente)]
+        mede('figuras: graficos_etapa (4 etapas)', lambda: [graficos_etapa(espec, tabelas[espec['etapa']], componente,
+                                                                           titulos_etapa(espec, rede, componente, nome), 'municipio')
+                                                            for espec in avaliadas])
+
+        # Comparação dos municípios de uma CREDE nos gráficos de linhas: um cálculo e uma figura por município
+        # (repetindo o caminho de um município) ou uma única seleção no cubo e uma figura com um traço por município
+        comparados = municipios_por_crede(dados)['CREDE 1']
+        espec = ETAPAS[1]
+        titulos = titulos_etapa(espec, rede, componente, 'CREDE 1')
+        def comparacao_por_municipio():
+            for municipio_comparado in comparados:
+                tabela_municipio = calcula_etapas(indice, cubo, {**filtros, 'Município': municipio_comparado}, proficiencia, [espec])[espec['etapa']]
+                grafico_linhas(tabela_municipio['proficiencia'], 'Proficiência Média', 'Proficiência Média Formatada', titulos['proficiencia'])
+                grafico_linhas(tabela_municipio['participacao'], 'Participação (%)', 'Participação Formatada', titulos['participacao'])
+        mede('comparação: laço por município (CREDE 1)', comparacao_por_municipio)
+        mede('comparação: uma seleção + uma figura (CREDE 1)',
+             lambda: graficos_comparacao(calcula_comparacao(cubo, filtros, comparados, espec, proficiencia), titulos))
+        resultados['municípios comparados'] = len(comparados)
+
+        # Envio da tabela de uma etapa com todos os municípios: inteira (original) ou só a página visível,
+        # ordenada e com busca no servidor
+        todos = indice.seleciona({'Rede': rede, 'Componente': componente, 'Etapa': '5º Ano do Ensino Fundamental'})
+        mede('tabela: serialização da etapa inteira (original)', lambda: serializa_tabela(todos))
+        mede('tabela: busca + ordenação + página (paginada)',
+             lambda: serializa_tabela(TabelaPaginada(todos).busca('Município', 'escola 00').ordena('Proficiência Média', False).pagina(1, 50)))
+        resultados['linhas da tabela enviada'] = len(todos)
+
+        tabela = tabelas['5º Ano do Ensino Fundamental']['dados']
+
+        # Conversões para download da tabela de uma etapa (original: as duas a cada interação)
+        mede('download: converte_csv + converte_xlsx (original)', lambda: (converte_csv(tabela), converte_xlsx(tabela)))
+        for formato in formatos:
+            destino = os.path.join(pasta, f'artefato.{formato}')
+            mede(f'download: {formato} (artefato)', lambda: FORMATOS[formato]['escritor'](tabela, destino))
+
+        resultados['linhas'] = len(dados)
+        resultados['linhas da etapa exportada'] = len(tabela)
+    return resultados
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--escalas', type=int, nargs='+', default=[1, 10, 100])
+    parser.add_argument('--repeticoes', type=int, default=3)
+    parser.add_argument('--json', help='Grava os resultados (ms por estágio e escala) neste arquivo')
+    args = parser.parse_args()
+
+    resultados = {}
+    for escala in args.escalas:
+        resultados[f'{escala}x'] = executa_suite(escala, args.repeticoes)
+        print(f'{escala}x ({resultados[f"{escala}x"]["linhas"]} linhas)', flush=True)
+
+    # Tabela: um estágio por linha, uma escala por coluna (ms)
+    tabela = pd.DataFrame(resultados).reindex(list(next(iter(resultados.values()))))  # Ordem dos estágios
+    print(tabela.to_string(float_format=lambda x: f'{x:,.1f}'))
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(resultados, f, ensure_ascii=False, indent=2)
@@ -1,12 +1,15 @@
-import pandas as pd                                 # Lib para manipução e tratamento de dados, tabelas e dataframes
 import streamlit as st                              # Lib para construção de deashboards interativos
-import requests                                     # Lib para requisições de APIs
-import plotly.express as px                         # Lib de alto nivel para formatação rápida de gráficos
-import plotly.graph_objects as go                   # Lib de baixo nível para alteração de plotagem do plotly
-import locale                                       # Lib para setar o padrão de separação decimal BR (não utlizada no projeto atual - inompatibilidade do o streanlit)
-import time                                         # Módulo para pequenas manipulações de tempo interativo
-import io                                           # Lib nativa para input / output binário
-import xlsxwriter                                   # Lib para engine de arquivos excel
+from spaece.carregamento import ARQUIVO_MUN, COLUNAS_MUN             # Tabelas de memória e colunas utilizadas na página
+from spaece.armazem import obtem_tabela, obtem_indice, obtem_cubo, obtem_versao, obtem_derivado  # Tabelas compartilhadas entre sessões (snapshot Parquet ou CSV em cache)
+from spaece.etapas import ETAPAS, calcula_etapas, etapa_avaliada, metricas_etapa  # Especificação das etapas e cálculo das tabelas em uma passada
+from spaece.graficos import graficos_etapa, graficos_vazios, graficos_comparacao, titulos_etapa  # Gráficos de cada etapa
+from spaece.comparacao import calcula_comparacao, municipios_por_crede  # Séries de vários municípios em uma única seleção no cubo
+from spaece.renderizacao import modo_etapas, cache_da_sessao        # Etapas calculadas sob demanda (só a selecionada)
+from spaece.cache_figuras import obtem_figuras, normaliza_filtros   # Figuras serializadas compartilhadas entre sessões
+from spaece.formatacao import formata_numero, formata_taxa, formata_proficiencia  # Formatação numérica no padrão brasileiro
+from spaece.interface import exibe_downloads, exibe_tabela, exibe_medicao, exibe_exportacao_lote  # Downloads, tabela paginada, exportação em lote e tempos do rerun (comuns às páginas)
+from spaece.medicao import inicia_medicao, finaliza_medicao, trecho, painel_medicao  # Tempos de cada estágio do rerun (opcional)
+from spaece.aquecimento import aquecimento_ativo, inicia_aquecimento  # Aquecimento do processo (tabelas, agregados e figuras padrão)
 
 # # Desabilita o aviso de Clear caches
 # st.set_option('deprecation.showfileUploaderEncoding', False)
@@ -18,6 +21,14 @@ st.set_page_config(page_title = 'DASHBOARD SPAECE', initial_sidebar_state = 'col
                                'Report a bug': 'https://www.linkedin.com/in/jos%C3%A9-alves-ferreira-neto-1bbbb8192/',
                                'Get help': 'https://www.seduc.ce.gov.br/'})
 
+# Medição dos estágios deste rerun (desligada por padrão: SPAECE_MEDICAO / SPAECE_ARQUIVO_MEDICAO)
+inicia_medicao('mun')
+
+# Deploys com `streamlit run`: a primeira sessão dispara, em segundo plano e uma única vez por processo, o aquecimento
+# das demais páginas (SPAECE_AQUECIMENTO=1; com `python -m spaece.aquecimento` o processo já parte aquecido)
+if aquecimento_ativo():
+    inicia_aquecimento()
+
 #Imagem lateral (sidebar)
 image = "spaece_tp2.png"
 st.sidebar.image(image)
@@ -29,28 +40,7 @@ st.sidebar.image(image)
 
 # Funcoes que formatam números, tanto para para utilização nas métricas
 
-def formata_numero(valor, prefixo=''):
-    for unidade in ['', 'mil', 'milhões']:
-        if valor < 1000:
-            valor_str = f'{valor:.2f}'  # Converte o valor para string com 2 casas decimais
-            valor_str = valor_str.replace('.', '|').replace(',', '.').replace('|', ',')  # Substitui os separadores
-            if valor.is_integer():
-                return f'{prefixo} {valor_str.replace(",00", "")} {unidade}'  # Remove o ",00" quando for um número inteiro
-            return f'{prefixo} {valor_str} {unidade}'
-        valor = valor / 1000
-
-## Funcao para valores dos rótulos dos gráficos
-def formata_numero_v2(valor, prefixo=''):
-    valor_formatado = f'{prefixo} {valor:.2f}'
-    return valor_formatado
-
-## Função para formatar a taxa de participação
-def formata_taxa(valor):
-    return f'{valor:.1f}'.replace('.', ',')
-
-## Função para formatar a proficiência da métrica
-def formata_proficiencia(valor):
-    return f'{valor:.1f}'.replace('.', ',')
+# Funções de formatação no padrão brasileiro (vetorizadas) em spaece/formatacao.py
 
 # Mensagem para o usuário (interajir com o side bar)
 st.markdown('<span style="color: blue; font-weight: bold"> :arrow_upper_left: Interaja para mais opções.</span>', unsafe_allow_html=True)
@@ -59,65 +49,36 @@ st.markdown('<span style="color: blue; font-weight: bold"> :arrow_upper_left: In
 st.title('Plataforma de visualização de dados do SPAECE :chart_with_upwards_trend:')
 #st.markdown('<span style="color: green;"><b>2º Ano Ensino Fundamental - SPAECE ALFA - Dashboard: Estado do Ceará</b></span>', unsafe_allow_html=True)
 
-# Funcao para capitalizar nomes completos (aqui usar nos numicípios)
-def capitalizar_nome(nome_completo):
-    # Palavras que não serão capitalizadas
-    palavras_nao_capitalizadas = ['da', 'de', 'do', 'das', 'dos', 'e']
-
-    # Divide o nome completo em palavras
-    palavras = nome_completo.lower().split()
-
-    # Capitaliza todas as palavras que não estão na lista de palavras não capitalizadas
-    nome_capitalizado = ' '.join([palavra.capitalize() if palavra not in palavras_nao_capitalizadas else palavra for palavra in palavras])
-
-    return nome_capitalizado
-
-# Funcoes para dowload de arquivos
-## Dowmload de .csv
-@st.cache_data # Decorator necessário para evitar a geração contínua de muitos arquivos iguais
-def converte_csv(df):
-    return df.to_csv(index = False).encode('utf-8')
-
-## Dowmload de .xlsx
-@st.cache_data # Decorator necessário para evitar a geração contínua de muitos arquivos iguais
-def converte_xlsx(df):
-    output = io.BytesIO()
-    with pd.ExcelWriter(output, engine='xlsxwriter', datetime_format='yyyy-mm-dd', date_format='yyyy-mm-dd') as writer:  # Para valores de datas constantes no df
-        df.to_excel(writer, index=False)   # Chamada da funcao do pandas to_excel
-        workbook = writer.book  # workbook é uma variável que representa o objeto do livro do Excel (Workbook) associado ao ExcelWriter (objeto writer).         
-        worksheet = writer.sheets['Sheet1'] # worksheet é uma variável que representa uma planilha específica dentro do livro do Excel. 
-        header_format = workbook.add_format({'border': False}) # header_format é uma variável que representa um objeto de formatação (Format) no workbook
-        for col_num, value in enumerate(df.columns.values): # Usando workbook.add_format(), criamos um novo objeto de formatação e o associamos ao workbook (livro do Excel)
-            worksheet.write(0, col_num, value, header_format)
-    output.seek(0) # mover o cursor de leitura/escrita para a posição 0 (início) no fluxo de bytes.
-    return output.getvalue()
-
-## Mensagem de sucesso
-def mensagem_sucesso():
-    sucesso = st.success('Arquivo baixado com sucesso!', icon="✅")
-    time.sleep(3)  
-    sucesso.empty()
-
 
 # ------------------------ SOLICITACOES / FILTRAGENS ------------------------ ##
 
-# Carregar o arquivo para MUN em CSV do GitHub
-url_mun = 'https://raw.githubusercontent.com/jose-alves-fn/jose-alves-fn-tabelas_spaece_memoria_2008_2022/main/memoria_mun_todas_etapas_v5.csv'
-dados_mun = pd.read_csv(url_mun)
+# Carregar o arquivo para MUN (snapshot Parquet, se construído, ou CSV do GitHub com cache em disco)
+with trecho('carga da tabela'):
+    dados_mun = obtem_tabela(ARQUIVO_MUN, COLUNAS_MUN)  # Compartilhado entre sessões e já normalizado (Rede e Município capitalizados) no carregamento
 
 ## Titulo do sidebar
 st.sidebar.title('Filtros')
 
 ## Filtragem de redes
-dados_mun['Rede'] = dados_mun['Rede'].str.capitalize()
 redes = ['Municipal', 'Estadual']
 rede = st.sidebar.selectbox('Rede', redes)
 
 ## Filtragem de município
-dados_mun['Município'] = dados_mun['Município'].apply(capitalizar_nome)  # Aplicando a função capitalizar_nome()
 municipios = dados_mun['Município'].unique()
 municipio = st.sidebar.selectbox('Município', municipios)
 
+## Comparação entre municípios (vários municípios ou uma CREDE inteira nos gráficos de proficiência e participação)
+comparar = st.sidebar.checkbox('Comparar municípios', value = False)
+municipios_comparados, local_comparacao = [], None
+if comparar:
+    if st.sidebar.radio('Comparar', ['Municípios', 'CREDE inteira'], horizontal=True, key='modo_comparacao') == 'Municípios':
+        municipios_comparados = st.sidebar.multiselect('Municípios comparados', municipios, key='municipios_comparados')
+        local_comparacao = f'{len(municipios_comparados)} MUNICÍPIOS'
+    else:
+        credes = obtem_derivado(ARQUIVO_MUN, COLUNAS_MUN, 'municipios_por_crede', municipios_por_crede)  # Uma vez por versão dos dados
+        local_comparacao = st.sidebar.selectbox('CREDE comparada', list(credes), key='crede_comparada')
+        municipios_comparados = credes[local_comparacao]
+
 # Filtragem de componente
 componentes = ['Língua Portuguesa', 'Matemática']
 componente = st.sidebar.selectbox('Componente', componentes)
@@ -144,1210 +105,134 @@ else:
     proficiencia = st.sidebar.slider('Selecione um intervalo', 0, 500, value = (0,500)) # Três parâmetros, sendo 1. Label, 2. Min, 3. Max
 
 # Filtrar os dados com base na seleção dos filtros acima
-dados_filtrados = dados_mun[
-                        (dados_mun['Rede'] == rede) &
-                        (dados_mun['Município'] == municipio) &
-                        (dados_mun['Componente'] == componente) &
-                        (dados_mun['Edição'].isin(edicao)) &
-                        #(dados_mun['Indicação do Padrão de Desempenho'].isin(padroes)) &
-                        (dados_mun['Proficiência Média'].between(proficiencia[0], proficiencia[1]))
-]
-
-## ------------------------ TABELAS ------------------------ ##
-
-## ------------------------ 2º ANO ------------------------- ##
-
-
-dados_mun_2_ano = dados_filtrados[['Etapa', 'Componente', 'Rede', 'Código da CREDE', 'CREDE', 'Município', 
-                                'Edição', 'Proficiência Média', 'Desvio Padrão', 'Indicação do Padrão de Desempenho',
-                                '% Não Alfabetizado', '% Alfabetização Incompleta',
-                                '% Intermediário (2º Ano)', '% Suficiente', '% Desejável',
-                                'Nº de Alunos Previstos', 'Nº de Alunos Avaliados', 'Participação (%)']]
-
-### Filtro de etapa para a tabela
-dados_mun_2_ano = dados_mun_2_ano[dados_mun_2_ano['Etapa'] == '2º Ano do Ensino Fundamental'] 
-
-### Renomeando o padrão Intermediário (por default na base vem diferente)
-dados_mun_2_ano = dados_mun_2_ano.rename(columns={'% Intermediário (2º Ano)': '% Intermediário'})
-
-### Criando tabelas para a proficiencia por edicao
-proficiencia_edicao_2_mun = dados_mun_2_ano.groupby('Edição')['Proficiência Média'].mean().reset_index()
-proficiencia_edicao_2_mun['Proficiência Média'] = proficiencia_edicao_2_mun['Proficiência Média'].round(1)
-
-### Criando tabela para a distribuição por padrão de desempenho
-dados_barras_empilhadas_2_mun = dados_mun_2_ano[['Edição', '% Não Alfabetizado', '% Alfabetização Incompleta', '% Intermediário', '% Suficiente', '% Desejável']]
-
-### Criando tabela para participação por edição 
-dados_linhas_participação_2_mun = dados_mun_2_ano[['Edição', 'Participação (%)']]
-
-
-## ------------------------ 5º ANO ------------------------- ##
-
-dados_mun_5_ano = dados_filtrados[['Etapa', 'Componente', 'Rede', 'Código da CREDE', 'CREDE', 'Município', 
-                                'Edição', 'Proficiência Média', 'Desvio Padrão', 'Indicação do Padrão de Desempenho',
-                                '% Muito Crítico', '% Crítico', '% Intermediário', '% Adequado',
-                                'Nº de Alunos Previstos', 'Nº de Alunos Avaliados', 'Participação (%)']]
-
-### Filtro de etapa para a tabela
-dados_mun_5_ano = dados_mun_5_ano[dados_mun_5_ano['Etapa'] == '5º Ano do Ensino Fundamental']    
-
-### Criando tabelas para a proficiencia por edicao
-proficiencia_edicao_5_mun = dados_mun_5_ano.groupby('Edição')['Proficiência Média'].mean().reset_index()
-proficiencia_edicao_5_mun['Proficiência Média'] = proficiencia_edicao_5_mun['Proficiência Média'].round(1)
-
-### Criando tabela para a distribuição por padrão de desempenho
-dados_barras_empilhadas_5_mun = dados_mun_5_ano[['Edição', '% Muito Crítico', '% Crítico', '% Intermediário', '% Adequado',]]
-
-### Criando tabela para participação por edição 
-dados_linhas_participação_5_mun = dados_mun_5_ano[['Edição', 'Participação (%)']]
-
-
-## ------------------------ 9º ANO ------------------------- ##
-
-dados_mun_9_ano = dados_filtrados[['Etapa', 'Componente', 'Rede', 'Código da CREDE', 'CREDE', 'Município', 
-                                'Edição', 'Proficiência Média', 'Desvio Padrão', 'Indicação do Padrão de Desempenho',
-                                '% Muito Crítico', '% Crítico', '% Intermediário', '% Adequado',
-                                'Nº de Alunos Previstos', 'Nº de Alunos Avaliados', 'Participação (%)']]
-
-dados_mun_9_ano = dados_mun_9_ano[dados_mun_9_ano['Etapa'] == '9º Ano do Ensino Fundamental']    
-
-### Criando tabelas para a proficiencia por edicao
-proficiencia_edicao_9_mun = dados_mun_9_ano.groupby('Edição')['Proficiência Média'].mean().reset_index()
-proficiencia_edicao_9_mun['Proficiência Média'] = proficiencia_edicao_9_mun['Proficiência Média'].round(1)
-
-### Criando tabela para a distribuição por padrão de desempenho
-dados_barras_empilhadas_9_mun = dados_mun_9_ano[['Edição', '% Muito Crítico', '% Crítico', '% Intermediário', '% Adequado',]]
-
-### Criando tabela para participação por edição 
-dados_linhas_participação_9_mun = dados_mun_9_ano[['Edição', 'Participação (%)']]
-
-
-## ------------------------ 3ª SERIE ------------------------- ##
-
-dados_mun_3_ano = dados_filtrados[['Etapa', 'Componente', 'Rede', 'Código da CREDE', 'CREDE', 'Município', 
-                                'Edição', 'Proficiência Média', 'Desvio Padrão', 'Indicação do Padrão de Desempenho',
-                                '% Muito Crítico', '% Crítico', '% Intermediário', '% Adequado',
-                                'Nº de Alunos Previstos', 'Nº de Alunos Avaliados', 'Participação (%)']]
-
-dados_mun_3_ano = dados_mun_3_ano[dados_mun_3_ano['Etapa'] == '3ª Série do Ensino Médio']      
-
-### Criando tabelas para a proficiencia por edicao
-proficiencia_edicao_3_mun = dados_mun_3_ano.groupby('Edição')['Proficiência Média'].mean().reset_index()
-proficiencia_edicao_3_mun['Proficiência Média'] = proficiencia_edicao_3_mun['Proficiência Média'].round(1)
-
-### Criando tabela para a distribuição por padrão de desempenho
-dados_barras_empilhadas_3_mun = dados_mun_3_ano[['Edição', '% Muito Crítico', '% Crítico', '% Intermediário', '% Adequado',]]
-
-### Criando tabela para participação por edição 
-dados_linhas_participação_3_mun = dados_mun_3_ano[['Edição', 'Participação (%)']]
-
-## ------------------------ GRÁFICOS ------------------------ ##
-
-## ------------------------ 2º ANO ------------------------- ##
-
-# Criação das figuras vazias para os gráficos
-fig_proficiencia_edicao_2_mun = go.Figure()
-fig_participacao_edicao_2_mun = go.Figure()
-fig_proficiencia_edicao_2_mun_bar = go.Figure()
-fig_barras_empilhadas_2_mun = go.Figure()
-
-if componente == 'Matemática':
-    pass
-else:
-
-    ### Gráfico de LINHAS para proficiência média longitudinal
-
-    # Formatando manualmente os valores do eixo y (atenção o locale-br não funciona em todos as aplicações)
-    # proficiencia_edicao_2_mun['Proficiência Média Formatada'] = proficiencia_edicao_2_mun['Proficiência Média'].apply(lambda x: locale.format('%.1f', x))
-    proficiencia_edicao_2_mun['Proficiência Média Formatada'] = proficiencia_edicao_2_mun['Proficiência Média'].apply(lambda x: f'{x:.1f}'.replace('.', ','))
-
-    fig_proficiencia_edicao_2_mun = px.line(proficiencia_edicao_2_mun,
-                                x = 'Edição',
-                                y = 'Proficiência Média',
-                                markers=True,
-                                #range_y = (70, 270),
-                                text='Proficiência Média Formatada',
-                                #color = 'Edição',
-                                #line_dash = 'Edição',
-                                title = f'PROFICIÊNCIA MÉDIA - 2º ANO - {(componente).upper()} - {(municipio).upper()}'
-                                )
-
-    #fig_proficiencia_edicao_2_mun.update_layout(yaxis_title = 'Proficiência Média')
-    fig_proficiencia_edicao_2_mun.update_layout(xaxis=dict(type='category', categoryorder='category ascending', title_text=''))  # Definir o tipo de eixo como categoria
-    #proficiencia_edicao_2_mun.update_xaxes(showgrid=False, showline=True, linecolor='lightgray')
-    #proficiencia_edicao_2_mun.update_yaxes(showgrid=True, showline=True, linecolor='lightgray')
-    fig_proficiencia_edicao_2_mun.update_traces(textposition='bottom center', line=dict(color='#548235'))  # Ajustar a posição dos rótulos de dados
-
-
-### Gráfico de LINHAS para participação
-
-    # Formatando manualmente os valores do eixo y
-    dados_linhas_participação_2_mun['Participação Formatada'] = dados_linhas_participação_2_mun['Participação (%)'].apply(lambda x: f'{x:.1f}'.replace('.', ','))
-
-    fig_participacao_edicao_2_mun = px.line(dados_linhas_participação_2_mun,
-                                x = 'Edição',
-                                y = 'Participação (%)',
-                                markers=True,
-                                #range_y = (30, 135),
-                                text='Participação Formatada',
-                                #color = 'Edição',
-                                #line_dash = 'Edição',
-                                title = f'PARTICIPAÇÃO - 2º ANO - {(municipio).upper()}'
-                                )
-
-    fig_participacao_edicao_2_mun.update_layout(xaxis=dict(type='category', categoryorder='category ascending', title_text=''))  # Definir o tipo de eixo como categoria
-    # Usar o parametro do xaxis title = 0.25 ou mais para ajustar o titulo
-    # fig_participacao_edicao_2_mun.update_xaxes(showgrid=False, showline=True, linecolor='lightgray')
-    # fig_participacao_edicao_2_mun.update_yaxes(showgrid=True, showline=True, linecolor='lightgray')
-    fig_participacao_edicao_2_mun.update_traces(textposition='bottom center', line=dict(color='#548235'))  # Ajustar a posição dos rótulos de dados
-
-### Gráfico de BARRAS para padrões de desempenho longitudinal
-
-    # Definir os intervalos de cores e as respectivas cores
-    intervalos_2_ano = [0, 75, 100, 125, 150, 500]
-    cores = ['#FF0000', '#FFC000', '#FFFF00', '#C6E0B4', '#548235']
-
-    # Adicionar uma coluna "Intervalo" ao DataFrame com base nos intervalos
-    proficiencia_edicao_2_mun['Intervalo'] = pd.cut(proficiencia_edicao_2_mun['Proficiência Média'], bins=intervalos_2_ano, labels=False)
-
-    padrao_map = {
-        0: 'Não alfabetizado',
-        1: 'Alfabetização incompleta',
-        2: 'Intermediário',
-        3: 'Suficiente',
-        4: 'Desejável'
-    }
-
-    # Formatando manualmente os valores do eixo y
-    #proficiencia_edicao_2_mun['Proficiência Média Formatada'] = proficiencia_edicao_2_mun['Proficiência Média'].apply(lambda x: locale.format('%.1f', x))
-    proficiencia_edicao_2_mun['Proficiência Média Formatada'] = proficiencia_edicao_2_mun['Proficiência Média'].apply(lambda x: f'{x:.1f}'.replace('.', ','))
-
-    fig_proficiencia_edicao_2_mun_bar = go.Figure()
-
-    # Número máximo e mínimo de edições que você deseja exibir com a largura adaptável
-    numero_maximo_edicoes = 15  # Variar esse valor sempre que for atualizar o script
-    numero_minimo_edicoes = 1
-
-    # Calculando o número de edições exibidas no gráfico
-    num_edicoes_exibidas = len(proficiencia_edicao_2_mun['Edição'].unique())
-
-    # Calculando a largura das barras com base no número de edições
-    # Utilizando uma regra de três para ajustar o valor do width
-    width_maximo = 0.8
-    width_minimo = 0.1
-    width_adaptavel = width_minimo + (width_maximo - width_minimo) * ((num_edicoes_exibidas - numero_minimo_edicoes) / (numero_maximo_edicoes - numero_minimo_edicoes))
-
-    for i, intervalo in enumerate(intervalos_2_ano[:-1]):
-        data = proficiencia_edicao_2_mun[proficiencia_edicao_2_mun['Intervalo'] == i]
-        fig_proficiencia_edicao_2_mun_bar.add_trace(go.Bar(
-            x=data['Edição'],
-            y=data['Proficiência Média'],
-            marker=dict(color=cores[i]),
-            name=padrao_map[i],
-            text=data['Proficiência Média Formatada'],
-            textposition='outside', 
-            width = width_adaptavel
-        ))
-
-    fig_proficiencia_edicao_2_mun_bar.update_layout(
-        xaxis=dict(type='category', categoryorder='category ascending'),
-        yaxis=dict(range=[50, 300]),
-        showlegend=True,
-        title=f'PADRÃO DE DESEMPENHO - 2º ANO - {(municipio.upper())}'
-    )
-
-    # fig_proficiencia_edicao_2_mun_bar.update_traces(marker=dict(line=dict(color='rgb(8,8,8)',width=1.5)))
-    # fig_proficiencia_edicao_2_mun_bar.show()
-
-### Gráfico de BARRAS EMPILHADAS para padrões de desempenho percentual
-
-    # Alterando as edições localmente para que o eixo y compreenda
-    mapeamento_edicoes = {
-        '2019': '(2019)',
-        '2018': '(2018)',
-        '2017': '(2017)',
-        '2016': '(2016)',
-        '2015': '(2015)',
-        '2014': '(2014)',
-        '2013': '(2013)',
-        '2012': '(2012)',
-        '2011': '(2011)',
-        '2010': '(2010)',
-        '2009': '(2009)',
-        '2008': '(2008)',
-        '2007': '(2007)'
-    }
-
-    dados_barras_empilhadas_2_mun['Edição'] = dados_barras_empilhadas_2_mun['Edição'].replace(mapeamento_edicoes)
-
-    # Criando um dict para passar as cores para os padrões
-    intervalos_2_ano = ['% Não Alfabetizado', '% Alfabetização Incompleta', '% Intermediário', '% Suficiente', '% Desejável']
-    cores = ['#FF0000', '#FFC000', '#FFFF00', '#C6E0B4', '#548235']
-    mapeamento_cores = dict(zip(intervalos_2_ano, cores))
-
-    # Criação da figura
-    fig_barras_empilhadas_2_mun = go.Figure()
-
-    # Número máximo de edições que você deseja exibir sem aplicar auto scale
-    numero_maximo_edicoes = 15
-
-    # Verificando quantas edições serão exibidas no gráfico
-    num_edicoes_exibidas = len(dados_barras_empilhadas_2_mun['Edição'])
-
-    # Definindo a altura mínima e máxima do gráfico
-    altura_minima = 250
-    altura_maxima = 675
-
-    # Calculando a altura ideal do gráfico com base no número de edições exibidas
-    altura_ideal = altura_minima + (altura_maxima - altura_minima) * (num_edicoes_exibidas / numero_maximo_edicoes)
-
-    # Limitando a altura do gráfico entre a altura mínima e máxima
-    altura_final = max(altura_minima, min(altura_ideal, altura_maxima))
-
-    # Usando um loop for para iterar e gerar cada barra
-    for intervalo in intervalos_2_ano:
-            fig_barras_empilhadas_2_mun.add_trace(go.Bar(
-            y=dados_barras_empilhadas_2_mun['Edição'],
-            x=dados_barras_empilhadas_2_mun[intervalo],
-            name=intervalo,
-            orientation='h',
-            text = dados_barras_empilhadas_2_mun[intervalo].apply(lambda x: f'{x:.1f}'.replace('.', ',')),  # Formatação BR
-            textposition='inside',
-            textfont=dict(size=12),  # Tamanho da fonte do texto
-            insidetextanchor='middle',  # Centralizar o texto dentro da barra
-            width=0.7,
-            marker=dict(color=mapeamento_cores[intervalo])
-        ))
-
-    # Agrupando as barras via layout, barmode = 'stack' (barra empilhada)
-    fig_barras_empilhadas_2_mun.update_layout(
-        barmode='stack',
-        title=f'DISTRIBUIÇÃO POR PADRÃO DE DESEMPENHO - 2º ANO - {(municipio).upper()}',
-        xaxis_title='', # Percentual
-        yaxis_title='', # Edição
-        showlegend=True,
-        xaxis=dict(range=[0, 100],  showticklabels = False),
-        height=altura_final,
-        bargap=0.1 # ajuste de espaçamento das barras 
-        #margin=dict(l=300)  # Ajuste a margem esquerda conforme necessário
-    )
-    #fig_barras_empilhadas_2_mun.update_layout(width=1400)
-
-
-
-## ------------------------ 5º ANO ------------------------- ##
-
-### Gráfico de LINHAS para proficiência média longitudinal
-
-# Formatando manualmente os valores do eixo y
-#proficiencia_edicao_5_mun['Proficiência Média Formatada'] = proficiencia_edicao_5_mun['Proficiência Média'].apply(lambda x: locale.format('%.1f', x))
-proficiencia_edicao_5_mun['Proficiência Média Formatada'] = proficiencia_edicao_5_mun['Proficiência Média'].apply(lambda x: f'{x:.1f}'.replace('.',','))
-
-fig_proficiencia_edicao_5_mun = px.line(proficiencia_edicao_5_mun,
-                            x = 'Edição',
-                            y = 'Proficiência Média',
-                            markers=True,
-                            #range_y = (130, 330),
-                            text='Proficiência Média Formatada',
-                            #color = 'Edição',
-                            #line_dash = 'Edição',
-                            title = f'PROFICIÊNCIA MÉDIA - 5º ANO - REDE {(rede).upper()} - {(municipio).upper()} - {(componente).upper()}'
-                            )
-
-#fig_proficiencia_edicao_5_mun.update_layout(yaxis_title = 'Proficiência Média')
-fig_proficiencia_edicao_5_mun.update_layout(xaxis=dict(type='category', categoryorder='category ascending', title_text=''))  # Definir o tipo de eixo como categoria
-#fig_proficiencia_edicao_5_mun.update_xaxes(showgrid=False, showline=True, linecolor='lightgray')
-#fig_proficiencia_edicao_5_mun.update_yaxes(showgrid=True, showline=True, linecolor='lightgray')
-fig_proficiencia_edicao_5_mun.update_traces(textposition='bottom center', line=dict(color='#548235'))  # Ajustar a posição dos rótulos de dados
-
-### Gráfico de LINHAS para participação
-
-# Formatando manualmente os valores do eixo y
-# dados_linhas_participação_5_mun['Participação Formatada'] = dados_linhas_participação_5_mun['Participação (%)'].apply(lambda x: locale.format('%.1f', x))
-dados_linhas_participação_5_mun['Participação Formatada'] = dados_linhas_participação_5_mun['Participação (%)'].apply(lambda x: f'{x:.1f}'.replace('.',','))
-
-fig_participacao_edicao_5_mun = px.line(dados_linhas_participação_5_mun,
-                            x = 'Edição',
-                            y = 'Participação (%)',
-                            markers=True,
-                            #range_y = (30, 110),
-                            text='Participação Formatada',
-                            #color = 'Edição',
-                            #line_dash = 'Edição',
-                            title = f'PARTICIPAÇÃO - 5º ANO - REDE {(rede).upper()} - {(municipio).upper()}'
-                            )
-
-fig_participacao_edicao_5_mun.update_layout(xaxis=dict(type='category', categoryorder='category ascending', title_text=''))  # Definir o tipo de eixo como categoria
-# fig_participacao_edicao_5_mun.update_xaxes(showgrid=False, showline=True, linecolor='lightgray')
-# fig_participacao_edicao_5_mun.update_yaxes(showgrid=True, showline=True, linecolor='lightgray')
-fig_participacao_edicao_5_mun.update_traces(textposition='bottom center', line=dict(color='#548235'))  # Ajustar a posição dos rótulos de dados
-
-
-### Gráfico de BARRAS para padrões de desempenho longitudinal
-
-if componente == 'Língua Portuguesa': # >>>>>> LÍNGUA PORTUGUESA
-
-    # Definir os intervalos de cores e as respectivas cores
-    intervalos_5_ano_lp = [0, 125, 175, 225, 500]
-    # intervalos_5_ano_mt = [0, 150, 200, 250, 500]
-    cores = ['#FF0000', '#FFC000', '#C6E0B4', '#548235']
-
-    # Adicionar uma coluna "Intervalo" ao DataFrame com base nos intervalos
-    proficiencia_edicao_5_mun['Intervalo'] = pd.cut(proficiencia_edicao_5_mun['Proficiência Média'], bins=intervalos_5_ano_lp, labels=False)
-
-    padrao_map = {
-        0: '% Muito Crítico',
-        1: '% Crítico',
-        2: '% Intermediário',
-        3: '% Adequado'
-    }
-
-    # Formatando manualmente os valores do eixo y
-    #proficiencia_edicao_5_mun['Proficiência Média Formatada'] = proficiencia_edicao_5_mun['Proficiência Média'].apply(lambda x: locale.format('%.1f', x))
-    proficiencia_edicao_5_mun['Proficiência Média Formatada'] = proficiencia_edicao_5_mun['Proficiência Média'].apply(lambda x: f'{x:.1f}'.replace('.',','))
-
-    fig_proficiencia_edicao_5_mun_bar = go.Figure()
-
-    # Número máximo e mínimo de edições que você deseja exibir com a largura adaptável
-    numero_maximo_edicoes = 15  # Variar esse valor sempre que for atualizar o script
-    numero_minimo_edicoes = 1
-
-    # Calculando o número de edições exibidas no gráfico
-    num_edicoes_exibidas = len(proficiencia_edicao_5_mun['Edição'].unique())
-
-    # Calculando a largura das barras com base no número de edições
-    # Utilizando uma regra de três para ajustar o valor do width
-    width_maximo = 0.8
-    width_minimo = 0.1
-    width_adaptavel = width_minimo + (width_maximo - width_minimo) * ((num_edicoes_exibidas - numero_minimo_edicoes) / (numero_maximo_edicoes - numero_minimo_edicoes))
-
-    for i, intervalo in enumerate(intervalos_5_ano_lp[:-1]):
-        data = proficiencia_edicao_5_mun[proficiencia_edicao_5_mun['Intervalo'] == i]
-        fig_proficiencia_edicao_5_mun_bar.add_trace(go.Bar(
-            x=data['Edição'],
-            y=data['Proficiência Média'],
-            marker=dict(color=cores[i]),
-            name=padrao_map[i],
-            text=data['Proficiência Média Formatada'],
-            textposition='outside',
-            width = width_adaptavel
-        ))
-
-    fig_proficiencia_edicao_5_mun_bar.update_layout(
-        xaxis=dict(type='category', categoryorder='category ascending'),
-        yaxis=dict(range=[100, 350]),
-        showlegend=True,
-        title=f'PADRÃO DE DESEMPENHO - 5º ANO - REDE {(rede).upper()} - {(municipio).upper()} - {(componente).upper()}'
-    )
-
-    # fig_proficiencia_edicao_5_mun_bar.update_traces(marker=dict(line=dict(color='rgb(8,8,8)',width=1.5)))
-    # fig_proficiencia_edicao_5_mun_bar.show()
-
-else: # >>>>>> MATEMÁTICA
-    # Definir os intervalos de cores e as respectivas cores
-    intervalos_5_ano_mt = [0, 150, 200, 250, 500]
-    cores = ['#FF0000', '#FFC000', '#C6E0B4', '#548235']
-
-    # Adicionar uma coluna "Intervalo" ao DataFrame com base nos intervalos
-    proficiencia_edicao_5_mun['Intervalo'] = pd.cut(proficiencia_edicao_5_mun['Proficiência Média'], bins=intervalos_5_ano_mt, labels=False)
-
-    padrao_map = {
-        0: '% Muito Crítico',
-        1: '% Crítico',
-        2: '% Intermediário',
-        3: '% Adequado'
-    }
-
-    # Formatando manualmente os valores do eixo y
-    #proficiencia_edicao_5_mun['Proficiência Média Formatada'] = proficiencia_edicao_5_mun['Proficiência Média'].apply(lambda x: locale.format('%.1f', x))
-    proficiencia_edicao_5_mun['Proficiência Média Formatada'] = proficiencia_edicao_5_mun['Proficiência Média'].apply(lambda x: f'{x:.1f}'.replace('.',','))
-
-    fig_proficiencia_edicao_5_mun_bar = go.Figure()
-
-    # Número máximo e mínimo de edições que você deseja exibir com a largura adaptável
-    numero_maximo_edicoes = 15  # Variar esse valor sempre que for atualizar o script
-    numero_minimo_edicoes = 1
-
-    # Calculando o número de edições exibidas no gráfico
-    num_edicoes_exibidas = len(proficiencia_edicao_5_mun['Edição'].unique())
-
-    # Calculando a largura das barras com base no número de edições
-    # Utilizando uma regra de três para ajustar o valor do width
-    width_maximo = 0.8 # (ocupar mais espaço da plotagem)
-    width_minimo = 0.1 
-    width_adaptavel = width_minimo + (width_maximo - width_minimo) * ((num_edicoes_exibidas - numero_minimo_edicoes) / (numero_maximo_edicoes - numero_minimo_edicoes))
-
-    for i, intervalo in enumerate(intervalos_5_ano_mt[:-1]):
-        data = proficiencia_edicao_5_mun[proficiencia_edicao_5_mun['Intervalo'] == i]
-        fig_proficiencia_edicao_5_mun_bar.add_trace(go.Bar(
-            x=data['Edição'],
-            y=data['Proficiência Média'],
-            marker=dict(color=cores[i]),
-            name=padrao_map[i],
-            text=data['Proficiência Média Formatada'],
-            textposition='outside',
-            width = width_adaptavel
-        ))
-
-    fig_proficiencia_edicao_5_mun_bar.update_layout(
-        xaxis=dict(type='category', categoryorder='category ascending'),
-        yaxis=dict(range=[130, 360]),
-        showlegend=True,
-        title=f'PADRÃO DE DESEMPENHO - 5º ANO - REDE {(rede).upper()} - {(municipio).upper()} - {(componente).upper()}'
-    )
-
-    # fig_proficiencia_edicao_5_mun_bar.update_traces(marker=dict(line=dict(color='rgb(8,8,8)',width=1.5)))
-    # fig_proficiencia_edicao_5_mun_bar.show()
-
-
-### Gráfico de BARRAS EMPILHADAS para padrões de desempenho percentual
-
-# Alterando as edições localmente para que o eixo y compreenda
-mapeamento_edicoes = {
-    '2019': '(2019)',
-    '2018': '(2018)',
-    '2017': '(2017)',
-    '2016': '(2016)',
-    '2015': '(2015)',
-    '2014': '(2014)',
-    '2013': '(2013)',
-    '2012': '(2012)',
-    '2011': '(2011)',
-    '2010': '(2010)',
-    '2009': '(2009)',
-    '2008': '(2008)',
-    '2007': '(2007)'
-}
-
-dados_barras_empilhadas_5_mun['Edição'] = dados_barras_empilhadas_5_mun['Edição'].replace(mapeamento_edicoes)
-
-# Criando um dict para passar as cores para os padrões
-intervalos_5_ano = ['% Muito Crítico', '% Crítico', '% Intermediário', '% Adequado',]
-cores = ['#FF0000', '#FFC000', '#C6E0B4', '#548235']
-mapeamento_cores = dict(zip(intervalos_5_ano, cores))
-
-# Criação da figura
-fig_barras_empilhadas_5_mun = go.Figure()
-
-# Número máximo de edições que você deseja exibir sem aplicar auto scale
-numero_maximo_edicoes = 15
-
-# Verificando quantas edições serão exibidas no gráfico
-num_edicoes_exibidas = len(dados_barras_empilhadas_5_mun['Edição'])
-
-# Definindo a altura mínima e máxima do gráfico
-altura_minima = 240
-altura_maxima = 675
-
-# Calculando a altura ideal do gráfico com base no número de edições exibidas
-altura_ideal = altura_minima + (altura_maxima - altura_minima) * (num_edicoes_exibidas / numero_maximo_edicoes)
-
-# Limitando a altura do gráfico entre a altura mínima e máxima
-altura_final = max(altura_minima, min(altura_ideal, altura_maxima))
-
-# Usando um loop for para iterar e gerar cada barra
-for intervalo in intervalos_5_ano:
-        fig_barras_empilhadas_5_mun.add_trace(go.Bar(
-        y=dados_barras_empilhadas_5_mun['Edição'],
-        x=dados_barras_empilhadas_5_mun[intervalo],
-        name=intervalo,
-        orientation='h',
-        text = dados_barras_empilhadas_5_mun[intervalo].apply(lambda x: f'{x:.1f}'.replace('.', ',')),  # Formatação BR
-        textposition='inside',
-        textfont=dict(size=12),  # Tamanho da fonte do texto
-        insidetextanchor='middle',  # Centralizar o texto dentro da barra
-        width=0.7,
-        marker=dict(color=mapeamento_cores[intervalo])
-    ))
-
-# Agrupando as barras via layout, barmode = 'stack' (barra empilhada)
-fig_barras_empilhadas_5_mun.update_layout(
-    barmode='stack',
-    title=f'DISTRIBUIÇÃO POR PADRÃO DE DESEMPENHO - 5º ANO - REDE {(rede).upper()} - {(municipio).upper()} - {(componente).upper()}',
-    xaxis_title='', # Percentual
-    yaxis_title='', # Edição
-    showlegend=True,
-    xaxis=dict(range=[0, 100],  showticklabels = False),
-    height=altura_final,
-    bargap=0.1 # ajuste de espaçamento das barras 
-    #margin=dict(l=300)  # Ajuste a margem esquerda conforme necessário
-)
-#fig_barras_empilhadas_5_mun.update_layout(width=1400)
-
-
-## ------------------------ 9º ANO ------------------------- ##
-
-### Gráfico de LINHAS para proficiência média longitudinal
-
-# Formatando manualmente os valores do eixo y
-#proficiencia_edicao_9_mun['Proficiência Média Formatada'] = proficiencia_edicao_9_mun['Proficiência Média'].apply(lambda x: locale.format('%.1f', x))
-proficiencia_edicao_9_mun['Proficiência Média Formatada'] = proficiencia_edicao_9_mun['Proficiência Média'].apply(lambda x: f'{x:.1f}'.replace('.',','))
-
-fig_proficiencia_edicao_9_mun = px.line(proficiencia_edicao_9_mun,
-                            x = 'Edição',
-                            y = 'Proficiência Média',
-                            markers=True,
-                            #range_y = (180, 400),
-                            text='Proficiência Média Formatada',
-                            #color = 'Edição',
-                            #line_dash = 'Edição',
-                            title = f'PROFICIÊNCIA MÉDIA - 9º ANO - REDE {(rede).upper()} - {(municipio).upper()} - {(componente).upper()}'
-                            )
-
-#fig_proficiencia_edicao_9_mun.update_layout(yaxis_title = 'Proficiência Média')
-fig_proficiencia_edicao_9_mun.update_layout(xaxis=dict(type='category', categoryorder='category ascending', title_text=''))  # Definir o tipo de eixo como categoria
-#fig_proficiencia_edicao_9_mun.update_xaxes(showgrid=False, showline=True, linecolor='lightgray')
-#fig_proficiencia_edicao_9_mun.update_yaxes(showgrid=True, showline=True, linecolor='lightgray')
-fig_proficiencia_edicao_9_mun.update_traces(textposition='bottom center', line=dict(color='#548235'))  # Ajustar a posição dos rótulos de dados
-
-
-### Gráfico de LINHAS para participação
-
-# Formatando manualmente os valores do eixo y
-# dados_linhas_participação_9_mun['Participação Formatada'] = dados_linhas_participação_9_mun['Participação (%)'].apply(lambda x: locale.format('%.1f', x))
-dados_linhas_participação_9_mun['Participação Formatada'] = dados_linhas_participação_9_mun['Participação (%)'].apply(lambda x: f'{x:.1f}'.replace('.',','))
-
-fig_participacao_edicao_9_mun = px.line(dados_linhas_participação_9_mun,
-                            x = 'Edição',
-                            y = 'Participação (%)',
-                            markers=True,
-                            #range_y = (30, 110),
-                            text='Participação Formatada',
-                            #color = 'Edição',
-                            #line_dash = 'Edição',
-                            title = f'PARTICIPAÇÃO - 9º ANO - REDE {(rede).upper()} - {(municipio).upper()}'
-                            )
-
-fig_participacao_edicao_9_mun.update_layout(xaxis=dict(type='category', categoryorder='category ascending', title_text=''))  # Definir o tipo de eixo como categoria
-# fig_participacao_edicao_9_mun.update_xaxes(showgrid=False, showline=True, linecolor='lightgray')
-# fig_participacao_edicao_9_mun.update_yaxes(showgrid=True, showline=True, linecolor='lightgray')
-fig_participacao_edicao_9_mun.update_traces(textposition='bottom center', line=dict(color='#548235'))  # Ajustar a posição dos rótulos de dados
-
-### Gráfico de BARRAS para padrões de desempenho longitudinal
-
-if componente == 'Língua Portuguesa': # >>>>>> LÍNGUA PORTUGUESA
-
-    # Definir os intervalos de cores e as respectivas cores
-    intervalos_9_ano_lp = [0, 200, 250, 300, 500]
-    cores = ['#FF0000', '#FFC000', '#C6E0B4', '#548235']
-
-    # Adicionar uma coluna "Intervalo" ao DataFrame com base nos intervalos
-    proficiencia_edicao_9_mun['Intervalo'] = pd.cut(proficiencia_edicao_9_mun['Proficiência Média'], bins=intervalos_9_ano_lp, labels=False)
-
-    padrao_map = {
-        0: '% Muito Crítico',
-        1: '% Crítico',
-        2: '% Intermediário',
-        3: '% Adequado'
-    }
-
-    # Formatando manualmente os valores do eixo y
-    # proficiencia_edicao_9_mun['Proficiência Média Formatada'] = proficiencia_edicao_9_mun['Proficiência Média'].apply(lambda x: locale.format('%.1f', x))
-    proficiencia_edicao_9_mun['Proficiência Média Formatada'] = proficiencia_edicao_9_mun['Proficiência Média'].apply(lambda x: f'{x:.1f}'.replace('.',','))
-    
-    fig_proficiencia_edicao_9_mun_bar = go.Figure()
-
-    # Número máximo e mínimo de edições que você deseja exibir com a largura adaptável
-    numero_maximo_edicoes = 15  # Variar esse valor sempre que for atualizar o script
-    numero_minimo_edicoes = 1
-
-    # Calculando o número de edições exibidas no gráfico
-    num_edicoes_exibidas = len(proficiencia_edicao_9_mun['Edição'].unique())
-
-    # Calculando a largura das barras com base no número de edições
-    # Utilizando uma regra de três para ajustar o valor do width
-    width_maximo = 0.8
-    width_minimo = 0.1
-    width_adaptavel = width_minimo + (width_maximo - width_minimo) * ((num_edicoes_exibidas - numero_minimo_edicoes) / (numero_maximo_edicoes - numero_minimo_edicoes))
-
-    for i, intervalo in enumerate(intervalos_9_ano_lp[:-1]):
-        data = proficiencia_edicao_9_mun[proficiencia_edicao_9_mun['Intervalo'] == i]
-        fig_proficiencia_edicao_9_mun_bar.add_trace(go.Bar(
-            x=data['Edição'],
-            y=data['Proficiência Média'],
-            marker=dict(color=cores[i]),
-            name=padrao_map[i],
-            text=data['Proficiência Média Formatada'],
-            textposition='outside',
-            width = width_adaptavel
-        ))
-
-    fig_proficiencia_edicao_9_mun_bar.update_layout(
-        xaxis=dict(type='category', categoryorder='category ascending'),
-        yaxis=dict(range=[150, 365]),
-        showlegend=True,
-        title=f'PADRÃO DE DESEMPENHO - 9º ANO - REDE {(rede).upper()} - {(municipio).upper()} - {(componente).upper()}'
-    )
-
-    # fig_proficiencia_edicao_9_mun_bar.update_traces(marker=dict(line=dict(color='rgb(8,8,8)',width=1.5)))
-    # fig_proficiencia_edicao_9_mun_bar.show()
-
-else: # >>>>>> MATEMÁTICA
-
-    # Definir os intervalos de cores e as respectivas cores
-    intervalos_9_ano_mt = [0, 225, 275, 325, 500]
-    cores = ['#FF0000', '#FFC000', '#C6E0B4', '#548235']
-
-    # Adicionar uma coluna "Intervalo" ao DataFrame com base nos intervalos
-    proficiencia_edicao_9_mun['Intervalo'] = pd.cut(proficiencia_edicao_9_mun['Proficiência Média'], bins=intervalos_9_ano_mt, labels=False)
-
-    padrao_map = {
-        0: '% Muito Crítico',
-        1: '% Crítico',
-        2: '% Intermediário',
-        3: '% Adequado'
-    }
-
-    # Formatando manualmente os valores do eixo y
-    # proficiencia_edicao_9_mun['Proficiência Média Formatada'] = proficiencia_edicao_9_mun['Proficiência Média'].apply(lambda x: locale.format('%.1f', x))
-    proficiencia_edicao_9_mun['Proficiência Média Formatada'] = proficiencia_edicao_9_mun['Proficiência Média'].apply(lambda x: f'{x:.1f}'.replace('.',','))
-
-    fig_proficiencia_edicao_9_mun_bar = go.Figure()
-
-    # Número máximo e mínimo de edições que você deseja exibir com a largura adaptável
-    numero_maximo_edicoes = 15  # Variar esse valor sempre que for atualizar o script
-    numero_minimo_edicoes = 1
-
-    # Calculando o número de edições exibidas no gráfico
-    num_edicoes_exibidas = len(proficiencia_edicao_9_mun['Edição'].unique())
-
-    # Calculando a largura das barras com base no número de edições
-    # Utilizando uma regra de três para ajustar o valor do width
-    width_maximo = 0.8
-    width_minimo = 0.1
-    width_adaptavel = width_minimo + (width_maximo - width_minimo) * ((num_edicoes_exibidas - numero_minimo_edicoes) / (numero_maximo_edicoes - numero_minimo_edicoes))
-
-    for i, intervalo in enumerate(intervalos_9_ano_mt[:-1]):
-        data = proficiencia_edicao_9_mun[proficiencia_edicao_9_mun['Intervalo'] == i]
-        fig_proficiencia_edicao_9_mun_bar.add_trace(go.Bar(
-            x=data['Edição'],
-            y=data['Proficiência Média'],
-            marker=dict(color=cores[i]),
-            name=padrao_map[i],
-            text=data['Proficiência Média Formatada'],
-            textposition='outside',
-            width = width_adaptavel
-        ))
-
-    fig_proficiencia_edicao_9_mun_bar.update_layout(
-        xaxis=dict(type='category', categoryorder='category ascending'),
-        yaxis=dict(range=[160, 410]),
-        showlegend=True,
-        title=f'PADRÃO DE DESEMPENHO - 9º ANO - REDE {(rede).upper()} - {(municipio).upper()} - {(componente).upper()}'
-    )
-
-    # fig_proficiencia_edicao_9_mun_bar.update_traces(marker=dict(line=dict(color='rgb(8,8,8)',width=1.5)))
-    # fig_proficiencia_edicao_9_mun_bar.show()
-
-### Gráfico de BARRAS EMPILHADAS para padrões de desempenho percentual
-
-# Alterando as edições localmente para que o eixo y compreenda
-mapeamento_edicoes = {
-    '2019': '(2019)',
-    '2018': '(2018)',
-    '2017': '(2017)',
-    '2016': '(2016)',
-    '2015': '(2015)',
-    '2014': '(2014)',
-    '2013': '(2013)',
-    '2012': '(2012)',
-    '2011': '(2011)',
-    '2010': '(2010)',
-    '2009': '(2009)',
-    '2008': '(2008)',
-    '2007': '(2007)'
-}
-
-dados_barras_empilhadas_9_mun['Edição'] = dados_barras_empilhadas_9_mun['Edição'].replace(mapeamento_edicoes)
-
-# Criando um dict para passar as cores para os padrões
-intervalos_9_ano = ['% Muito Crítico', '% Crítico', '% Intermediário', '% Adequado',]
-cores = ['#FF0000', '#FFC000', '#C6E0B4', '#548235']
-mapeamento_cores = dict(zip(intervalos_9_ano, cores))
-
-# Criação da figura
-fig_barras_empilhadas_9_mun = go.Figure()
-
-# Número máximo de edições que você deseja exibir sem aplicar auto scale
-numero_maximo_edicoes = 15
-
-# Verificando quantas edições serão exibidas no gráfico
-num_edicoes_exibidas = len(dados_barras_empilhadas_9_mun['Edição'])
-
-# Definindo a altura mínima e máxima do gráfico
-altura_minima = 240
-altura_maxima = 675
-
-# Calculando a altura ideal do gráfico com base no número de edições exibidas
-altura_ideal = altura_minima + (altura_maxima - altura_minima) * (num_edicoes_exibidas / numero_maximo_edicoes)
-
-# Limitando a altura do gráfico entre a altura mínima e máxima
-altura_final = max(altura_minima, min(altura_ideal, altura_maxima))
-
-# Usando um loop for para iterar e gerar cada barra
-for intervalo in intervalos_9_ano:
-        fig_barras_empilhadas_9_mun.add_trace(go.Bar(
-        y=dados_barras_empilhadas_9_mun['Edição'],
-        x=dados_barras_empilhadas_9_mun[intervalo],
-        name=intervalo,
-        orientation='h',
-        text = dados_barras_empilhadas_9_mun[intervalo].apply(lambda x: f'{x:.1f}'.replace('.', ',')),  # Formatação BR
-        textposition='inside',
-        textfont=dict(size=12),  # Tamanho da fonte do texto
-        insidetextanchor='middle',  # Centralizar o texto dentro da barra
-        width=0.7,
-        marker=dict(color=mapeamento_cores[intervalo])
-    ))
-
-# Agrupando as barras via layout, barmode = 'stack' (barra empilhada)
-fig_barras_empilhadas_9_mun.update_layout(
-    barmode='stack',
-    title=f'DISTRIBUIÇÃO POR PADRÃO DE DESEMPENHO - 9º ANO - REDE {(rede).upper()} - {(municipio).upper()} - {(componente).upper()}', 
-    xaxis_title='', # Percentual
-    yaxis_title='', # Edição
-    showlegend=True,
-    xaxis=dict(range=[0, 100],  showticklabels = False),
-    height=altura_final,
-    bargap=0.1 # ajuste de espaçamento das barras 
-    #margin=dict(l=300)  # Ajuste a margem esquerda conforme necessário
-)
-#fig_barras_empilhadas_9_mun.update_layout(width=1400)
-
-## ------------------------ 3ª SERIE  ------------------------- ##
-
-if rede == 'Municipal':
-    pass
-else:
-
-    ### Gráfico de LINHAS para proficiência média longitudinal
-
-    # Formatando manualmente os valores do eixo y
-    #proficiencia_edicao_3_mun['Proficiência Média Formatada'] = proficiencia_edicao_3_mun['Proficiência Média'].apply(lambda x: locale.format('%.1f', x))
-    proficiencia_edicao_3_mun['Proficiência Média Formatada'] = proficiencia_edicao_3_mun['Proficiência Média'].apply(lambda x: f'{x:.1f}'.replace('.',','))
-
-    fig_proficiencia_edicao_3_mun = px.line(proficiencia_edicao_3_mun,
-                                x = 'Edição',
-                                y = 'Proficiência Média',
-                                markers=True,
-                                #range_y = (100, 350),
-                                text='Proficiência Média Formatada',
-                                #color = 'Edição',
-                                #line_dash = 'Edição',
-                                title = f'PROFICIÊNCIA MÉDIA - 3ª SÉRIE - REDE {(rede).upper()} - {(municipio).upper()} - {(componente).upper()}'
-                                )
-
-    #fig_proficiencia_edicao_3_mun.update_layout(yaxis_title = 'Proficiência Média')
-    fig_proficiencia_edicao_3_mun.update_layout(xaxis=dict(type='category', categoryorder='category ascending', title_text=''))  # Definir o tipo de eixo como categoria
-    #fig_proficiencia_edicao_3_mun.update_xaxes(showgrid=False, showline=True, linecolor='lightgray')
-    #fig_proficiencia_edicao_3_mun.update_yaxes(showgrid=True, showline=True, linecolor='lightgray')
-    fig_proficiencia_edicao_3_mun.update_traces(textposition='bottom center', line=dict(color='#548235'))  # Ajustar a posição dos rótulos de dados
-
-    ### Gráfico de LINHAS para participação
-
-    # Formatando manualmente os valores do eixo y
-    # dados_linhas_participação_3_mun['Participação Formatada'] = dados_linhas_participação_3_mun['Participação (%)'].apply(lambda x: locale.format('%.1f', x))
-    dados_linhas_participação_3_mun['Participação Formatada'] = dados_linhas_participação_3_mun['Participação (%)'].apply(lambda x: f'{x:.1f}'.replace('.',','))
-
-    fig_participacao_edicao_3_mun = px.line(dados_linhas_participação_3_mun,
-                                x = 'Edição',
-                                y = 'Participação (%)',
-                                markers=True,
-                                #range_y = (30, 130),
-                                text='Participação Formatada',
-                                #color = 'Edição',
-                                #line_dash = 'Edição',
-                                title = f'PARTICIPAÇÃO - 3ª SÉRIE - REDE {(rede).upper()} '
-                                )
-
-    fig_participacao_edicao_3_mun.update_layout(xaxis=dict(type='category', categoryorder='category ascending', title_text=''))  # Definir o tipo de eixo como categoria
-    # fig_participacao_edicao_3_mun.update_xaxes(showgrid=False, showline=True, linecolor='lightgray')
-    # fig_participacao_edicao_3_mun.update_yaxes(showgrid=True, showline=True, linecolor='lightgray')
-    fig_participacao_edicao_3_mun.update_traces(textposition='bottom center', line=dict(color='#548235'))  # Ajustar a posição dos rótulos de dados
-
-
-    ### Gráfico de BARRAS para padrões de desempenho longitudinal
-
-    if componente == 'Língua Portuguesa': # >>>>>> LÍNGUA PORTUGUESA
-
-        # Definir os intervalos de cores e as respectivas cores
-        intervalos_3_ano_lp = [0, 225, 275, 325, 500]
-        cores = ['#FF0000', '#FFC000', '#C6E0B4', '#548235']
-
-        # Adicionar uma coluna "Intervalo" ao DataFrame com base nos intervalos
-        proficiencia_edicao_3_mun['Intervalo'] = pd.cut(proficiencia_edicao_3_mun['Proficiência Média'], bins=intervalos_3_ano_lp, labels=False)
-
-        padrao_map = {
-            0: '% Muito Crítico',
-            1: '% Crítico',
-            2: '% Intermediário',
-            3: '% Adequado'
-        }
-
-        # Formatando manualmente os valores do eixo y
-        # proficiencia_edicao_3_mun['Proficiência Média Formatada'] = proficiencia_edicao_3_mun['Proficiência Média'].apply(lambda x: locale.format('%.1f', x))
-        proficiencia_edicao_3_mun['Proficiência Média Formatada'] = proficiencia_edicao_3_mun['Proficiência Média'].apply(lambda x: f'{x:.1f}'.replace('.',','))
-
-        fig_proficiencia_edicao_3_mun_bar = go.Figure()
-
-        # Número máximo e mínimo de edições que você deseja exibir com a largura adaptável
-        numero_maximo_edicoes = 15  # Variar esse valor sempre que for atualizar o script
-        numero_minimo_edicoes = 1
-
-        # Calculando o número de edições exibidas no gráfico
-        num_edicoes_exibidas = len(proficiencia_edicao_3_mun['Edição'].unique())
-
-        # Calculando a largura das barras com base no número de edições
-        # Utilizando uma regra de três para ajustar o valor do width
-        width_maximo = 0.8
-        width_minimo = 0.1
-        width_adaptavel = width_minimo + (width_maximo - width_minimo) * ((num_edicoes_exibidas - numero_minimo_edicoes) / (numero_maximo_edicoes - numero_minimo_edicoes))
-
-        for i, intervalo in enumerate(intervalos_3_ano_lp[:-1]):
-            data = proficiencia_edicao_3_mun[proficiencia_edicao_3_mun['Intervalo'] == i]
-            fig_proficiencia_edicao_3_mun_bar.add_trace(go.Bar(
-                x=data['Edição'],
-                y=data['Proficiência Média'],
-                marker=dict(color=cores[i]),
-                name=padrao_map[i],
-                text=data['Proficiência Média Formatada'],
-                textposition='outside',
-                width = width_adaptavel
-            ))
-
-        fig_proficiencia_edicao_3_mun_bar.update_layout(
-            xaxis=dict(type='category', categoryorder='category ascending'),
-            yaxis=dict(range=[200, 330]),
-            showlegend=True,
-            title=f'PADRÃO DE DESEMPENHO - 3ª SÉRIE - REDE {(rede).upper()} - {(municipio).upper()} - {(componente).upper()}'
-        )
-
-        # fig_proficiencia_edicao_3_mun_bar.update_traces(marker=dict(line=dict(color='rgb(8,8,8)',width=1.5)))
-        # fig_proficiencia_edicao_3_mun_bar.show()
-
-    else: # >>>>>> MATEMÁTICA
-
-        # Definir os intervalos de cores e as respectivas cores
-        intervalos_3_ano_mt = [0, 250, 300, 350, 500]
-        cores = ['#FF0000', '#FFC000', '#C6E0B4', '#548235']
-
-        # Adicionar uma coluna "Intervalo" ao DataFrame com base nos intervalos
-        proficiencia_edicao_3_mun['Intervalo'] = pd.cut(proficiencia_edicao_3_mun['Proficiência Média'], bins=intervalos_3_ano_mt, labels=False)
-
-        padrao_map = {
-            0: '% Muito Crítico',
-            1: '% Crítico',
-            2: '% Intermediário',
-            3: '% Adequado'
-        }
-
-        # Formatando manualmente os valores do eixo y
-        # proficiencia_edicao_3_mun['Proficiência Média Formatada'] = proficiencia_edicao_3_mun['Proficiência Média'].apply(lambda x: locale.format('%.1f', x))
-        proficiencia_edicao_3_mun['Proficiência Média Formatada'] = proficiencia_edicao_3_mun['Proficiência Média'].apply(lambda x: f'{x:.1f}'.replace('.',','))
-        
-        fig_proficiencia_edicao_3_mun_bar = go.Figure()
-
-        # Número máximo e mínimo de edições que você deseja exibir com a largura adaptável
-        numero_maximo_edicoes = 15  # Variar esse valor sempre que for atualizar o script
-        numero_minimo_edicoes = 1
-
-        # Calculando o número de edições exibidas no gráfico
-        num_edicoes_exibidas = len(proficiencia_edicao_3_mun['Edição'].unique())
-
-        # Calculando a largura das barras com base no número de edições
-        # Utilizando uma regra de três para ajustar o valor do width
-        width_maximo = 0.8
-        width_minimo = 0.1
-        width_adaptavel = width_minimo + (width_maximo - width_minimo) * ((num_edicoes_exibidas - numero_minimo_edicoes) / (numero_maximo_edicoes - numero_minimo_edicoes))
-
-        for i, intervalo in enumerate(intervalos_3_ano_mt[:-1]):
-            data = proficiencia_edicao_3_mun[proficiencia_edicao_3_mun['Intervalo'] == i]
-            fig_proficiencia_edicao_3_mun_bar.add_trace(go.Bar(
-                x=data['Edição'],
-                y=data['Proficiência Média'],
-                marker=dict(color=cores[i]),
-                name=padrao_map[i],
-                text=data['Proficiência Média Formatada'],
-                textposition='outside',
-                width = width_adaptavel
-            ))
-
-        fig_proficiencia_edicao_3_mun_bar.update_layout(
-            xaxis=dict(type='category', categoryorder='category ascending'),
-            yaxis=dict(range=[210, 410]),
-            showlegend=True,
-            title=f'PADRÃO DE DESEMPENHO - 3ª SÉRIE - REDE {(rede).upper()} - {(municipio).upper()} - {(componente).upper()}'
-        )
-
-        # fig_proficiencia_edicao_3_mun_bar.update_traces(marker=dict(line=dict(color='rgb(8,8,8)',width=1.5)))
-        # fig_proficiencia_edicao_3_mun_bar.show()
-
-
-### Gráfico de BARRAS EMPILHADAS para padrões de desempenho percentual
-
-    # Alterando as edições localmente para que o eixo y compreenda
-    mapeamento_edicoes = {
-        '2019': '(2019)',
-        '2018': '(2018)',
-        '2017': '(2017)',
-        '2016': '(2016)',
-        '2015': '(2015)',
-        '2014': '(2014)',
-        '2013': '(2013)',
-        '2012': '(2012)',
-        '2011': '(2011)',
-        '2010': '(2010)',
-        '2009': '(2009)',
-        '2008': '(2008)',
-        '2007': '(2007)'
-    }
-
-    dados_barras_empilhadas_3_mun['Edição'] = dados_barras_empilhadas_3_mun['Edição'].replace(mapeamento_edicoes)
-
-    # Criando um dict para passar as cores para os padrões
-    intervalos_3_ano = ['% Muito Crítico', '% Crítico', '% Intermediário', '% Adequado',]
-    cores = ['#FF0000', '#FFC000', '#C6E0B4', '#548235']
-    mapeamento_cores = dict(zip(intervalos_3_ano, cores))
-
-    # Criação da figura
-    fig_barras_empilhadas_3_mun = go.Figure()
-
-    # Número máximo de edições que você deseja exibir sem aplicar auto scale
-    numero_maximo_edicoes = 15
-
-    # Verificando quantas edições serão exibidas no gráfico
-    num_edicoes_exibidas = len(dados_barras_empilhadas_3_mun['Edição'])
-
-    # Definindo a altura mínima e máxima do gráfico
-    altura_minima = 240
-    altura_maxima = 675
-
-    # Calculando a altura ideal do gráfico com base no número de edições exibidas
-    altura_ideal = altura_minima + (altura_maxima - altura_minima) * (num_edicoes_exibidas / numero_maximo_edicoes)
-
-    # Limitando a altura do gráfico entre a altura mínima e máxima
-    altura_final = max(altura_minima, min(altura_ideal, altura_maxima))
-
-    # Usando um loop for para iterar e gerar cada barra
-    for intervalo in intervalos_3_ano:
-            fig_barras_empilhadas_3_mun.add_trace(go.Bar(
-            y=dados_barras_empilhadas_3_mun['Edição'],
-            x=dados_barras_empilhadas_3_mun[intervalo],
-            name=intervalo,
-            orientation='h',
-            text = dados_barras_empilhadas_3_mun[intervalo].apply(lambda x: f'{x:.1f}'.replace('.', ',')),  # Formatação BR
-            textposition='inside',
-            textfont=dict(size=12),  # Tamanho da fonte do texto
-            insidetextanchor='middle',  # Centralizar o texto dentro da barra
-            width=0.7,
-            marker=dict(color=mapeamento_cores[intervalo])
-        ))
-
-    # Agrupando as barras via layout, barmode = 'stack' (barra empilhada)
-    fig_barras_empilhadas_3_mun.update_layout(
-        barmode='stack',
-        title=f'DISTRIBUIÇÃO POR PADRÃO DE DESEMPENHO - 3ª SÉRIE - REDE {(rede).upper()} - {(municipio).upper()} - {(componente).upper()}',
-        xaxis_title='', # Percentual
-        yaxis_title='', # Edição
-        showlegend=True,
-        xaxis=dict(range=[0, 100],  showticklabels = False),
-        height=altura_final,
-        bargap=0.1 # ajuste de espaçamento das barras 
-        #margin=dict(l=300)  # Ajuste a margem esquerda conforme necessário
-    )
-    #fig_barras_empilhadas_3_mun.update_layout(width=1400)
-
+# (consulta direta ao índice pré-computado das chaves categóricas, sem varrer as colunas a cada rerun)
+with trecho('carga do índice e do cubo'):
+    indice_mun = obtem_indice(ARQUIVO_MUN, COLUNAS_MUN)
+    cubo_mun = obtem_cubo(ARQUIVO_MUN, COLUNAS_MUN)  # Agregados por edição pré-computados (uma vez por versão dos dados)
+filtros = {'Rede': rede, 'Município': municipio, 'Componente': componente, 'Edição': edicao}
+
+## ------------------------ TABELAS E GRÁFICOS ------------------------ ##
+
+# Filtros normalizados + versão dos dados das edições selecionadas: chave das etapas já calculadas nesta sessão e do cache de figuras
+chave_filtros = (normaliza_filtros({**filtros, 'Proficiência Média': proficiencia}), obtem_versao(ARQUIVO_MUN, edicao))
+
+## Funcao que devolve as tabelas e figuras das etapas pedidas, calculando (em uma única passada) só as que faltam
+def prepara_etapas(especs):
+    calculadas = cache_da_sessao(st.session_state, 'etapas_mun', chave_filtros)
+    faltantes = [espec for espec in especs if espec['etapa'] not in calculadas]
+    if faltantes:
+        tabelas = calcula_etapas(indice_mun, cubo_mun, filtros, proficiencia, faltantes)
+        for espec in faltantes:
+            # Figuras vazias quando a etapa não é avaliada para a rede / componente selecionadas
+            if etapa_avaliada(espec, rede, componente):
+                # Figuras compartilhadas entre sessões (LRU): só são construídas na primeira vez para estes filtros
+                with trecho(f'figuras: {espec["rotulo"]}'):
+                    figuras = obtem_figuras(('mun', espec['etapa']) + chave_filtros,
+                                            lambda: graficos_etapa(espec, tabelas[espec['etapa']], componente, titulos_etapa(espec, rede, componente, municipio), 'municipio'))
+            else:
+                figuras = graficos_vazios()
+            calculadas[espec['etapa']] = {'tabelas': tabelas[espec['etapa']], 'figuras': figuras}
+    return [calculadas[espec['etapa']] for espec in especs]
+
+
+## Funcao que exibe a comparação de uma etapa: as séries de todos os municípios comparados saem de uma única seleção
+# no cubo e cada medida é uma única figura (um traço por município), compartilhada entre sessões
+def exibe_comparacao(espec):
+    if not comparar:
+        return
+    st.markdown(f'**Comparação - {local_comparacao}** :bar_chart:')
+    if not municipios_comparados:
+        st.info('Selecione no sidebar os municípios comparados.', icon="ℹ️")
+    elif etapa_avaliada(espec, rede, componente):
+        with trecho(f'comparação: {espec["rotulo"]}'):
+            figuras = obtem_figuras(('mun_comparacao', espec['etapa'], tuple(municipios_comparados)) + chave_filtros,
+                                    lambda: graficos_comparacao(calcula_comparacao(cubo_mun, filtros, municipios_comparados, espec, proficiencia),
+                                                                titulos_etapa(espec, rede, componente, local_comparacao)))
+        coluna1, coluna2 = st.columns(2)
+        coluna1.plotly_chart(figuras['participacao'], use_container_width=True)
+        coluna2.plotly_chart(figuras['proficiencia'], use_container_width=True)
+    st.markdown('---')
 
 
 ## ------------------------ VISUALIZAÇÕES NO STREAMLIT ------------------------ ##
 
-aba1, aba2, aba3, aba4 = st.tabs(['2º Ano do Ensino Fundamental', '5º Ano do Ensino Fundamental', '9º Ano do Ensino Fundamental', '3ª Série do Ensino Médio'])
+## Funcao que exibe métricas, gráficos, tabela e downloads de uma etapa
+def exibe_etapa(espec, etapa):
+    dados_etapa = etapa['tabelas']['dados']
+    figuras_etapa = etapa['figuras']
 
-with aba1: # >>>>> 2º Ano do Ensino Fundamental
     coluna1, coluna2 = st.columns(2)
-    if dados_mun_2_ano['Proficiência Média'].empty:
-            st.error(f'Dados não encontrados para o município de {municipio}. Verifique as opções nos filtros ou recarregue a página (F5 no teclado).', icon="🚨")
-            st.error('**Matemática** não é uma componente avaliada para o **2º Ano do Ensino Fundamental**.', icon = "⚠️")
-    else:
+    if dados_etapa['Proficiência Média'].empty:
+        st.error(f'Dados não encontrados para o município de {municipio}. Verifique as opções nos filtros ou recarregue a página (F5 no teclado).', icon="🚨")
+        if espec['aviso']:
+            st.error(espec['aviso'], icon = "⚠️")
+        return
+
+    with trecho('métricas e envio dos gráficos'):
+        metricas = metricas_etapa(dados_etapa)
         with coluna1:
-                st.metric('População prevista', formata_numero(dados_mun_2_ano['Nº de Alunos Previstos'].sum()), help='População prevista somada de acordo com os filtros selecionados')
-                st.metric('População avaliada', formata_numero(dados_mun_2_ano['Nº de Alunos Avaliados'].sum()), help='População avaliada somada de acordo com os filtros selecionados')
-                st.plotly_chart(fig_participacao_edicao_2_mun, use_container_width=True) # GRAFICO LINHAS PARTICIPACAO LONGITUDINAL
+            st.metric('População prevista', formata_numero(metricas['previstos']), help='População prevista somada de acordo com os filtros selecionados')
+            st.metric('População avaliada', formata_numero(metricas['avaliados']), help='População avaliada somada de acordo com os filtros selecionados')
+            st.plotly_chart(figuras_etapa['participacao'], use_container_width=True) # GRAFICO LINHAS PARTICIPACAO LONGITUDINAL
 
         with coluna2:
-            if componente != 'Matemática':  # Condicional para exibir somente Língua Portuguesa
-                num_alunos_previstos = dados_mun_2_ano['Nº de Alunos Previstos'].sum()
-                num_alunos_avaliados = dados_mun_2_ano['Nº de Alunos Avaliados'].sum()
-                if num_alunos_previstos > 0:
-                    taxa_participacao_2_mun = (num_alunos_avaliados / num_alunos_previstos) * 100
-                else:
-                    taxa_participacao_2_mun = 0
-                st.metric('Taxa de participação', f'{formata_taxa(taxa_participacao_2_mun)}%', help='Taxa de participação calculada de acordo com os filtros selecionados')
-                st.metric('Proficiência Média', f'{formata_proficiencia(dados_mun_2_ano["Proficiência Média"].mean())}', help='Proficiência Média de acordo com os filtros selecionados')    
-                st.plotly_chart(fig_proficiencia_edicao_2_mun, use_container_width=True) # GRAFICO LINHAS PROFICIENCIA LOGITUDINAL
-        st.plotly_chart(fig_proficiencia_edicao_2_mun_bar, use_container_width=True) # GRAFICO BARRAS PADRAO DE DESEMPENHO
-        st.plotly_chart(fig_barras_empilhadas_2_mun, use_container_width=True) # GRAFICO BARRAS EMPILHADAS DISTRIBUICAO DOS PADROES DE DESEMPENHO
-
+            st.metric('Taxa de participação', f'{formata_taxa(metricas["participacao"])}%', help='Taxa de participação calculada de acordo com os filtros selecionados')
+            st.metric('Proficiência Média', f'{formata_proficiencia(metricas["proficiencia"])}', help='Proficiência Média de acordo com os filtros selecionados')
+            st.plotly_chart(figuras_etapa['proficiencia'], use_container_width=True) # GRAFICO LINHAS PROFICIENCIA LOGITUDINAL
+        st.plotly_chart(figuras_etapa['padrao'], use_container_width=True) # GRAFICO BARRAS PADRAO DE DESEMPENHO
+        st.plotly_chart(figuras_etapa['distribuicao'], use_container_width=True) # GRAFICO BARRAS EMPILHADAS DISTRIBUICAO DOS PADROES DE DESEMPENHO
 
     ## ------------------------ VISUALIZAÇÃO DA TABELA ------------------------ ##
 
-        st.markdown('---')
-        # Adicionando a tabela para visualização e download
-        with st.expander('Colunas da Tabela'):
-            colunas = st.multiselect('Selecione as colunas', list(dados_mun_2_ano.columns), list(dados_mun_2_ano.columns), key='multiselect_expander_2_mun')
+    st.markdown('---')
+    # Adicionando a tabela para visualização e download
+    with st.expander('Colunas da Tabela'):
+        colunas = st.multiselect('Selecione as colunas', list(dados_etapa.columns), list(dados_etapa.columns), key=f'multiselect_expander_{espec["chave"]}_mun')
 
-            # Acionando os filtros (inside the expander)
-            dados_mun_2_ano_filtered = dados_mun_2_ano[colunas]  # Filter the DataFrame based on the selected columns
+        # Acionando os filtros (inside the expander)
+        dados_etapa_filtered = dados_etapa[colunas]  # Filter the DataFrame based on the selected columns
 
-        # Inserindo um texto sobre as colunas e linhas exibidas
-        st.dataframe(dados_mun_2_ano_filtered, hide_index = True)
-        st.markdown(f'A tabela possui :blue[{dados_mun_2_ano_filtered.shape[0]}] linhas e :blue[{dados_mun_2_ano_filtered.shape[1]}] colunas.')
+    # Tabela paginada (busca, ordenação e contagem no servidor)
+    exibe_tabela(dados_etapa, colunas, f'{espec["chave"]}_mun', chave_filtros)
 
     ## ------------------------ DOWNLOAD DAS TABELAS ------------------------ ##
-        st.markdown('---')
-        st.markdown('**Download da tabela** :envelope_with_arrow:')
-        st.download_button('Formato em CSV :page_facing_up:', data = converte_csv(dados_mun_2_ano_filtered), file_name = f'tabela_2º_ano_{municipio}.csv', mime = 'text/csv') # on_click = mensagem_sucesso)  
-        st.download_button('Formato em XSLS :page_with_curl:', data = converte_xlsx(dados_mun_2_ano_filtered), file_name = f'tabela_2º_ano_{municipio}.xlsx',
-                                mime='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet') # on_click=mensagem_sucesso
-        st.markdown('---')
-    
-with aba2: # >>>>> 5º Ano do Ensino Fundamental
-    coluna1, coluna2 = st.columns(2)
-    if dados_mun_5_ano['Proficiência Média'].empty:
-            st.error(f'Dados não encontrados para o município de {municipio}. Verifique as opções nos filtros ou recarregue a página (F5 no teclado).', icon="🚨")
-    else:
-        with coluna1:
-            st.metric('População prevista', formata_numero(dados_mun_5_ano['Nº de Alunos Previstos'].sum()), help='População prevista somada de acordo com os filtros selecionados')
-            st.metric('População avaliada', formata_numero(dados_mun_5_ano['Nº de Alunos Avaliados'].sum()), help='População avaliada somada de acordo com os filtros selecionados')
-            st.plotly_chart(fig_participacao_edicao_5_mun, use_container_width=True) # GRAFICO LINHAS PARTICIPACAO LONGITUDINAL
-            
-        with coluna2:
-            num_alunos_previstos = dados_mun_5_ano['Nº de Alunos Previstos'].sum()
-            num_alunos_avaliados = dados_mun_5_ano['Nº de Alunos Avaliados'].sum()
-            if num_alunos_previstos > 0:
-                taxa_participacao_5_mun = (num_alunos_avaliados / num_alunos_previstos) * 100
-            else:
-                taxa_participacao_5_mun = 0
-            st.metric('Taxa de participação', f'{formata_taxa(taxa_participacao_5_mun)}%', help='Taxa de participação calculada de acordo com os filtros selecionados')
-            st.metric('Proficiência Média', f'{formata_proficiencia(dados_mun_5_ano["Proficiência Média"].mean())}', help='Proficiência Média de acordo com os filtros selecionados')
-            st.plotly_chart(fig_proficiencia_edicao_5_mun, use_container_width=True) # GRAFICO LINHAS PROFICIENCIA LOGITUDINAL
-        st.plotly_chart(fig_proficiencia_edicao_5_mun_bar, use_container_width=True) # GRAFICO BARRAS PADRAO DE DESEMPENHO    
-        st.plotly_chart(fig_barras_empilhadas_5_mun, use_container_width=True) # GRAFICO BARRAS EMPILHADAS DISTRIBUICAO DOS PADROES DE DESEMPENHO
-
-        ## ------------------------ VISUALIZAÇÃO DA TABELA ------------------------ ##
-
-        st.markdown('---')
-        # Adicionando a tabela para visualização e download
-        with st.expander('Colunas da Tabela'):
-            colunas = st.multiselect('Selecione as colunas', list(dados_mun_5_ano.columns), list(dados_mun_5_ano.columns), key='multiselect_expander_5_mun')
-
-            # Acionando os filtros (inside the expander)
-            dados_mun_5_ano_filtered = dados_mun_5_ano[colunas]  # Filter the DataFrame based on the selected columns
-
-        # Inserindo um texto sobre as colunas e linhas exibidas
-        st.dataframe(dados_mun_5_ano_filtered, hide_index = True)
-        st.markdown(f'A tabela possui :blue[{dados_mun_5_ano_filtered.shape[0]}] linhas e :blue[{dados_mun_5_ano_filtered.shape[1]}] colunas.')
-
-        ## ------------------------ DOWNLOAD DAS TABELAS ------------------------ ##
-        
-        st.markdown('---')
-        st.markdown('**Download da tabela** :envelope_with_arrow:')
-        st.download_button('Formato em CSV :page_facing_up:', data = converte_csv(dados_mun_5_ano_filtered), file_name = f'tabela_5º_ano_rede_{componente}_{municipio}.csv', mime = 'text/csv') # on_click = mensagem_sucesso)  
-        st.download_button('Formato em XSLS :page_with_curl:', data = converte_xlsx(dados_mun_5_ano_filtered), file_name = f'tabela_5º_ano_rede_{componente}_{municipio}.xlsx',
-                                mime='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet') # on_click=mensagem_sucesso)
-        st.markdown('---')
-           
-with aba3: # >>>>> 9º Ano do Ensino Fundamental
-    coluna1, coluna2 = st.columns(2)
-    if dados_mun_9_ano['Proficiência Média'].empty:
-            st.error(f'Dados não encontrados para o município de {municipio}. Verifique as opções nos filtros ou recarregue a página (F5 no teclado).', icon="🚨")
-    else:
-        with coluna1:
-            st.metric('População prevista', formata_numero(dados_mun_9_ano['Nº de Alunos Previstos'].sum()), help='População prevista somada de acordo com os filtros selecionados')
-            st.metric('População avaliada', formata_numero(dados_mun_9_ano['Nº de Alunos Avaliados'].sum()), help='População alvliada somada de acordo com os filtros selecionados')
-            st.plotly_chart(fig_participacao_edicao_9_mun, use_container_width=True) # GRAFICO LINHAS PARTICIPACAO LONGITUDINAL
-
-        with coluna2:
-            num_alunos_previstos = dados_mun_9_ano['Nº de Alunos Previstos'].sum()
-            num_alunos_avaliados = dados_mun_9_ano['Nº de Alunos Avaliados'].sum()
-            if num_alunos_previstos > 0:
-                taxa_participacao_9_mun = (num_alunos_avaliados / num_alunos_previstos) * 100
-            else:
-                taxa_participacao_9_mun = 0
-            st.metric('Taxa de participação', f'{formata_taxa(taxa_participacao_9_mun)}%', help='Taxa de participação calculada de acordo com os filtros selecionados')
-            st.metric('Proficiência Média', f'{formata_proficiencia(dados_mun_9_ano["Proficiência Média"].mean())}', help='Proficiência Média de acordo com os filtros selecionados')
-            st.plotly_chart(fig_proficiencia_edicao_9_mun, use_container_width=True) # GRAFICO LINHAS PROFICIENCIA LOGITUDINAL
-        st.plotly_chart(fig_proficiencia_edicao_9_mun_bar, use_container_width=True) # GRAFICO BARRAS PADRAO DE DESEMPENHO    
-        st.plotly_chart(fig_barras_empilhadas_9_mun, use_container_width=True) # GRAFICO BARRAS EMPILHADAS DISTRIBUICAO DOS PADROES DE DESEMPENHO
-
-        ## ------------------------ VISUALIZAÇÃO DA TABELA ------------------------ ##
-
-        st.markdown('---')
-        # Adicionando a tabela para visualização e download
-        with st.expander('Colunas da Tabela'):
-            colunas = st.multiselect('Selecione as colunas', list(dados_mun_9_ano.columns), list(dados_mun_9_ano.columns), key='multiselect_expander_9_mun')
 
-        # Acionando os filtros (inside the expander)
-        dados_mun_9_ano_filtered = dados_mun_9_ano[colunas]  # Filter the DataFrame based on the selected columns
+    arquivo = f'{espec["arquivo"]}_{componente}_{municipio}' if espec['mostra_componente'] else f'{espec["arquivo"]}_{municipio}'
+    st.markdown('---')
+    st.markdown('**Download da tabela** :envelope_with_arrow:')
+    exibe_downloads(dados_etapa_filtered, arquivo, f'{espec["chave"]}_mun', (chave_filtros, tuple(colunas)))
+    st.markdown('---')
 
-        # Inserindo um texto sobre as colunas e linhas exibidas
-        st.dataframe(dados_mun_9_ano_filtered, hide_index = True)
-        st.markdown(f'A tabela possui :blue[{dados_mun_9_ano_filtered.shape[0]}] linhas e :blue[{dados_mun_9_ano_filtered.shape[1]}] colunas.')
-        
-        ## ------------------------ DOWNLOAD DAS TABELAS ------------------------ ##
-        
-        st.markdown('---')
-        st.markdown('**Download da tabela** :envelope_with_arrow:')
-        st.download_button('Formato em CSV :page_facing_up:', data = converte_csv(dados_mun_9_ano_filtered), file_name = f'tabela_9º_ano_rede_{componente}_{municipio}.csv', mime = 'text/csv') # on_click = mensagem_sucesso)  
-        st.download_button('Formato em XSLS :page_with_curl:', data = converte_xlsx(dados_mun_9_ano_filtered), file_name = f'tabela_9º_ano_rede_{componente}_{municipio}.xlsx',
-                                mime='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet') # on_click=mensagem_sucesso)
-        st.markdown('---')
 
-with aba4: # >>>>> 3ª Série do Ensino Médio
-    coluna1, coluna2 = st.columns(2)
-    if dados_mun_3_ano['Proficiência Média'].empty:
-            st.error(f'Dados não encontrados para o município de {municipio}. Verifique as opções nos filtros ou recarregue a página (F5 no teclado).', icon="🚨")
-            st.error('Não há oferta para **3ª Série do Ensino Médio** na **rede municipal** do Ceará.', icon = "⚠️")
-    else:
-        with coluna1:
-                st.metric('População prevista', formata_numero(dados_mun_3_ano['Nº de Alunos Previstos'].sum()), help='População prevista somada de acordo com os filtros selecionados')
-                st.metric('População avaliada', formata_numero(dados_mun_3_ano['Nº de Alunos Avaliados'].sum()), help='População avaliada somada de acordo com os filtros selecionados')
-                st.plotly_chart(fig_participacao_edicao_3_mun, use_container_width=True) # GRAFICO LINHAS PARTICIPACAO LONGITUDINAL
+if modo_etapas() == 'abas':
+    # Todas as etapas em abas (todas calculadas, mesmo as que não estão visíveis)
+    abas = st.tabs([espec['etapa'] for espec in ETAPAS])
+    for aba, espec, etapa in zip(abas, ETAPAS, prepara_etapas(ETAPAS)):
+        with aba:
+            exibe_comparacao(espec)
+            exibe_etapa(espec, etapa)
+else:
+    # Só a etapa selecionada é calculada e desenhada; as demais quando forem selecionadas
+    nomes_etapas = [espec['etapa'] for espec in ETAPAS]
+    etapa_selecionada = st.radio('Etapa', nomes_etapas, horizontal=True, label_visibility='collapsed', key='etapa_mun')
+    espec = ETAPAS[nomes_etapas.index(etapa_selecionada)]
+    exibe_comparacao(espec)
+    exibe_etapa(espec, prepara_etapas([espec])[0])
 
-        with coluna2:
-                num_alunos_previstos = dados_mun_3_ano['Nº de Alunos Previstos'].sum()
-                num_alunos_avaliados = dados_mun_3_ano['Nº de Alunos Avaliados'].sum()
-                if num_alunos_previstos > 0:
-                    taxa_participacao_3_mun = (num_alunos_avaliados / num_alunos_previstos) * 100
-                else:
-                    taxa_participacao_3_mun = 0
-                st.metric('Taxa de participação', f'{formata_taxa(taxa_participacao_3_mun)}%', help='Taxa de participação calculada de acordo com os filtros selecionados')
-                st.metric('Proficiência Média', f'{formata_proficiencia(dados_mun_3_ano["Proficiência Média"].mean())}', help='Proficiência Média de acordo com os filtros selecionados')
-                st.plotly_chart(fig_proficiencia_edicao_3_mun, use_container_width=True) # GRAFICO LINHAS PROFICIENCIA LOGITUDINAL
-        st.plotly_chart(fig_proficiencia_edicao_3_mun_bar, use_container_width=True) # GRAFICO BARRAS PADRAO DE DESEMPENHO    
-        st.plotly_chart(fig_barras_empilhadas_3_mun, use_container_width=True) # GRAFICO BARRAS EMPILHADAS DISTRIBUICAO DOS PADROES DE DESEMPENHO
 
+## ------------------------ EXPORTAÇÃO EM LOTE ------------------------ ##
 
-    ## ------------------------ VISUALIZAÇÃO DA TABELA ------------------------ ##
-        st.markdown('---')
-        # Adicionando a tabela para visualização e download
-        with st.expander('Colunas da Tabela'):
-            colunas = st.multiselect('Selecione as colunas', list(dados_mun_3_ano.columns), list(dados_mun_3_ano.columns), key='multiselect_expander_3_mun')
+# Tabelas de todos os municípios, etapas e componentes de uma vez, geradas em segundo plano (pool de processos)
+with st.expander('Exportar todos os municípios :package:'):
+    exibe_exportacao_lote('mun')
 
-            # Acionando os filtros (inside the expander)
-            dados_mun_3_ano_filtered = dados_mun_3_ano[colunas]  # Filter the DataFrame based on the selected columns
 
-        # Inserindo um texto sobre as colunas e linhas exibidas
-        st.dataframe(dados_mun_3_ano_filtered, hide_index = True)
-        st.markdown(f'A tabela possui :blue[{dados_mun_3_ano_filtered.shape[0]}] linhas e :blue[{dados_mun_3_ano_filtered.shape[1]}] colunas.')
+## ------------------------ TEMPOS DO RERUN (DEPURAÇÃO) ------------------------ ##
 
-    ## ------------------------ DOWNLOAD DAS TABELAS ------------------------ ##
-        st.markdown('---')
-        st.markdown('**Download da tabela** :envelope_with_arrow:')
-        st.download_button('Formato em CSV :page_facing_up:', data = converte_csv(dados_mun_3_ano_filtered), file_name = f'tabela_3ª_série_{componente}_{municipio}.csv', mime = 'text/csv') # on_click = mensagem_sucesso)  
-        st.download_button('Formato em XSLS :page_with_curl:', data = converte_xlsx(dados_mun_3_ano_filtered), file_name = f'tabela_3ª_série_{componente}_{municipio}.xlsx',
-                                mime='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet') # on_click=mensagem_sucesso
-        st.markdown('---')
-    
+# Encerra a medição (grava a linha do JSON lines, se configurado) e exibe o painel quando SPAECE_MEDICAO=1
+medicao = finaliza_medicao()
+if medicao is not None and painel_medicao():
+    exibe_medicao(medicao)
 
 
 ## ------------------------ CRÉDITOS ------------------------ ##
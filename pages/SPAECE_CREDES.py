@@ -0,0 +1,194 @@
+import streamlit as st                              # Lib para construção de deashboards interativos
+from spaece.carregamento import ARQUIVO_MUN, COLUNAS_MUN             # Tabelas de memória e colunas utilizadas na página
+from spaece.armazem import obtem_tabela, obtem_derivado, obtem_versao  # Tabelas compartilhadas entre sessões (snapshot Parquet ou CSV em cache)
+from spaece.hierarquia import cubos_hierarquia, acrescenta_hierarquia, indice_crede, acrescenta_indice_crede, CuboLinhas  # Agregados ponderados município -> CREDE -> estado
+from spaece.comparacao import municipios_por_crede                  # CREDEs (na ordem do código) e seus municípios
+from spaece.etapas import ETAPAS, calcula_etapas, etapa_avaliada, metricas_etapa  # Especificação das etapas e cálculo das tabelas em uma passada
+from spaece.graficos import graficos_etapa, graficos_vazios, titulos_etapa  # Gráficos de cada etapa
+from spaece.renderizacao import modo_etapas, cache_da_sessao        # Etapas calculadas sob demanda (só a selecionada)
+from spaece.cache_figuras import obtem_figuras, normaliza_filtros   # Figuras serializadas compartilhadas entre sessões
+from spaece.formatacao import formata_numero, formata_taxa, formata_proficiencia, formata_diferenca  # Formatação numérica no padrão brasileiro
+from spaece.interface import exibe_downloads, exibe_tabela, exibe_medicao  # Downloads, tabela paginada e tempos do rerun (comuns às páginas)
+from spaece.medicao import inicia_medicao, finaliza_medicao, trecho, painel_medicao  # Tempos de cada estágio do rerun (opcional)
+from spaece.aquecimento import aquecimento_ativo, inicia_aquecimento  # Aquecimento do processo (tabelas, agregados e figuras padrão)
+
+
+# Configurações de exibição para o usuário
+st.set_page_config(page_title = 'DASHBOARD SPAECE', initial_sidebar_state = 'collapsed', layout = 'wide',
+                   menu_items={'About': 'Desenvolvido por José Alves Ferreira Neto - https://www.linkedin.com/in/jos%C3%A9-alves-ferreira-neto-1bbbb8192/ | jose.alvesfn@gmail.com',
+                               'Report a bug': 'https://www.linkedin.com/in/jos%C3%A9-alves-ferreira-neto-1bbbb8192/',
+                               'Get help': 'https://www.seduc.ce.gov.br/'})
+
+# Medição dos estágios deste rerun (desligada por padrão: SPAECE_MEDICAO / SPAECE_ARQUIVO_MEDICAO)
+inicia_medicao('crede')
+
+# Deploys com `streamlit run`: a primeira sessão dispara, em segundo plano e uma única vez por processo, o aquecimento
+# das demais páginas (SPAECE_AQUECIMENTO=1; com `python -m spaece.aquecimento` o processo já parte aquecido)
+if aquecimento_ativo():
+    inicia_aquecimento()
+
+#Imagem lateral (sidebar)
+image = "spaece_tp2.png"
+st.sidebar.image(image)
+
+# Mensagem para o usuário (interajir com o side bar)
+st.markdown('<span style="color: blue; font-weight: bold"> :arrow_upper_left: Interaja para mais opções.</span>', unsafe_allow_html=True)
+
+# Definindo o título para o dashboard
+st.title('Plataforma de visualização de dados do SPAECE :chart_with_upwards_trend:')
+
+
+# ------------------------ SOLICITACOES / FILTRAGENS ------------------------ ##
+
+# Tabela municipal (a mesma da página de municípios, compartilhada entre sessões)
+with trecho('carga da tabela'):
+    dados_mun = obtem_tabela(ARQUIVO_MUN, COLUNAS_MUN)
+
+## Titulo do sidebar
+st.sidebar.title('Filtros')
+
+## Filtragem de redes
+redes = ['Municipal', 'Estadual']
+rede = st.sidebar.selectbox('Rede', redes)
+
+## Filtragem da CREDE (na ordem do código)
+credes = obtem_derivado(ARQUIVO_MUN, COLUNAS_MUN, 'municipios_por_crede', municipios_por_crede)
+crede = st.sidebar.selectbox('CREDE', list(credes))
+
+# Filtragem de componente
+componentes = ['Língua Portuguesa', 'Matemática']
+componente = st.sidebar.selectbox('Componente', componentes)
+
+# Filtragem das edições
+st.sidebar.markdown('<span style="font-size: 13.7px;">Desmarque para escolher uma ou mais opções</span>', unsafe_allow_html=True)
+todos_as_edicoes = st.sidebar.checkbox('Todas as edições', value = True)
+if todos_as_edicoes:
+    edicao = dados_mun['Edição'].unique()
+else:
+    edicao = st.sidebar.multiselect('Edição', dados_mun['Edição'].unique())
+
+## Filtragem da proficiencia media
+todas_as_proficiencias = st.sidebar.checkbox('Todas as proficiências médias', value = True)
+if todas_as_proficiencias: # Aqui por hora definimos o default acima como True, ou seja, não ocorrerá filtragem
+    proficiencia = (0, 500)
+else:
+    proficiencia = st.sidebar.slider('Selecione um intervalo', 0, 500, value = (0,500)) # Três parâmetros, sendo 1. Label, 2. Min, 3. Max
+
+# Índice das linhas dos municípios da CREDE e agregados ponderados (pelo Nº de Alunos Avaliados) da CREDE e do estado,
+# materializados uma vez por versão dos dados. O filtro de proficiência vale para as linhas dos municípios, como na
+# tabela exibida: CREDE e estado são os agregados só das linhas dentro do intervalo (CuboLinhas)
+with trecho('carga do índice e do cubo'):
+    indice_crede_mun = obtem_derivado(ARQUIVO_MUN, COLUNAS_MUN, 'indice_crede', indice_crede, acrescenta_indice_crede)
+    cubos = obtem_derivado(ARQUIVO_MUN, COLUNAS_MUN, 'hierarquia', cubos_hierarquia, acrescenta_hierarquia)
+    cubo_crede = CuboLinhas(cubos['crede'], indice_crede_mun, 'crede')
+    cubo_estado = CuboLinhas(cubos['estado'], indice_crede_mun, 'estado')
+filtros = {'Rede': rede, 'CREDE': crede, 'Componente': componente, 'Edição': edicao}
+
+## ------------------------ TABELAS E GRÁFICOS ------------------------ ##
+
+# Filtros normalizados + versão dos dados das edições selecionadas: chave das etapas já calculadas nesta sessão e do cache de figuras
+chave_filtros = (normaliza_filtros({**filtros, 'Proficiência Média': proficiencia}), obtem_versao(ARQUIVO_MUN, edicao))
+
+## Funcao que devolve as tabelas, figuras e a referência do estado das etapas pedidas, calculando só as que faltam
+def prepara_etapas(especs):
+    calculadas = cache_da_sessao(st.session_state, 'etapas_crede', chave_filtros)
+    faltantes = [espec for espec in especs if espec['etapa'] not in calculadas]
+    if faltantes:
+        tabelas = calcula_etapas(indice_crede_mun, cubo_crede, filtros, proficiencia, faltantes)
+        for espec in faltantes:
+            # Figuras vazias quando a etapa não é avaliada para a rede / componente selecionadas
+            if etapa_avaliada(espec, rede, componente):
+                with trecho(f'figuras: {espec["rotulo"]}'):
+                    figuras = obtem_figuras(('crede', espec['etapa']) + chave_filtros,
+                                            lambda: graficos_etapa(espec, tabelas[espec['etapa']], componente, titulos_etapa(espec, rede, componente, crede), 'municipio'))
+            else:
+                figuras = graficos_vazios()
+            # Estado (agregado ponderado dos municípios) nas mesmas edições e proficiências: referência das métricas da CREDE
+            estado = cubo_estado.seleciona({'Rede': rede, 'Componente': componente, 'Etapa': espec['etapa'], 'Edição': edicao}, proficiencia)
+            calculadas[espec['etapa']] = {'tabelas': tabelas[espec['etapa']], 'figuras': figuras, 'estado': metricas_etapa(estado, ponderada=True)}
+    return [calculadas[espec['etapa']] for espec in especs]
+
+
+## ------------------------ VISUALIZAÇÕES NO STREAMLIT ------------------------ ##
+
+## Funcao que exibe métricas (com a diferença para o estado), gráficos, tabela e downloads de uma etapa
+def exibe_etapa(espec, etapa):
+    dados_etapa = etapa['tabelas']['dados']
+    figuras_etapa = etapa['figuras']
+
+    coluna1, coluna2 = st.columns(2)
+    if dados_etapa['Proficiência Média'].empty:
+        st.error(f'Dados não encontrados para a {crede}. Verifique as opções nos filtros ou recarregue a página (F5 no teclado).', icon="🚨")
+        if espec['aviso']:
+            st.error(espec['aviso'], icon = "⚠️")
+        return
+
+    with trecho('métricas e envio dos gráficos'):
+        metricas = metricas_etapa(dados_etapa, ponderada=True)
+        estado = etapa['estado']
+        with coluna1:
+            st.metric('População prevista', formata_numero(metricas['previstos']), help='População prevista somada nos municípios da CREDE de acordo com os filtros selecionados')
+            st.metric('População avaliada', formata_numero(metricas['avaliados']), help='População avaliada somada nos municípios da CREDE de acordo com os filtros selecionados')
+            st.plotly_chart(figuras_etapa['participacao'], use_container_width=True) # GRAFICO LINHAS PARTICIPACAO LONGITUDINAL
+
+        with coluna2:
+            st.metric('Taxa de participação', f'{formata_taxa(metricas["participacao"])}%',
+                      delta=formata_diferenca(metricas['participacao'], estado['participacao'], formata_taxa, ' p.p. em relação ao estado'),
+                      help='Taxa de participação (avaliados / previstos) da CREDE; a diferença é para o estado (soma dos municípios)')
+            st.metric('Proficiência Média', f'{formata_proficiencia(metricas["proficiencia"])}',
+                      delta=formata_diferenca(metricas['proficiencia'], estado['proficiencia'], formata_proficiencia, ' em relação ao estado'),
+                      help='Proficiência Média ponderada pelo número de alunos avaliados; a diferença é para o estado (soma dos municípios)')
+            st.plotly_chart(figuras_etapa['proficiencia'], use_container_width=True) # GRAFICO LINHAS PROFICIENCIA LOGITUDINAL
+        st.plotly_chart(figuras_etapa['padrao'], use_container_width=True) # GRAFICO BARRAS PADRAO DE DESEMPENHO
+        st.plotly_chart(figuras_etapa['distribuicao'], use_container_width=True) # GRAFICO BARRAS EMPILHADAS DISTRIBUICAO DOS PADROES DE DESEMPENHO
+
+    ## ------------------------ VISUALIZAÇÃO DA TABELA ------------------------ ##
+
+    st.markdown('---')
+    # Adicionando a tabela (uma linha por município da CREDE e edição) para visualização e download
+    with st.expander('Colunas da Tabela'):
+        colunas = st.multiselect('Selecione as colunas', list(dados_etapa.columns), list(dados_etapa.columns), key=f'multiselect_expander_{espec["chave"]}_crede')
+        dados_etapa_filtered = dados_etapa[colunas]
+
+    # Tabela paginada (busca, ordenação e contagem no servidor)
+    exibe_tabela(dados_etapa, colunas, f'{espec["chave"]}_crede', chave_filtros)
+
+    ## ------------------------ DOWNLOAD DAS TABELAS ------------------------ ##
+
+    arquivo = f'{espec["arquivo"]}_{componente}_{crede}' if espec['mostra_componente'] else f'{espec["arquivo"]}_{crede}'
+    st.markdown('---')
+    st.markdown('**Download da tabela** :envelope_with_arrow:')
+    exibe_downloads(dados_etapa_filtered, arquivo, f'{espec["chave"]}_crede', (chave_filtros, tuple(colunas)))
+    st.markdown('---')
+
+
+if modo_etapas() == 'abas':
+    # Todas as etapas em abas (todas calculadas, mesmo as que não estão visíveis)
+    abas = st.tabs([espec['etapa'] for espec in ETAPAS])
+    for aba, espec, etapa in zip(abas, ETAPAS, prepara_etapas(ETAPAS)):
+        with aba:
+            exibe_etapa(espec, etapa)
+else:
+    # Só a etapa selecionada é calculada e desenhada; as demais quando forem selecionadas
+    nomes_etapas = [espec['etapa'] for espec in ETAPAS]
+    etapa_selecionada = st.radio('Etapa', nomes_etapas, horizontal=True, label_visibility='collapsed', key='etapa_crede')
+    espec = ETAPAS[nomes_etapas.index(etapa_selecionada)]
+    exibe_etapa(espec, prepara_etapas([espec])[0])
+
+
+## ------------------------ TEMPOS DO RERUN (DEPURAÇÃO) ------------------------ ##
+
+# Encerra a medição (grava a linha do JSON lines, se configurado) e exibe o painel quando SPAECE_MEDICAO=1
+medicao = finaliza_medicao()
+if medicao is not None and painel_medicao():
+    exibe_medicao(medicao)
+
+
+## ------------------------ CRÉDITOS ------------------------ ##
+
+st.markdown('*Os dados desta plataforma são fornecidos pelo Centro de Políticas Públicas e Avaliação da Educação da Universidade Federal de Juiz de Fora (CAEd/UFJF).*')
+st.markdown("""
+    **Desenvolvido por José Alves Ferreira Neto**  
+    - LinkedIn: [José Alves Ferreira Neto](https://www.linkedin.com/in/jos%C3%A9-alves-ferreira-neto-1bbbb8192/)  
+    - E-mail: jose.alvesfn@gmail.com
+""")
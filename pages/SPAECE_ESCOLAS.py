@@ -1,22 +1,197 @@
-import pandas as pd                                 # Lib para manipução e tratamento de dados, tabelas e dataframes
 import streamlit as st                              # Lib para construção de deashboards interativos
-import requests                                     # Lib para requisições de APIs
-import plotly.express as px                         # Lib de alto nivel para formatação rápida de gráficos
-import plotly.graph_objects as go                   # Lib de baixo nível para alteração de plotagem do plotly
-import locale                                       # Lib para setar o padrão de separação decimal BR
-import time                                         # Módulo para pequenas manipulações de tempo interativo
-import io                                           # Lib nativa para input / output binário
-import xlsxwriter                                   # Lib para engine de arquivos excel
+from spaece.escolas import snapshot_escolas, inicia_construcao_escolas  # Snapshot Parquet particionado por CREDE / município (só o recorte selecionado é lido)
+from spaece.etapas import ETAPAS, calcula_etapas, etapa_avaliada, metricas_etapa  # Especificação das etapas e cálculo das tabelas em uma passada
+from spaece.graficos import graficos_etapa, graficos_vazios, titulos_etapa  # Gráficos de cada etapa
+from spaece.renderizacao import modo_etapas, cache_da_sessao        # Etapas calculadas sob demanda (só a selecionada)
+from spaece.cache_figuras import obtem_figuras, normaliza_filtros   # Figuras serializadas compartilhadas entre sessões
+from spaece.formatacao import formata_numero, formata_taxa, formata_proficiencia  # Formatação numérica no padrão brasileiro
+from spaece.interface import exibe_downloads, exibe_tabela, exibe_medicao  # Downloads, tabela paginada e tempos do rerun (comuns às páginas)
+from spaece.medicao import inicia_medicao, finaliza_medicao, trecho, painel_medicao  # Tempos de cada estágio do rerun (opcional)
 
 
+# Configurações de exibição para o usuário
+st.set_page_config(page_title = 'DASHBOARD SPAECE', initial_sidebar_state = 'collapsed', layout = 'wide',
+                   menu_items={'About': 'Desenvolvido por José Alves Ferreira Neto - https://www.linkedin.com/in/jos%C3%A9-alves-ferreira-neto-1bbbb8192/ | jose.alvesfn@gmail.com',
+                               'Report a bug': 'https://www.linkedin.com/in/jos%C3%A9-alves-ferreira-neto-1bbbb8192/',
+                               'Get help': 'https://www.seduc.ce.gov.br/'})
 
-st.title('Em breve!')
-# st.markdown('<span style="color: red; font-weight: bold">EM DESENVOLVIMENTO!</span>', unsafe_allow_html = True)
+# Medição dos estágios deste rerun (desligada por padrão: SPAECE_MEDICAO / SPAECE_ARQUIVO_MEDICAO)
+inicia_medicao('esc')
 
+#Imagem lateral (sidebar)
+image = "spaece_tp2.png"
+st.sidebar.image(image)
 
-# Imagem de estamos trabalhando
-image = 'trabalhando.png'
-st.image(image, width = 200)
+# Mensagem para o usuário (interajir com o side bar)
+st.markdown('<span style="color: blue; font-weight: bold"> :arrow_upper_left: Interaja para mais opções.</span>', unsafe_allow_html=True)
 
-st.write('Gostou da imagem?')
-st.write('Visite https://www.flaticon.com')
+# Definindo o título para o dashboard
+st.title('Plataforma de visualização de dados do SPAECE :chart_with_upwards_trend:')
+
+
+# ------------------------ SOLICITACOES / FILTRAGENS ------------------------ ##
+
+# Snapshot da tabela por escola: construído antes (`python -m spaece.escolas` ou no aquecimento, em blocos, sem carregar
+# o CSV inteiro) e compartilhado entre sessões. Só os agregados pré-calculados e o catálogo das escolas ficam em memória;
+# as linhas das escolas são lidas por recorte. Se ainda não existir, a construção segue em segundo plano, fora do rerun
+with trecho('carga do snapshot'):
+    snapshot = snapshot_escolas(construir=False)
+if snapshot is None:
+    erro = inicia_construcao_escolas()
+    if erro is not None:
+        st.error(f'Não foi possível preparar os dados por escola: {erro}. Uma nova tentativa foi iniciada.', icon="🚨")
+    st.info('Os dados por escola estão sendo preparados (isso acontece uma única vez). Volte a esta página em alguns minutos.', icon="⏳")
+    st.button('Verificar novamente')
+    finaliza_medicao()  # Encerra a medição antes de interromper o rerun (nenhum trecho fica aberto)
+    st.stop()
+catalogo = snapshot.catalogo
+
+## Titulo do sidebar
+st.sidebar.title('Filtros')
+
+## Filtragem de redes
+redes = ['Municipal', 'Estadual']
+rede = st.sidebar.selectbox('Rede', redes)
+
+## Filtragem da CREDE (ordenadas pelo código)
+credes = catalogo[['Código da CREDE', 'CREDE']].drop_duplicates().sort_values('Código da CREDE')
+crede = st.sidebar.selectbox('CREDE', list(credes['CREDE']))
+codigo_crede = int(credes.loc[credes['CREDE'] == crede, 'Código da CREDE'].iloc[0])
+
+## Filtragem de município (da CREDE) e de escola (do município)
+escolas_crede = catalogo[catalogo['Código da CREDE'] == codigo_crede]
+municipio = st.sidebar.selectbox('Município', ['Todos os municípios'] + list(escolas_crede['Município'].unique()))
+municipio = None if municipio == 'Todos os municípios' else municipio
+escola = None
+if municipio is not None:
+    escola = st.sidebar.selectbox('Escola', ['Todas as escolas'] + list(escolas_crede.loc[escolas_crede['Município'] == municipio, 'Escola']))
+    escola = None if escola == 'Todas as escolas' else escola
+
+# Filtragem de componente
+componentes = ['Língua Portuguesa', 'Matemática']
+componente = st.sidebar.selectbox('Componente', componentes)
+
+# Filtragem das edições
+st.sidebar.markdown('<span style="font-size: 13.7px;">Desmarque para escolher uma ou mais opções</span>', unsafe_allow_html=True)
+todos_as_edicoes = st.sidebar.checkbox('Todas as edições', value = True)
+if todos_as_edicoes:
+    edicao = snapshot.edicoes()
+else:
+    edicao = st.sidebar.multiselect('Edição', snapshot.edicoes())
+
+## Filtragem da proficiencia media
+todas_as_proficiencias = st.sidebar.checkbox('Todas as proficiências médias', value = True)
+if todas_as_proficiencias: # Aqui por hora definimos o default acima como True, ou seja, não ocorrerá filtragem
+    proficiencia = (0, 500)
+else:
+    proficiencia = st.sidebar.slider('Selecione um intervalo', 0, 500, value = (0,500)) # Três parâmetros, sendo 1. Label, 2. Min, 3. Max
+
+# Só as partições (e colunas) da CREDE / município selecionados são lidas; as tabelas por edição de município e CREDE
+# vêm dos agregados pré-calculados (refeitos das linhas das escolas quando o intervalo de proficiência retira alguma),
+# e as de uma escola do cubo das linhas da própria escola
+with trecho('carga do recorte'):
+    indice_esc, cubo_esc, filtros_local = snapshot.selecao(codigo_crede, municipio, escola)
+filtros = {**filtros_local, 'Rede': rede, 'Componente': componente, 'Edição': edicao}
+local = escola or municipio or crede
+
+## ------------------------ TABELAS E GRÁFICOS ------------------------ ##
+
+# Filtros normalizados + versão do snapshot: chave das etapas já calculadas nesta sessão e do cache de figuras
+chave_filtros = (normaliza_filtros({**filtros, 'Proficiência Média': proficiencia}), snapshot.versao)
+
+## Funcao que devolve as tabelas e figuras das etapas pedidas, calculando (em uma única passada) só as que faltam
+def prepara_etapas(especs):
+    calculadas = cache_da_sessao(st.session_state, 'etapas_esc', chave_filtros)
+    faltantes = [espec for espec in especs if espec['etapa'] not in calculadas]
+    if faltantes:
+        tabelas = calcula_etapas(indice_esc, cubo_esc, filtros, proficiencia, faltantes)
+        for espec in faltantes:
+            # Figuras vazias quando a etapa não é avaliada para a rede / componente selecionadas
+            if etapa_avaliada(espec, rede, componente):
+                with trecho(f'figuras: {espec["rotulo"]}'):
+                    figuras = obtem_figuras(('esc', espec['etapa']) + chave_filtros,
+                                            lambda: graficos_etapa(espec, tabelas[espec['etapa']], componente, titulos_etapa(espec, rede, componente, local), 'municipio'))
+            else:
+                figuras = graficos_vazios()
+            calculadas[espec['etapa']] = {'tabelas': tabelas[espec['etapa']], 'figuras': figuras}
+    return [calculadas[espec['etapa']] for espec in especs]
+
+
+## ------------------------ VISUALIZAÇÕES NO STREAMLIT ------------------------ ##
+
+## Funcao que exibe métricas, gráficos, tabela e downloads de uma etapa
+def exibe_etapa(espec, etapa):
+    dados_etapa = etapa['tabelas']['dados']
+    figuras_etapa = etapa['figuras']
+
+    coluna1, coluna2 = st.columns(2)
+    if dados_etapa['Proficiência Média'].empty:
+        st.error(f'Dados não encontrados para {local}. Verifique as opções nos filtros ou recarregue a página (F5 no teclado).', icon="🚨")
+        if espec['aviso']:
+            st.error(espec['aviso'], icon = "⚠️")
+        return
+
+    with trecho('métricas e envio dos gráficos'):
+        metricas = metricas_etapa(dados_etapa)
+        with coluna1:
+            st.metric('População prevista', formata_numero(metricas['previstos']), help='População prevista somada de acordo com os filtros selecionados')
+            st.metric('População avaliada', formata_numero(metricas['avaliados']), help='População avaliada somada de acordo com os filtros selecionados')
+            st.plotly_chart(figuras_etapa['participacao'], use_container_width=True) # GRAFICO LINHAS PARTICIPACAO LONGITUDINAL
+
+        with coluna2:
+            st.metric('Taxa de participação', f'{formata_taxa(metricas["participacao"])}%', help='Taxa de participação calculada de acordo com os filtros selecionados')
+            st.metric('Proficiência Média', f'{formata_proficiencia(metricas["proficiencia"])}', help='Proficiência Média de acordo com os filtros selecionados')
+            st.plotly_chart(figuras_etapa['proficiencia'], use_container_width=True) # GRAFICO LINHAS PROFICIENCIA LOGITUDINAL
+        st.plotly_chart(figuras_etapa['padrao'], use_container_width=True) # GRAFICO BARRAS PADRAO DE DESEMPENHO
+        st.plotly_chart(figuras_etapa['distribuicao'], use_container_width=True) # GRAFICO BARRAS EMPILHADAS DISTRIBUICAO DOS PADROES DE DESEMPENHO
+
+    ## ------------------------ VISUALIZAÇÃO DA TABELA ------------------------ ##
+
+    st.markdown('---')
+    # Adicionando a tabela (uma linha por escola e edição) para visualização e download
+    with st.expander('Colunas da Tabela'):
+        colunas = st.multiselect('Selecione as colunas', list(dados_etapa.columns), list(dados_etapa.columns), key=f'multiselect_expander_{espec["chave"]}_esc')
+        dados_etapa_filtered = dados_etapa[colunas]
+
+    # Tabela paginada (busca, ordenação e contagem no servidor)
+    exibe_tabela(dados_etapa, colunas, f'{espec["chave"]}_esc', chave_filtros)
+
+    ## ------------------------ DOWNLOAD DAS TABELAS ------------------------ ##
+
+    arquivo = f'{espec["arquivo"]}_{componente}_{local}' if espec['mostra_componente'] else f'{espec["arquivo"]}_{local}'
+    st.markdown('---')
+    st.markdown('**Download da tabela** :envelope_with_arrow:')
+    exibe_downloads(dados_etapa_filtered, arquivo, f'{espec["chave"]}_esc', (chave_filtros, tuple(colunas)))
+    st.markdown('---')
+
+
+if modo_etapas() == 'abas':
+    # Todas as etapas em abas (todas calculadas, mesmo as que não estão visíveis)
+    abas = st.tabs([espec['etapa'] for espec in ETAPAS])
+    for aba, espec, etapa in zip(abas, ETAPAS, prepara_etapas(ETAPAS)):
+        with aba:
+            exibe_etapa(espec, etapa)
+else:
+    # Só a etapa selecionada é calculada e desenhada; as demais quando forem selecionadas
+    nomes_etapas = [espec['etapa'] for espec in ETAPAS]
+    etapa_selecionada = st.radio('Etapa', nomes_etapas, horizontal=True, label_visibility='collapsed', key='etapa_esc')
+    espec = ETAPAS[nomes_etapas.index(etapa_selecionada)]
+    exibe_etapa(espec, prepara_etapas([espec])[0])
+
+
+## ------------------------ TEMPOS DO RERUN (DEPURAÇÃO) ------------------------ ##
+
+# Encerra a medição (grava a linha do JSON lines, se configurado) e exibe o painel quando SPAECE_MEDICAO=1
+medicao = finaliza_medicao()
+if medicao is not None and painel_medicao():
+    exibe_medicao(medicao)
+
+
+## ------------------------ CRÉDITOS ------------------------ ##
+
+st.markdown('*Os dados desta plataforma são fornecidos pelo Centro de Políticas Públicas e Avaliação da Educação da Universidade Federal de Juiz de Fora (CAEd/UFJF).*')
+st.markdown("""
+    **Desenvolvido por José Alves Ferreira Neto**  
+    - LinkedIn: [José Alves Ferreira Neto](https://www.linkedin.com/in/jos%C3%A9-alves-ferreira-neto-1bbbb8192/)  
+    - E-mail: jose.alvesfn@gmail.com
+""")
@@ -0,0 +1 @@
+# Módulos compartilhados pelas páginas do painel SPAECE (carregamento, tratamento e cache dos dados)
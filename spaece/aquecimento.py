@@ -0,0 +1,142 @@
+import argparse                                     # Lib nativa para a linha de comando do aquecimento
+import contextlib                                   # Lib nativa para medir cada estágio com um `with`
+import logging                                      # Lib nativa para registrar a duração do aquecimento
+import os                                           # Lib nativa para variáveis de ambiente
+import sys                                          # Lib nativa para repassar os argumentos ao Streamlit
+import threading                                    # Lib nativa para o aquecimento em segundo plano
+import time                                         # Módulo para medir a duração de cada estágio
+
+from spaece.armazem import obtem_tabela, obtem_indice, obtem_cubo, obtem_derivado, obtem_versao
+from spaece.cache_figuras import obtem_figuras, normaliza_filtros
+from spaece.carregamento import ARQUIVO_CE, ARQUIVO_MUN, COLUNAS_CE, COLUNAS_MUN
+from spaece.comparacao import municipios_por_crede
+from spaece.escolas import snapshot_escolas
+from spaece.etapas import ETAPAS, REDES, calcula_etapas, etapa_avaliada
+from spaece.graficos import graficos_etapa, titulos_etapa
+from spaece.hierarquia import cubos_hierarquia, acrescenta_hierarquia, indice_crede, acrescenta_indice_crede, CuboLinhas
+
+
+logger = logging.getLogger(__name__)
+
+## ------------------------ AQUECIMENTO DO PROCESSO ------------------------ ##
+
+# Na partida do processo (antes da primeira sessão): tabelas carregadas e normalizadas (download do CSV ou leitura do
+# snapshot), índices e cubos (estado, municípios, CREDE) construídos no armazém e as figuras das visões padrão
+# guardadas no cache de figuras compartilhado, com as mesmas chaves das páginas. Visões padrão: Língua Portuguesa,
+# todas as edições e todas as proficiências, nas duas redes; o estado, o primeiro município e a primeira CREDE das
+# listas das páginas. Por último, o snapshot da tabela por escola (construído se ainda não existir).
+COMPONENTE_PADRAO = 'Língua Portuguesa'
+PROFICIENCIA_PADRAO = (0, 500)
+
+# Script principal do painel (iniciado pelo Streamlit depois do aquecimento, em `python -m spaece.aquecimento`)
+SCRIPT_PRINCIPAL = 'SPAECE_CE.py'
+
+
+## Funcao que informa se as páginas devem disparar o aquecimento em segundo plano (deploys com `streamlit run`)
+def aquecimento_ativo():
+    return os.environ.get('SPAECE_AQUECIMENTO', '').lower() in ('1', 'true', 'sim')
+
+@contextlib.contextmanager
+def _estagio(duracoes, nome):
+    inicio = time.perf_counter()
+    yield
+    duracoes[nome] = round((time.perf_counter() - inicio) * 1000, 1)
+
+## Funcao que guarda no cache de figuras as figuras de todas as etapas avaliadas de uma visão padrão
+# (mesma chave e mesmo construtor do prepara_etapas da página `pagina`); devolve o número de etapas
+def _aquece_visao(pagina, arquivo, indice, cubo, filtros, rede, local, nivel):
+    chave_filtros = (normaliza_filtros({**filtros, 'Proficiência Média': PROFICIENCIA_PADRAO}), obtem_versao(arquivo, filtros['Edição']))
+    especs = [espec for espec in ETAPAS if etapa_avaliada(espec, rede, COMPONENTE_PADRAO)]
+    tabelas = calcula_etapas(indice, cubo, filtros, PROFICIENCIA_PADRAO, especs)
+    for espec in especs:
+        obtem_figuras((pagina, espec['etapa']) + chave_filtros,
+                      lambda: graficos_etapa(espec, tabelas[espec['etapa']], COMPONENTE_PADRAO, titulos_etapa(espec, rede, COMPONENTE_PADRAO, local), nivel))
+    return len(especs)
+
+## Funcao que aquece o processo e devolve a duração (ms) de cada estágio, o total e o número de etapas desenhadas
+def aquece():
+    duracoes, etapas = {}, 0
+    inicio = time.perf_counter()
+
+    with _estagio(duracoes, 'tabelas'):
+        dados_ce = obtem_tabela(ARQUIVO_CE, COLUNAS_CE)
+        dados_mun = obtem_tabela(ARQUIVO_MUN, COLUNAS_MUN)
+    with _estagio(duracoes, 'índices e agregados'):
+        indice_ce, cubo_ce = obtem_indice(ARQUIVO_CE, COLUNAS_CE), obtem_cubo(ARQUIVO_CE, COLUNAS_CE)
+        indice_mun, cubo_mun = obtem_indice(ARQUIVO_MUN, COLUNAS_MUN), obtem_cubo(ARQUIVO_MUN, COLUNAS_MUN)
+        credes = obtem_derivado(ARQUIVO_MUN, COLUNAS_MUN, 'municipios_por_crede', municipios_por_crede)
+        indice_crede_mun = obtem_derivado(ARQUIVO_MUN, COLUNAS_MUN, 'indice_crede', indice_crede, acrescenta_indice_crede)
+        cubos = obtem_derivado(ARQUIVO_MUN, COLUNAS_MUN, 'hierarquia', cubos_hierarquia, acrescenta_hierarquia)
+
+    # Primeiras opções dos seletores das páginas (mesma ordem: Município na ordem da tabela, CREDE na ordem do código)
+    municipio = dados_mun['Município'].unique()[0]
+    crede = list(credes)[0]
+    with _estagio(duracoes, 'figuras'):
+        for rede in REDES:
+            etapas += _aquece_visao('ce', ARQUIVO_CE, indice_ce, cubo_ce,
+                                    {'Rede': rede, 'Componente': COMPONENTE_PADRAO, 'Edição': dados_ce['Edição'].unique()}, rede, None, 'estado')
+            etapas += _aquece_visao('mun', ARQUIVO_MUN, indice_mun, cubo_mun,
+                                    {'Rede': rede, 'Município': municipio, 'Componente': COMPONENTE_PADRAO, 'Edição': dados_mun['Edição'].unique()},
+                                    rede, municipio, 'municipio')
+            etapas += _aquece_visao('crede', ARQUIVO_MUN, indice_crede_mun, CuboLinhas(cubos['crede'], indice_crede_mun, 'crede'),
+                                    {'Rede': rede, 'CREDE': crede, 'Componente': COMPONENTE_PADRAO, 'Edição': dados_mun['Edição'].unique()},
+                                    rede, crede, 'municipio')
+
+    # A página de escolas não constrói o snapshot no rerun: sem ele, só mostra um aviso até a construção terminar
+    with _estagio(duracoes, 'snapshot das escolas'):
+        try:
+            snapshot_escolas()
+        except Exception:                           # Sem a tabela por escola agora: as demais páginas seguem aquecidas
+            logger.warning('Falha na construção do snapshot das escolas', exc_info=True)
+
+    total = round((time.perf_counter() - inicio) * 1000, 1)
+    logger.info('Aquecimento concluído em %.1f ms (%s; %d etapas desenhadas)', total,
+                ', '.join(f'{nome}: {duracao:.1f} ms' for nome, duracao in duracoes.items()), etapas)
+    return {'estagios_ms': duracoes, 'total_ms': total, 'etapas': etapas}
+
+
+# Um único aquecimento por processo (o resultado fica disponível para consulta, ex. no painel de medição)
+_aquecimento = {'thread': None, 'resultado': None}
+_trava = threading.Lock()
+
+def _executa():
+    try:
+        resultado = aquece()
+    except Exception:                               # Sem dados agora: as sessões seguem carregando sob demanda
+        logger.warning('Falha no aquecimento, as páginas carregam os dados na primeira sessão', exc_info=True)
+        resultado = None
+    with _trava:
+        _aquecimento['resultado'] = resultado
+
+## Funcao que dispara o aquecimento em segundo plano uma única vez por processo (chamadas seguintes não fazem nada)
+def inicia_aquecimento():
+    with _trava:
+        if _aquecimento['thread'] is None:
+            _aquecimento['thread'] = threading.Thread(target=_executa, name='aquecimento', daemon=True)
+            _aquecimento['thread'].start()
+        return _aquecimento['thread']
+
+## Funcao que devolve o resultado do aquecimento do processo (None se não executado, em andamento ou com falha)
+def resultado_aquecimento():
+    with _trava:
+        return _aquecimento['resultado']
+
+
+## ------------------------ LINHA DE COMANDO ------------------------ ##
+
+# Aquece o processo e só então inicia o servidor do Streamlit (a primeira sessão já encontra tudo pronto);
+# argumentos depois de `--` vão para o `streamlit run`.
+# Uso: python -m spaece.aquecimento [--sem-servidor] [-- --server.port 8501]
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Aquece as tabelas, agregados e figuras padrão e inicia o painel')
+    parser.add_argument('--sem-servidor', action='store_true', help='Só aquece e relata a duração (sem iniciar o Streamlit)')
+    parser.add_argument('streamlit', nargs=argparse.REMAINDER, help='Argumentos repassados ao `streamlit run`')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(name)s: %(message)s')
+    import spaece.aquecimento as aquecimento        # Mesmo estado do módulo importado pelas páginas (este arquivo roda como __main__)
+    aquecimento.inicia_aquecimento().join()
+    if not args.sem_servidor:
+        from streamlit.web import cli as stcli
+        sys.argv = ['streamlit', 'run', SCRIPT_PRINCIPAL] + [a for a in args.streamlit if a != '--']
+        sys.exit(stcli.main())
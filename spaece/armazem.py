@@ -0,0 +1,98 @@
+import threading                                    # Lib nativa para travas entre sessões simultâneas
+
+import pandas as pd                                 # Lib para manipução e tratamento de dados, tabelas e dataframes
+
+from spaece.cubo import CuboAgregados
+from spaece.indice import IndiceFiltro
+from spaece.esquema import concatena_tabelas
+from spaece.snapshot import carrega_tabela, edicoes_acrescidas, le_snapshot, versao_edicoes, versao_tabela
+
+
+## ------------------------ ARMAZÉM COMPARTILHADO ------------------------ ##
+
+# Um único dataframe por tabela / colunas / versão, compartilhado por todas as sessões e páginas do processo.
+# Regra: ninguém altera os valores do dataframe compartilhado nem as estruturas derivadas dele. Os arrays das colunas
+# do dataframe compartilhado são somente leitura (_somente_leitura): alterações no lugar (`.loc[...] = `, `.iloc[...] = `,
+# `inplace=True`, `dados[coluna][...] = `) levantam ValueError em vez de atingir as demais sessões. As páginas recebem
+# uma visão rasa (obtem_tabela): acrescentar ou substituir uma coluna inteira (`dados[coluna] = ...`) fica só na visão;
+# para alterar valores, copie antes (`.copy()`) o recorte que será alterado
+_armazem = {}                                       # (arquivo, colunas) -> {'versao', 'dados', 'derivados'}
+_trava = threading.RLock()
+
+## Funcao que devolve o dataframe sobre os mesmos valores (sem cópia), com os arrays das colunas marcados como somente
+# leitura (nas categóricas, os códigos)
+def _somente_leitura(dados):
+    colunas = {}
+    for coluna in dados.columns:
+        valores = dados[coluna].array
+        if isinstance(valores, pd.Categorical):
+            valores = pd.Categorical.from_codes(valores.codes, dtype=valores.dtype)  # .codes: visão somente leitura
+        else:
+            valores = dados[coluna].to_numpy().view()
+            valores.flags.writeable = False
+        colunas[coluna] = valores
+    return pd.DataFrame(colunas, index=dados.index, copy=False)
+
+def _entrada(arquivo, colunas):
+    chave = (arquivo, tuple(colunas) if colunas else None)
+    versao = versao_tabela(arquivo)
+
+    with _trava:
+        entrada = _armazem.get(chave)
+        if entrada is None or entrada['versao'] != versao:
+            entrada = _acrescenta_edicoes(arquivo, colunas, entrada) if entrada else None
+            if entrada is None:
+                entrada = {'versao': versao, 'dados': _somente_leitura(carrega_tabela(arquivo, colunas)), 'derivados': {}}
+            _armazem[chave] = entrada
+    return entrada
+
+## Funcao que atualiza a entrada quando a nova versão do snapshot só acrescentou edições (spaece/ingestao.py):
+# lê apenas as linhas das edições novas, acrescenta-as ao dataframe e atualiza os derivados que sabem se acrescentar
+# (os demais são reconstruídos quando pedidos). Devolve None quando a tabela precisa ser relida inteira
+def _acrescenta_edicoes(arquivo, colunas, entrada):
+    versao, edicoes = edicoes_acrescidas(arquivo, entrada['versao'])
+    if edicoes is None or 'Edição' not in entrada['dados'].columns:
+        return None
+    presentes = set(entrada['dados']['Edição'].unique())
+    edicoes = [e for e in edicoes if e not in presentes]    # A leitura inteira pode já ter pego um acréscimo recente
+    if not edicoes:
+        return {**entrada, 'versao': versao}
+
+    novas = le_snapshot(arquivo, colunas, {'Edição': edicoes})
+    dados = _somente_leitura(concatena_tabelas(entrada['dados'], novas))
+    derivados = {nome: {**derivado, 'valor': derivado['acrescenta'](derivado['valor'], dados, novas)}
+                 for nome, derivado in entrada['derivados'].items() if derivado['acrescenta']}
+    return {'versao': versao, 'dados': dados, 'derivados': derivados}
+
+## Funcao que devolve a tabela de memória compartilhada (visão rasa, somente leitura: ver a regra acima)
+def obtem_tabela(arquivo, colunas=None):
+    return _entrada(arquivo, colunas)['dados'].copy(deep=False)
+
+## Funcao que devolve uma estrutura derivada da tabela (índice, agregados...), construída uma vez por versão dos dados
+# `construtor` recebe o dataframe compartilhado e não deve alterá-lo; `acrescenta(valor, dados, novas)`, se informado,
+# devolve a estrutura atualizada com as linhas de uma edição nova (já concatenadas em `dados`) sem reconstruí-la
+def obtem_derivado(arquivo, colunas, nome, construtor, acrescenta=None):
+    entrada = _entrada(arquivo, colunas)
+    with _trava:
+        if nome not in entrada['derivados']:
+            entrada['derivados'][nome] = {'valor': construtor(entrada['dados']), 'acrescenta': acrescenta}
+        return entrada['derivados'][nome]['valor']
+
+def _acrescenta_indice(indice, dados, novas):
+    return indice.acrescenta(dados)
+
+def _acrescenta_cubo(cubo, dados, novas):
+    return cubo.acrescenta(novas)
+
+## Funcao que devolve o índice dos filtros (Rede, Componente, Etapa, Município, Edição) da tabela
+def obtem_indice(arquivo, colunas=None):
+    return obtem_derivado(arquivo, colunas, 'indice', IndiceFiltro, _acrescenta_indice)
+
+## Funcao que devolve o cubo de agregados (médias e somas por Rede, Componente, Etapa, Município e Edição) da tabela
+def obtem_cubo(arquivo, colunas=None):
+    return obtem_derivado(arquivo, colunas, 'cubo', CuboAgregados, _acrescenta_cubo)
+
+## Funcao que devolve a versão da tabela servida pelo armazém; com `edicoes`, só a parte da versão que afeta essas
+# edições (chave dos caches de etapas e figuras, que seguem válidos quando outra edição é acrescentada)
+def obtem_versao(arquivo, edicoes=None):
+    return versao_tabela(arquivo) if edicoes is None else versao_edicoes(arquivo, edicoes)
@@ -0,0 +1,224 @@
+import hashlib                                      # Lib nativa para a chave (hash) do conteúdo exportado
+import os                                           # Lib nativa para caminhos e variáveis de ambiente
+import tempfile                                     # Lib nativa para a pasta temporária padrão
+import threading                                    # Lib nativa para travas entre sessões simultâneas
+from collections import OrderedDict                 # Conteúdos lidos mantidos em ordem de uso (LRU)
+
+import numpy as np                                  # Lib para operações vetorizadas
+import pandas as pd                                 # Lib para manipução e tratamento de dados, tabelas e dataframes
+import pyarrow as pa                                # Lib para tabelas colunares (Arrow)
+import pyarrow.parquet as pq                        # Lib para escrita de arquivos Parquet
+import xlsxwriter                                   # Lib para engine de arquivos excel
+
+from spaece.medicao import trecho
+
+
+## ------------------------ CONFIGURAÇÕES ------------------------ ##
+
+# Pasta dos artefatos de download e tamanho máximo ocupado por ela (em MB)
+DIRETORIO_ARTEFATOS = os.path.join(tempfile.gettempdir(), 'spaece_artefatos')
+LIMITE_ARTEFATOS_MB = 512
+
+# Subpasta dos pacotes da exportação em lote (fora da contagem do limite: não são removidos pela limpeza)
+SUBPASTA_LOTES = 'lotes'
+
+# Memória máxima (em MB) dos conteúdos de artefatos já lidos, reaproveitados entre reruns e sessões
+LIMITE_CONTEUDOS_MB = 64
+
+# A partir deste número de linhas o XLSX é gravado em modo de memória constante (linha a linha, direto para o disco)
+LINHAS_MEMORIA_CONSTANTE = 20000
+
+# Linhas por bloco na gravação do CSV / XLSX
+LINHAS_POR_BLOCO = 10000
+
+
+def diretorio_artefatos():
+    return os.environ.get('SPAECE_DIRETORIO_ARTEFATOS', DIRETORIO_ARTEFATOS)
+
+def diretorio_lotes():
+    return os.path.join(diretorio_artefatos(), SUBPASTA_LOTES)
+
+def limite_artefatos():
+    return float(os.environ.get('SPAECE_LIMITE_ARTEFATOS_MB', LIMITE_ARTEFATOS_MB)) * 1024 * 1024
+
+
+## ------------------------ ESCRITORES ------------------------ ##
+
+## Funcao que grava o CSV em blocos (o texto da tabela inteira nunca fica em memória)
+def escreve_csv(dados, caminho):
+    with open(caminho, 'w', encoding='utf-8', newline='') as f:
+        for inicio in range(0, max(len(dados), 1), LINHAS_POR_BLOCO):
+            dados.iloc[inicio:inicio + LINHAS_POR_BLOCO].to_csv(f, index=False, header=inicio == 0)
+
+## Funcao que grava o XLSX direto com o xlsxwriter (cabeçalho sem borda, como na conversão original via pandas)
+# Tabelas grandes usam o modo `constant_memory`: cada linha vai para o disco assim que é escrita
+def escreve_xlsx(dados, caminho):
+    opcoes = {'constant_memory': len(dados) >= LINHAS_MEMORIA_CONSTANTE, 'nan_inf_to_errors': True}
+    with xlsxwriter.Workbook(caminho, opcoes) as workbook:
+        worksheet = workbook.add_worksheet('Sheet1')
+        escreve_planilha(worksheet, workbook.add_format({'border': False}), dados)
+
+## Funcao que escreve o dataframe em uma planilha do xlsxwriter, em ordem de linhas (exigência do modo de memória constante)
+def escreve_planilha(worksheet, formato_cabecalho, dados):
+    worksheet.write_row(0, 0, [str(c) for c in dados.columns], formato_cabecalho)
+
+    # Blocos de linhas convertidos para listas Python (ausentes viram None = célula vazia): a memória extra
+    # fica limitada a um bloco, qualquer que seja o tamanho da tabela
+    for inicio in range(0, len(dados), LINHAS_POR_BLOCO):
+        bloco = dados.iloc[inicio:inicio + LINHAS_POR_BLOCO].to_numpy(dtype=object)
+        bloco = np.where(pd.isna(bloco), None, bloco).tolist()
+        for linha, valores in enumerate(bloco, start=inicio + 1):
+            worksheet.write_row(linha, 0, valores)
+
+## Funcao que converte o dataframe para uma tabela Arrow: colunas numéricas sem cópia quando possível e
+# categóricas como dicionários (códigos + categorias), mantendo os tipos para quem for ler o arquivo
+def tabela_arrow(dados):
+    return pa.Table.from_pandas(dados, preserve_index=False)
+
+## Funcao que grava o Parquet (colunar, comprimido e tipado)
+def escreve_parquet(dados, caminho):
+    pq.write_table(tabela_arrow(dados), caminho, compression='zstd')
+
+## Funcao que grava o arquivo Arrow IPC (mesmo layout da memória: leitura direta, sem conversão)
+def escreve_arrow(dados, caminho):
+    tabela = tabela_arrow(dados)
+    with pa.OSFile(caminho, 'wb') as arquivo, pa.ipc.new_file(arquivo, tabela.schema) as escritor:
+        escritor.write_table(tabela, max_chunksize=LINHAS_POR_BLOCO)
+
+
+# Formatos de download: extensão, tipo MIME e escritor
+FORMATOS = {
+    'csv': {'extensao': 'csv', 'mime': 'text/csv', 'escritor': escreve_csv},
+    'xlsx': {'extensao': 'xlsx', 'mime': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet', 'escritor': escreve_xlsx},
+    'parquet': {'extensao': 'parquet', 'mime': 'application/vnd.apache.parquet', 'escritor': escreve_parquet},
+    'arrow': {'extensao': 'arrow', 'mime': 'application/vnd.apache.arrow.file', 'escritor': escreve_arrow},
+}
+
+
+## ------------------------ ARMAZÉM DE ARTEFATOS ------------------------ ##
+
+## Funcao que calcula o hash do conteúdo do dataframe (colunas, tipos e valores), sem serializá-lo
+def hash_conteudo(dados):
+    hash_ = hashlib.sha256()
+    hash_.update(repr([(str(c), str(t)) for c, t in dados.dtypes.items()]).encode('utf-8'))
+    hash_.update(pd.util.hash_pandas_object(dados, index=False).to_numpy().tobytes())
+    return hash_.hexdigest()[:24]
+
+
+class ArmazemArtefatos:
+    # Arquivos de download gerados sob demanda, um por (conteúdo, formato), compartilhados por todas as sessões.
+    # Um download repetido da mesma tabela só lê o arquivo já gravado; ao passar do limite de espaço,
+    # os artefatos usados há mais tempo são removidos.
+
+    def __init__(self, diretorio=None, limite=None):
+        self.diretorio = diretorio or diretorio_artefatos()
+        self.limite = limite if limite is not None else limite_artefatos()
+        self._travas = {}
+        self._trava_geral = threading.Lock()
+        self.acertos = 0
+        self.falhas = 0
+
+    def _trava(self, nome):
+        with self._trava_geral:
+            return self._travas.setdefault(nome, threading.Lock())
+
+    def _conta(self, acerto):
+        # Contadores compartilhados entre artefatos diferentes: a trava de cada caminho não basta
+        with self._trava_geral:
+            if acerto:
+                self.acertos += 1
+            else:
+                self.falhas += 1
+
+    def caminho(self, dados, formato):
+        return os.path.join(self.diretorio, f'{hash_conteudo(dados)}.{FORMATOS[formato]["extensao"]}')
+
+    def obtem(self, dados, formato):
+        # Devolve o caminho do artefato, gerando-o apenas se ainda não existir
+        caminho = self.caminho(dados, formato)
+        with self._trava(caminho):
+            if os.path.exists(caminho):
+                os.utime(caminho)                   # Marca como usado recentemente
+                self._conta(acerto=True)
+                return caminho
+
+            # Grava em arquivo temporário e depois substitui, para nunca servir um artefato pela metade
+            os.makedirs(self.diretorio, exist_ok=True)
+            temporario = f'{caminho}.{threading.get_ident()}.tmp'
+            with trecho(f'conversão: {formato}'):
+                FORMATOS[formato]['escritor'](dados, temporario)
+            os.replace(temporario, caminho)
+            self._conta(acerto=False)
+
+        self.limpa_excedente()
+        return caminho
+
+    def limpa_excedente(self):
+        try:
+            # Só os arquivos da própria pasta: a subpasta dos pacotes em lote não entra na conta nem na remoção
+            arquivos = [os.path.join(self.diretorio, nome) for nome in os.listdir(self.diretorio) if not nome.endswith('.tmp')]
+            arquivos = [a for a in arquivos if os.path.isfile(a)]
+            arquivos = sorted((os.stat(a).st_mtime, os.path.getsize(a), a) for a in arquivos)
+        except OSError:
+            return
+        total = sum(tamanho for _, tamanho, _ in arquivos)
+        for _, tamanho, arquivo in arquivos[:-1]:  # O artefato mais recente nunca é removido
+            if total <= self.limite:
+                break
+            try:
+                os.remove(arquivo)
+                total -= tamanho
+            except OSError:
+                pass
+
+    def estatisticas(self):
+        with self._trava_geral:
+            return {'acertos': self.acertos, 'falhas': self.falhas}
+
+
+# Instância única por processo (compartilhada por todas as sessões e páginas do Streamlit)
+_armazem_padrao = None
+_trava_padrao = threading.Lock()
+
+def armazem_artefatos():
+    global _armazem_padrao
+    with _trava_padrao:
+        if _armazem_padrao is None:
+            _armazem_padrao = ArmazemArtefatos()
+        return _armazem_padrao
+
+## Funcao que gera (ou reaproveita) o arquivo de download da tabela e devolve o caminho
+def obtem_artefato(dados, formato):
+    return armazem_artefatos().obtem(dados, formato)
+
+# Conteúdos já lidos, chave: caminho (os nomes dos artefatos e dos pacotes em lote vêm do hash do conteúdo / da versão,
+# então o mesmo caminho tem sempre o mesmo conteúdo). O botão de download é refeito a cada rerun: sem isso o arquivo
+# inteiro seria lido do disco a cada interação
+_conteudos = OrderedDict()
+_trava_conteudos = threading.Lock()
+
+## Funcao que lê o conteúdo de um artefato (None se já tiver sido removido pelo limite de espaço)
+def le_artefato(caminho):
+    if not os.path.exists(caminho):
+        with _trava_conteudos:
+            _conteudos.pop(caminho, None)
+        return None
+    with _trava_conteudos:
+        if caminho in _conteudos:
+            _conteudos.move_to_end(caminho)
+            return _conteudos[caminho]
+
+    try:
+        with open(caminho, 'rb') as f:
+            conteudo = f.read()
+    except OSError:
+        return None
+
+    limite = LIMITE_CONTEUDOS_MB * 1024 * 1024
+    if len(conteudo) <= limite:                     # Arquivos maiores que o limite são lidos a cada vez
+        with _trava_conteudos:
+            _conteudos[caminho] = conteudo
+            total = sum(len(c) for c in _conteudos.values())
+            while total > limite:
+                total -= len(_conteudos.popitem(last=False)[1])
+    return conteudo
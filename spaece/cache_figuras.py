@@ -0,0 +1,93 @@
+import json                                         # Lib nativa para (des)serializar as figuras
+import os                                           # Lib nativa para variáveis de ambiente
+import threading                                    # Lib nativa para travas entre sessões simultâneas
+from collections import OrderedDict                 # Dicionário ordenado para a política LRU
+
+import plotly.graph_objects as go                   # Lib de baixo nível para alteração de plotagem do plotly
+
+
+## ------------------------ CACHE DE FIGURAS ------------------------ ##
+
+# O plotly importa o motor JSON (orjson, se instalado) na primeira serialização, sem trava entre threads: a primeira
+# serialização é feita aqui, na importação, para que sessões simultâneas e o aquecimento não o encontrem pela metade
+go.Figure().to_json()
+
+# Número máximo de entradas (cada entrada guarda as figuras de uma etapa para uma combinação de filtros)
+CAPACIDADE = 512
+
+
+## Funcao que normaliza os filtros em uma tupla estável (ordem das chaves e dos valores não importa)
+def normaliza_filtros(filtros):
+    normalizados = []
+    for coluna in sorted(filtros):
+        valor = filtros[coluna]
+        if isinstance(valor, tuple):                # Intervalos (ex.: proficiência) mantêm a ordem
+            valor = tuple(str(v) for v in valor)
+        elif valor is not None and not isinstance(valor, str) and hasattr(valor, '__iter__'):
+            valor = tuple(sorted(str(v) for v in valor))
+        else:
+            valor = str(valor)
+        normalizados.append((coluna, valor))
+    return tuple(normalizados)
+
+
+class CacheFiguras:
+    # Figuras Plotly já serializadas (JSON), compartilhadas por todas as sessões e limitadas a `capacidade`
+    # entradas: ao exceder, descarta a usada há mais tempo. A chave deve incluir a versão dos dados.
+
+    def __init__(self, capacidade=None):
+        self.capacidade = int(capacidade if capacidade is not None else os.environ.get('SPAECE_CAPACIDADE_CACHE_FIGURAS', CAPACIDADE))
+        self._figuras = OrderedDict()               # chave -> {nome: JSON da figura}
+        self._trava = threading.Lock()
+        self.acertos = 0
+        self.falhas = 0
+
+    def obtem(self, chave, construtor):
+        # construtor: função sem argumentos que devolve {nome: go.Figure}; chamada apenas em caso de falha
+        with self._trava:
+            serializadas = self._figuras.get(chave)
+            if serializadas is not None:
+                self._figuras.move_to_end(chave)
+                self.acertos += 1
+        if serializadas is None:
+            serializadas = {nome: figura.to_json() for nome, figura in construtor().items()}
+            with self._trava:
+                self.falhas += 1
+                self._figuras[chave] = serializadas
+                self._figuras.move_to_end(chave)
+                while len(self._figuras) > self.capacidade:
+                    self._figuras.popitem(last=False)
+
+        # As figuras já foram validadas ao serem construídas: reconstrói sem validar de novo (bem mais rápido)
+        return {nome: go.Figure(json.loads(figura), _validate=False) for nome, figura in serializadas.items()}
+
+    def estatisticas(self):
+        with self._trava:
+            consultas = self.acertos + self.falhas
+            return {'acertos': self.acertos, 'falhas': self.falhas, 'entradas': len(self._figuras),
+                    'capacidade': self.capacidade, 'taxa_acerto': self.acertos / consultas if consultas else 0.0}
+
+    def limpa(self):
+        with self._trava:
+            self._figuras.clear()
+            self.acertos = self.falhas = 0
+
+
+# Instância única por processo (compartilhada por todas as sessões e páginas do Streamlit)
+_cache_figuras = None
+_trava_cache = threading.Lock()
+
+def cache_figuras():
+    global _cache_figuras
+    with _trava_cache:
+        if _cache_figuras is None:
+            _cache_figuras = CacheFiguras()
+        return _cache_figuras
+
+## Funcao que devolve as figuras de `chave` do cache compartilhado (construindo-as na primeira vez)
+def obtem_figuras(chave, construtor):
+    return cache_figuras().obtem(chave, construtor)
+
+## Funcao que devolve os contadores de acertos / falhas do cache compartilhado
+def estatisticas_figuras():
+    return cache_figuras().estatisticas()
@@ -0,0 +1,169 @@
+import hashlib                                      # Lib nativa para gerar a versão (hash) do conteúdo baixado
+import json                                         # Lib nativa para gravar os metadados do cache em disco
+import logging                                      # Lib nativa para registro de avisos
+import os                                           # Lib nativa para caminhos e variáveis de ambiente
+import threading                                    # Lib nativa para travas entre sessões simultâneas
+import time                                         # Módulo para controle do intervalo de revalidação
+
+import requests                                     # Lib para requisições HTTP
+
+from spaece.esquema import le_csv
+from spaece.normalizacao import normaliza_memoria
+
+
+logger = logging.getLogger(__name__)
+
+## ------------------------ CONFIGURAÇÕES ------------------------ ##
+
+# Endereço base das tabelas de memória no GitHub (pode ser trocado por um servidor local via variável de ambiente)
+URL_BASE = 'https://raw.githubusercontent.com/jose-alves-fn/jose-alves-fn-tabelas_spaece_memoria_2008_2022/main'
+
+# Arquivos de memória utilizados pelas páginas
+ARQUIVO_CE = 'memoria_ce_totas_etapas.csv'
+ARQUIVO_MUN = 'memoria_mun_todas_etapas_v5.csv'
+ARQUIVO_ESC = 'memoria_esc_todas_etapas.csv'  # Resultados por escola (snapshot particionado: spaece/escolas.py)
+
+# Colunas efetivamente utilizadas pelas páginas (as demais não precisam ser lidas)
+COLUNAS_CE = ['Etapa', 'Componente', 'Rede', 'Edição', 'Proficiência Média', 'Desvio Padrão',
+              'Indicação do Padrão de Desempenho', '% Não Alfabetizado', '% Alfabetização Incompleta',
+              '% Intermediário (2º Ano)', '% Suficiente', '% Desejável', '% Muito Crítico', '% Crítico',
+              '% Intermediário', '% Adequado', 'Nº de Alunos Previstos', 'Nº de Alunos Avaliados', 'Participação (%)']
+COLUNAS_MUN = COLUNAS_CE[:3] + ['Código da CREDE', 'CREDE', 'Município'] + COLUNAS_CE[3:]
+COLUNAS_ESC = COLUNAS_MUN[:6] + ['Escola'] + COLUNAS_MUN[6:]
+
+# Pasta do cache em disco e intervalo (em segundos) entre revalidações com o servidor
+DIRETORIO_CACHE = os.path.join(os.path.expanduser('~'), '.cache', 'spaece')
+INTERVALO_REVALIDACAO = 3600
+
+# Tempo máximo de espera de uma requisição (em segundos)
+TEMPO_LIMITE = 30
+
+
+## ------------------------ LEITURA ------------------------ ##
+
+## Funcao de leitura padrão: CSV no esquema compacto e nomes normalizados (executada uma vez por versão dos dados)
+def le_memoria(caminho):
+    return normaliza_memoria(le_csv(caminho))
+
+
+## ------------------------ CACHE DAS TABELAS ------------------------ ##
+
+class CacheMemoria:
+    # Mantém uma cópia em disco de cada arquivo de memória e o dataframe já lido em memória.
+    # Entre revalidações o dataframe é servido direto da memória; ao vencer o intervalo, o servidor
+    # é consultado com ETag / Last-Modified e o arquivo só é baixado (e lido) de novo se mudou.
+
+    def __init__(self, url_base=None, diretorio=None, intervalo=None, leitor=None):
+        self.url_base = (url_base or os.environ.get('SPAECE_URL_BASE', URL_BASE)).rstrip('/')
+        self.diretorio = diretorio or os.environ.get('SPAECE_DIRETORIO_CACHE', DIRETORIO_CACHE)
+        self.intervalo = float(intervalo if intervalo is not None else os.environ.get('SPAECE_INTERVALO_REVALIDACAO', INTERVALO_REVALIDACAO))
+        self.leitor = leitor or le_memoria
+        self._memoria = {}                          # arquivo -> {'dados', 'versao', 'validado_em'}
+        self._travas = {}
+        self._trava_geral = threading.Lock()
+
+    def _trava(self, arquivo):
+        with self._trava_geral:
+            return self._travas.setdefault(arquivo, threading.Lock())
+
+    def _caminho(self, arquivo):
+        return os.path.join(self.diretorio, arquivo)
+
+    def _le_metadados(self, arquivo):
+        try:
+            with open(self._caminho(arquivo) + '.json', encoding='utf-8') as f:
+                metadados = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return metadados if isinstance(metadados, dict) and metadados.get('versao') else {}  # Incompletos: como ausentes
+
+    def _grava(self, arquivo, conteudo, metadados):
+        # Grava primeiro em arquivos temporários e depois substitui, para nunca deixar um CSV pela metade
+        os.makedirs(self.diretorio, exist_ok=True)
+        caminho = self._caminho(arquivo)
+        with open(caminho + '.tmp', 'wb') as f:
+            f.write(conteudo)
+        with open(caminho + '.json.tmp', 'w', encoding='utf-8') as f:
+            json.dump(metadados, f)
+        os.replace(caminho + '.tmp', caminho)
+        os.replace(caminho + '.json.tmp', caminho + '.json')
+
+    def _revalida(self, arquivo):
+        # Consulta o servidor e devolve os metadados do arquivo que ficou em disco
+        caminho = self._caminho(arquivo)
+        metadados = self._le_metadados(arquivo) if os.path.exists(caminho) else {}
+
+        cabecalhos = {}
+        if metadados.get('etag'):
+            cabecalhos['If-None-Match'] = metadados['etag']
+        if metadados.get('last_modified'):
+            cabecalhos['If-Modified-Since'] = metadados['last_modified']
+
+        try:
+            resposta = requests.get(f'{self.url_base}/{arquivo}', headers=cabecalhos, timeout=TEMPO_LIMITE)
+            if resposta.status_code == 304:
+                return metadados
+            resposta.raise_for_status()
+        except requests.RequestException as erro:
+            if metadados:  # Sem conexão com o servidor: segue com a cópia em disco
+                logger.warning('Falha ao revalidar %s, utilizando a cópia em cache', arquivo, exc_info=True)
+                return metadados
+            if os.path.exists(caminho):  # Cópia em disco sem metadados (ausentes ou corrompidos): versão pelo conteúdo
+                logger.warning('Falha ao revalidar %s, utilizando a cópia em cache sem metadados', arquivo, exc_info=True)
+                with open(caminho, 'rb') as f:
+                    return {'etag': None, 'last_modified': None, 'versao': hashlib.sha256(f.read()).hexdigest()[:16]}
+            raise ConnectionError(f'Não foi possível baixar {arquivo} de {self.url_base} e não há cópia em cache em {self.diretorio} ({erro})') from erro
+
+        metadados = {'etag': resposta.headers.get('ETag'),
+                     'last_modified': resposta.headers.get('Last-Modified'),
+                     'versao': hashlib.sha256(resposta.content).hexdigest()[:16]}
+        self._grava(arquivo, resposta.content, metadados)
+        return metadados
+
+    def carrega(self, arquivo):
+        with self._trava(arquivo):
+            entrada = self._memoria.get(arquivo)
+            if entrada and time.monotonic() - entrada['validado_em'] < self.intervalo:
+                return entrada['dados']
+
+            metadados = self._revalida(arquivo)
+            if not entrada or entrada['versao'] != metadados['versao']:
+                entrada = {'dados': self.leitor(self._caminho(arquivo)), 'versao': metadados['versao']}
+                self._memoria[arquivo] = entrada
+            entrada['validado_em'] = time.monotonic()
+            return entrada['dados']
+
+    def baixa(self, arquivo):
+        # Caminho da cópia em disco (revalidada com o servidor) e versão, sem ler o arquivo: tabelas grandes são lidas em blocos
+        with self._trava(arquivo):
+            metadados = self._revalida(arquivo)
+            return self._caminho(arquivo), metadados['versao']
+
+    def versao(self, arquivo):
+        # Versão (hash do conteúdo) do arquivo atualmente servido
+        self.carrega(arquivo)
+        return self._memoria[arquivo]['versao']
+
+
+# Instância única por processo (compartilhada por todas as sessões e páginas do Streamlit)
+_cache_padrao = None
+_trava_padrao = threading.Lock()
+
+def cache_padrao():
+    global _cache_padrao
+    with _trava_padrao:
+        if _cache_padrao is None:
+            _cache_padrao = CacheMemoria()
+        return _cache_padrao
+
+## Funcao para carregar uma tabela de memória (ex.: carrega_memoria(ARQUIVO_CE))
+def carrega_memoria(arquivo):
+    return cache_padrao().carrega(arquivo)
+
+## Funcao para obter a versão da tabela de memória carregada
+def versao_memoria(arquivo):
+    return cache_padrao().versao(arquivo)
+
+## Funcao que baixa (ou revalida) a tabela de memória e devolve o caminho local e a versão, sem carregá-la
+def baixa_memoria(arquivo):
+    return cache_padrao().baixa(arquivo)
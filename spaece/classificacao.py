@@ -0,0 +1,60 @@
+import numpy as np                                  # Lib para operações vetorizadas
+import pandas as pd                                 # Lib para manipução e tratamento de dados, tabelas e dataframes
+
+from spaece.etapas import ETAPAS, COLUNA_FAIXA
+
+
+## ------------------------ CLASSIFICAÇÃO NOS PADRÕES DE DESEMPENHO ------------------------ ##
+
+
+## Funcao que classifica a proficiência média de todas as linhas, de todas as etapas e componentes, de uma vez
+# Cada (Etapa, Componente) vira um grupo; os pontos de corte de todos os grupos são deslocados para intervalos
+# disjuntos e concatenados, e um único np.digitize (intervalos fechados à direita, como o pd.cut) classifica tudo.
+def classifica_padroes(tabela, etapas=ETAPAS, casas_decimais=1):
+    proficiencia = np.round(tabela['Proficiência Média'].to_numpy(np.float64), casas_decimais)  # Classifica o valor exibido
+    faixas = np.full(len(tabela), -1, dtype=np.int8)
+    if not len(tabela):
+        return faixas
+
+    etapa = tabela['Etapa'] if isinstance(tabela['Etapa'].dtype, pd.CategoricalDtype) else tabela['Etapa'].astype('category')
+    componente = tabela['Componente'] if isinstance(tabela['Componente'].dtype, pd.CategoricalDtype) else tabela['Componente'].astype('category')
+
+    # Grupo de cada linha a partir dos códigos das categorias (tabela de consulta etapa x componente)
+    grupos = np.full((len(etapa.cat.categories) + 1, len(componente.cat.categories) + 1), -1, dtype=np.int64)
+    cortes = []
+    for espec in etapas:
+        i = etapa.cat.categories.get_indexer([espec['etapa']])[0]
+        for nome, pontos in espec['cortes'].items():
+            j = componente.cat.categories.get_indexer([nome])[0]
+            if i >= 0 and j >= 0:
+                grupos[i, j] = len(cortes)
+                cortes.append(np.asarray(pontos, dtype=np.float64))
+    if not cortes:
+        return faixas
+    grupo = grupos[etapa.cat.codes.to_numpy(), componente.cat.codes.to_numpy()]  # Código -1 cai na última linha / coluna (-1)
+
+    # Deslocamento de cada grupo maior que a amplitude de todos os cortes: os intervalos não se sobrepõem
+    minimo = min(c[0] for c in cortes)
+    largura = max(c[-1] for c in cortes) - minimo + 1
+    deslocados = np.concatenate([c - minimo + g * largura for g, c in enumerate(cortes)])
+    inicio = np.cumsum([0] + [len(c) for c in cortes[:-1]])                      # Posição do 1º corte de cada grupo
+    limite_inferior = np.array([c[0] for c in cortes])
+    limite_superior = np.array([c[-1] for c in cortes])
+
+    validas = grupo >= 0
+    g = grupo[validas]
+    valor = proficiencia[validas]
+    dentro = (valor > limite_inferior[g]) & (valor <= limite_superior[g])           # Fora dos cortes: sem faixa (pd.cut -> NaN)
+
+    posicao = np.digitize(np.where(dentro, valor, limite_superior[g]) - minimo + g * largura, deslocados, right=True)
+    faixas[validas] = np.where(dentro, posicao - inicio[g] - 1, -1)
+    return faixas
+
+
+## Funcao que reparte as colunas por faixa em uma única ordenação (um conjunto de arrays para cada traço do gráfico)
+# Devolve uma lista com `quantidade` itens; cada item é a lista das colunas restritas às linhas daquela faixa
+def agrupa_por_faixa(faixas, quantidade, *colunas):
+    ordem = np.argsort(faixas, kind='stable')                                       # Mantém a ordem das edições em cada faixa
+    limites = np.searchsorted(faixas[ordem], np.arange(quantidade + 1))
+    ordenadas = [np.asarray(coluna)[ordem] for coluna in colunas]
+    return [[coluna[limites[i]:limites[i + 1]] for coluna in ordenadas] for i in range(quantidade)]
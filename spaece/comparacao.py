@@ -0,0 +1,23 @@
+from spaece.formatacao import coluna_rotulo
+from spaece.medicao import trecho
+
+
+## ------------------------ COMPARAÇÃO ENTRE MUNICÍPIOS ------------------------ ##
+
+# Medidas das séries comparadas (gráficos de linhas de proficiência e participação)
+MEDIDAS_COMPARACAO = ['Proficiência Média', 'Participação (%)']
+
+
+## Funcao que devolve {CREDE: [municípios]} na ordem do código da CREDE (construída uma vez por versão dos dados, via armazém)
+def municipios_por_crede(dados):
+    pares = dados[['Código da CREDE', 'CREDE', 'Município']].drop_duplicates().sort_values(['Código da CREDE', 'Município'])
+    return {crede: list(grupo['Município']) for crede, grupo in pares.groupby('CREDE', observed=True, sort=False)}
+
+## Funcao que monta as séries de todos os municípios comparados de uma etapa em uma única seleção no cubo
+# (as células já são por município e edição: nenhum agrupamento nem laço por município).
+# Devolve a tabela longa: Município, Edição, medidas e seus rótulos pré-formatados
+def calcula_comparacao(cubo, filtros, municipios, espec, proficiencia=None):
+    with trecho('comparação: filtragem'):
+        agregados = cubo.seleciona({**filtros, 'Município': municipios, 'Etapa': espec['etapa']}, proficiencia)
+    rotulos = [coluna_rotulo(c) for c in MEDIDAS_COMPARACAO]
+    return agregados[['Município', 'Edição'] + MEDIDAS_COMPARACAO + rotulos].round({'Proficiência Média': 1}).reset_index(drop=True)
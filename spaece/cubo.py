@@ -0,0 +1,73 @@
+import copy                                         # Lib nativa para copiar o cubo ao acrescentar células
+
+from spaece.classificacao import classifica_padroes, COLUNA_FAIXA
+from spaece.formatacao import coluna_rotulo, rotulos_categoricos
+from spaece.esquema import COLUNAS_PERCENTUAIS, COLUNAS_CONTAGENS, concatena_tabelas
+from spaece.indice import IndiceFiltro, CHAVES_FILTRO
+
+
+## ------------------------ CUBO DE AGREGADOS ------------------------ ##
+
+# Medidas do cubo: médias (proficiência, participação e percentuais dos padrões) e somas (alunos previstos / avaliados)
+MEDIDAS_MEDIA = ['Proficiência Média'] + COLUNAS_PERCENTUAIS
+MEDIDAS_SOMA = COLUNAS_CONTAGENS
+
+
+## Funcao que materializa as medidas (com a faixa do padrão de desempenho e os rótulos formatados) para cada célula (Rede, Componente, Etapa, Município, Edição) da tabela
+def constroi_cubo(dados, chaves=CHAVES_FILTRO):
+    chaves = [c for c in chaves if c in dados.columns]
+    medias = [c for c in MEDIDAS_MEDIA if c in dados.columns]
+    somas = [c for c in MEDIDAS_SOMA if c in dados.columns]
+
+    grupos = dados.groupby(chaves, observed=True, sort=True)
+    linhas = grupos.size()
+    # Uma linha por célula: o filtro de proficiência do cubo (médias das células) só equivale ao das linhas nesse caso.
+    # Tabelas com várias linhas por célula (ex. escolas de um município) devem ser agregadas antes, com pre_agregado=True
+    if (linhas > 1).any():
+        celula = linhas.index[(linhas > 1).argmax()]
+        raise ValueError(f'{int((linhas > 1).sum())} células do cubo ({", ".join(chaves)}) têm mais de uma linha, ex. {celula}: '
+                         'agregue as linhas antes e use pre_agregado=True')
+    cubo = grupos[medias].mean()
+    cubo[somas] = grupos[somas].sum()
+    cubo['Nº de Linhas'] = linhas
+    return completa_cubo(cubo.reset_index())
+
+## Funcao que acrescenta às células já agregadas (aqui ou fora, ex. na construção do snapshot das escolas)
+# a faixa do padrão de desempenho e os rótulos formatados das médias
+def completa_cubo(cubo):
+    if 'Etapa' in cubo.columns and 'Componente' in cubo.columns:
+        cubo[COLUNA_FAIXA] = classifica_padroes(cubo)  # Padrão de desempenho de cada célula, calculado uma vez por versão
+
+    # Rótulos dos gráficos (padrão brasileiro) pré-formatados como categóricas; a proficiência é exibida já arredondada
+    for coluna in [c for c in MEDIDAS_MEDIA if c in cubo.columns]:
+        valores = cubo[coluna].round(1) if coluna == 'Proficiência Média' else cubo[coluna]
+        cubo[coluna_rotulo(coluna)] = rotulos_categoricos(valores)
+    return cubo
+
+
+class CuboAgregados:
+    # Cubo materializado uma vez por versão dos dados, com o mesmo índice de chaves da tabela original:
+    # as tabelas por edição dos gráficos são lidas do cubo, sem groupby a cada interação.
+    # chaves: nível de agregação (padrão: Rede, Componente, Etapa, Município, Edição);
+    # pre_agregado=True: `dados` já são as células (médias e somas), só completadas com faixas e rótulos
+
+    def __init__(self, dados, chaves=CHAVES_FILTRO, pre_agregado=False):
+        self.chaves = chaves
+        self.tabela = completa_cubo(dados.copy(deep=False)) if pre_agregado else constroi_cubo(dados, chaves)
+        self.indice = IndiceFiltro(self.tabela, chaves)
+
+    def acrescenta(self, novas, pre_agregado=False):
+        # Novo cubo com as células das linhas `novas` (ex.: uma edição nova), sem recalcular as células existentes:
+        # cada célula é de uma única edição. As células novas são intercaladas na ordem das chaves (a tabela segue
+        # ordenada e o índice é refeito sobre chaves já em ordem)
+        celulas = completa_cubo(novas.copy(deep=False)) if pre_agregado else constroi_cubo(novas, self.chaves)
+        tabela = concatena_tabelas(self.tabela, celulas)
+        cubo = copy.copy(self)
+        cubo.tabela = tabela.take(self.indice.acrescenta(tabela)._ordem).reset_index(drop=True)
+        cubo.indice = IndiceFiltro(cubo.tabela, self.chaves)
+        return cubo
+
+    def seleciona(self, filtros, proficiencia=None, colunas=None):
+        # Uma linha por célula (ordenada por Edição dentro da célula), filtrada pela proficiência média da célula
+        # (igual à da linha original: constroi_cubo só aceita tabelas com uma linha por célula)
+        return self.indice.seleciona(filtros, proficiencia, colunas)
@@ -0,0 +1,249 @@
+import argparse                                     # Lib nativa para a linha de comando do construtor
+import json                                         # Lib nativa para gravar os metadados do snapshot
+import logging                                      # Lib nativa para registrar falhas da construção em segundo plano
+import os                                           # Lib nativa para caminhos e variáveis de ambiente
+import shutil                                       # Lib nativa para substituir o snapshot antigo
+import threading                                    # Lib nativa para travas entre sessões simultâneas
+import time                                         # Módulo para medir o tempo de construção
+from collections import OrderedDict                 # Recortes lidos mantidos em ordem de uso (LRU)
+
+import pandas as pd                                 # Lib para manipução e tratamento de dados, tabelas e dataframes
+import pyarrow as pa                                # Lib para tabelas colunares (Arrow)
+import pyarrow.dataset as ds                        # Lib para leitura / escrita de datasets Parquet particionados
+
+from spaece.carregamento import ARQUIVO_ESC, COLUNAS_ESC, baixa_memoria
+from spaece.cubo import CuboAgregados
+from spaece.esquema import aplica_esquema
+from spaece.hierarquia import CuboLinhas, somas_ponderadas, medidas_ponderadas, CHAVES_NIVEIS
+from spaece.indice import IndiceFiltro
+from spaece.normalizacao import normaliza_memoria
+from spaece.snapshot import diretorio_snapshot
+
+
+logger = logging.getLogger(__name__)
+
+## ------------------------ CONFIGURAÇÕES ------------------------ ##
+
+# A tabela por escola é cerca de cem vezes maior que a municipal: nunca é lida inteira pelas páginas.
+# Ela é convertida (em blocos) em um dataset Parquet particionado por CREDE e município, com os agregados
+# por município e por CREDE calculados na mesma passada; a página lê só o recorte selecionado.
+PARTICOES_ESCOLAS = ['Código da CREDE', 'Município']
+
+# Linhas lidas do CSV por bloco na construção (memória da construção limitada a um bloco + os agregados)
+LINHAS_POR_BLOCO_ESCOLAS = 100000
+
+# Número de recortes (CREDE ou município) mantidos em memória, compartilhados entre as sessões
+CAPACIDADE_ESCOLAS = 16
+
+# Chaves de cada nível: agregados por município e por CREDE (pré-calculados) e linhas das escolas
+CHAVES_MUNICIPIO = ['Rede', 'Componente', 'Etapa', 'Município', 'Edição']
+CHAVES_CREDE = ['Rede', 'Componente', 'Etapa', 'CREDE', 'Edição']
+CHAVES_ESCOLA = ['Rede', 'Componente', 'Etapa', 'CREDE', 'Município', 'Escola', 'Edição']
+
+# Colunas de texto do CSV (as demais são numéricas)
+COLUNAS_TEXTO = ['Etapa', 'Componente', 'Rede', 'CREDE', 'Município', 'Escola', 'Indicação do Padrão de Desempenho']
+
+
+def capacidade_escolas():
+    return max(1, int(os.environ.get('SPAECE_CAPACIDADE_ESCOLAS', CAPACIDADE_ESCOLAS)))
+
+def caminho_snapshot_escolas(diretorio=None):
+    return os.path.join(diretorio or diretorio_snapshot(), os.path.splitext(ARQUIVO_ESC)[0])
+
+def _le_metadados(caminho):
+    try:
+        with open(os.path.join(caminho, '_metadados.json'), encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+## ------------------------ CONSTRUÇÃO (EM BLOCOS) ------------------------ ##
+
+## Funcao que devolve o esquema Arrow fixo do dataset (os blocos do CSV podem inferir tipos diferentes)
+def _esquema(colunas):
+    tipos = {'Código da CREDE': pa.int32(), 'Edição': pa.int32()}
+    return pa.schema([(c, pa.string() if c in COLUNAS_TEXTO else tipos.get(c, pa.float64())) for c in colunas])
+
+## Funcao que combina as somas parciais dos blocos no nível pedido: médias ponderadas pelo Nº de Alunos Avaliados e
+# participação recalculada das contagens (as mesmas células da hierarquia município -> CREDE), ordenadas pelas chaves
+def _agregados(parciais, chaves):
+    return medidas_ponderadas(parciais.groupby(chaves, observed=True, sort=True).sum())
+
+
+## Funcao que converte o CSV por escola no dataset particionado + agregados por município e por CREDE + catálogo das escolas
+# Uma única passada em blocos: cada bloco é normalizado, gravado nas partições e resumido em somas parciais
+def constroi_snapshot_escolas(diretorio=None, caminho_csv=None, versao=None, linhas_por_bloco=LINHAS_POR_BLOCO_ESCOLAS):
+    if caminho_csv is None:
+        caminho_csv, versao = baixa_memoria(ARQUIVO_ESC)
+    destino = caminho_snapshot_escolas(diretorio)
+    temporario = f'{destino}.{threading.get_ident()}.tmp'
+    shutil.rmtree(temporario, ignore_errors=True)
+
+    colunas = [c for c in pd.read_csv(caminho_csv, nrows=0).columns if c in COLUNAS_ESC]
+    esquema = _esquema(colunas)
+    parciais, catalogo, linhas = [], [], 0
+
+    def blocos():
+        nonlocal linhas
+        for bloco in pd.read_csv(caminho_csv, usecols=colunas, chunksize=linhas_por_bloco):
+            bloco = normaliza_memoria(bloco)[colunas]
+            parciais.append(somas_ponderadas(bloco, CHAVES_NIVEIS['municipio']))
+            catalogo.append(bloco[['Código da CREDE', 'CREDE', 'Município', 'Escola']].drop_duplicates())
+            linhas += len(bloco)
+            for coluna in bloco.columns:            # Categóricas da normalização voltam a texto (o esquema é fixo)
+                if isinstance(bloco[coluna].dtype, pd.CategoricalDtype):
+                    bloco[coluna] = bloco[coluna].astype(object)
+            yield from pa.Table.from_pandas(bloco, schema=esquema, preserve_index=False).to_batches()
+
+    # Uma passada: as partições ficam abertas e cada uma recebe um único arquivo (um grupo de linhas por bloco do CSV,
+    # gravado assim que o bloco é lido: nada é acumulado além do bloco atual)
+    ds.write_dataset(blocos(), temporario, schema=esquema, format='parquet',
+                     partitioning=PARTICOES_ESCOLAS, partitioning_flavor='hive')
+
+    parciais = pd.concat(parciais)
+    _agregados(parciais, CHAVES_NIVEIS['municipio']).to_parquet(os.path.join(temporario, '_agregados_municipio.parquet'), index=False)
+    _agregados(parciais, CHAVES_NIVEIS['crede']).to_parquet(
+        os.path.join(temporario, '_agregados_crede.parquet'), index=False)
+    catalogo = pd.concat(catalogo).drop_duplicates().sort_values(['Código da CREDE', 'Município', 'Escola'])
+    catalogo.astype({c: object for c in ['CREDE', 'Município', 'Escola']}).to_parquet(os.path.join(temporario, '_catalogo.parquet'), index=False)
+    with open(os.path.join(temporario, '_metadados.json'), 'w', encoding='utf-8') as f:
+        json.dump({'versao': versao, 'colunas': colunas, 'linhas': linhas}, f, ensure_ascii=False)
+
+    # Troca o snapshot de uma vez (as sessões nunca leem um snapshot pela metade)
+    antigo = f'{destino}.{threading.get_ident()}.antigo'
+    if os.path.exists(destino):
+        os.replace(destino, antigo)
+    os.replace(temporario, destino)
+    shutil.rmtree(antigo, ignore_errors=True)
+    return destino
+
+
+## ------------------------ LEITURA DOS RECORTES ------------------------ ##
+
+class SnapshotEscolas:
+    # Snapshot de uma versão da tabela por escola: agregados pré-calculados (por município e por CREDE),
+    # catálogo das escolas e os recortes já lidos (LRU), compartilhados por todas as sessões
+
+    def __init__(self, caminho, metadados):
+        self.caminho = caminho
+        self.versao = metadados['versao']
+        self.colunas = metadados['colunas']
+        self.dataset = ds.dataset(caminho, format='parquet', partitioning='hive')  # Arquivos '_*' (agregados, catálogo) ficam de fora
+        self.catalogo = aplica_esquema(pd.read_parquet(os.path.join(caminho, '_catalogo.parquet')))
+        self.cubos = {
+            'municipio': CuboAgregados(self._le_agregados('_agregados_municipio.parquet'), CHAVES_MUNICIPIO, pre_agregado=True),
+            'crede': CuboAgregados(self._le_agregados('_agregados_crede.parquet'), CHAVES_CREDE, pre_agregado=True),
+        }
+        self._recortes = OrderedDict()
+        self._trava = threading.Lock()
+
+    def _le_agregados(self, nome):
+        return aplica_esquema(pd.read_parquet(os.path.join(self.caminho, nome)))
+
+    def edicoes(self):
+        return self.cubos['crede'].tabela['Edição'].cat.categories
+
+    def recorte(self, codigo_crede, municipio=None):
+        # Linhas das escolas da CREDE (ou só do município), lidas apenas das partições e colunas necessárias, com o índice dos filtros
+        chave = (int(codigo_crede), municipio)
+        with self._trava:
+            if chave in self._recortes:
+                self._recortes.move_to_end(chave)
+                return self._recortes[chave]
+
+        filtro = ds.field('Código da CREDE') == chave[0]
+        if municipio is not None:
+            filtro = filtro & (ds.field('Município') == municipio)
+        dados = self.dataset.to_table(columns=[c for c in self.colunas if c in COLUNAS_ESC], filter=filtro).to_pandas()
+        dados = aplica_esquema(dados.astype({'Código da CREDE': 'int64', 'Edição': 'int64'}))  # Mesmos tipos da tabela municipal
+        recorte = {'dados': dados, 'indice': IndiceFiltro(dados, CHAVES_ESCOLA), 'cubo': None}
+
+        with self._trava:
+            self._recortes[chave] = recorte
+            while len(self._recortes) > capacidade_escolas():
+                self._recortes.popitem(last=False)
+        return recorte
+
+    def selecao(self, codigo_crede, municipio=None, escola=None):
+        # Índice das linhas e cubo do nível selecionado: escola (cubo das linhas da própria escola), município ou CREDE
+        # (agregados pré-calculados, com o filtro de proficiência aplicado às linhas das escolas, como na tabela exibida);
+        # devolve (indice, cubo, filtros do local)
+        recorte = self.recorte(codigo_crede, municipio)
+        if escola is not None:
+            with self._trava:
+                if recorte['cubo'] is None:
+                    recorte['cubo'] = CuboAgregados(recorte['dados'], CHAVES_ESCOLA)
+            return recorte['indice'], recorte['cubo'], {'Município': municipio, 'Escola': escola}
+        if municipio is not None:
+            return recorte['indice'], CuboLinhas(self.cubos['municipio'], recorte['indice'], 'municipio'), {'Município': municipio}
+        crede = self.catalogo.loc[self.catalogo['Código da CREDE'] == int(codigo_crede), 'CREDE'].iloc[0]
+        return recorte['indice'], CuboLinhas(self.cubos['crede'], recorte['indice'], 'crede'), {'CREDE': crede}
+
+
+# Snapshot atual (trocado quando a versão gravada nos metadados muda)
+_snapshot = None
+_trava_snapshot = threading.Lock()
+_trava_construcao = threading.Lock()
+
+## Funcao que devolve o snapshot das escolas, construindo-o (uma única vez, em blocos) se ainda não existir;
+# construir=False (páginas): None enquanto o snapshot não existe, sem construir no rerun
+def snapshot_escolas(construir=True):
+    global _snapshot
+    caminho = caminho_snapshot_escolas()
+    metadados = _le_metadados(caminho)
+    if metadados is None:
+        if not construir:
+            return None
+        with _trava_construcao:                     # Sessões simultâneas esperam a mesma construção
+            metadados = _le_metadados(caminho)
+            if metadados is None:
+                constroi_snapshot_escolas()
+                metadados = _le_metadados(caminho)
+
+    with _trava_snapshot:
+        if _snapshot is None or _snapshot.caminho != caminho or _snapshot.versao != metadados['versao']:
+            _snapshot = SnapshotEscolas(caminho, metadados)
+        return _snapshot
+
+
+# Construção em segundo plano, no máximo uma por vez no processo (disparada pela página quando o snapshot não existe:
+# o normal é construí-lo antes, com `python -m spaece.escolas` ou no aquecimento)
+_construcao = {'thread': None, 'erro': None}
+
+def _constroi_em_segundo_plano():
+    erro = None
+    try:
+        snapshot_escolas()
+    except Exception as falha:
+        logger.warning('Falha na construção do snapshot das escolas', exc_info=True)
+        erro = falha
+    with _trava_snapshot:
+        _construcao['thread'], _construcao['erro'] = None, erro
+
+## Funcao que dispara a construção em segundo plano, se nenhuma estiver em andamento (uma construção que falhou é
+# tentada de novo na chamada seguinte); devolve o erro da última tentativa encerrada (None se não houve falha)
+def inicia_construcao_escolas():
+    with _trava_snapshot:
+        erro = _construcao['erro']
+        if _construcao['thread'] is None:
+            _construcao['erro'] = None
+            _construcao['thread'] = threading.Thread(target=_constroi_em_segundo_plano, name='snapshot_escolas', daemon=True)
+            _construcao['thread'].start()
+        return erro
+
+
+## ------------------------ LINHA DE COMANDO ------------------------ ##
+
+# Uso: python -m spaece.escolas [--destino snapshot] [--csv memoria_esc_todas_etapas.csv]
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Converte a tabela por escola do SPAECE em um dataset Parquet particionado por CREDE e município')
+    parser.add_argument('--destino', default=diretorio_snapshot(), help='Pasta de saída dos snapshots')
+    parser.add_argument('--csv', help='CSV local (padrão: baixado do endereço das tabelas de memória)')
+    parser.add_argument('--linhas-por-bloco', type=int, default=LINHAS_POR_BLOCO_ESCOLAS)
+    args = parser.parse_args()
+
+    inicio = time.perf_counter()
+    versao = f'local-{os.path.getsize(args.csv)}-{int(os.path.getmtime(args.csv))}' if args.csv else None
+    caminho = constroi_snapshot_escolas(args.destino, args.csv, versao, args.linhas_por_bloco)
+    print(f'{ARQUIVO_ESC} -> {caminho} ({_le_metadados(caminho)["linhas"]} linhas, {time.perf_counter() - inicio:.2f} s)')
@@ -0,0 +1,59 @@
+import numpy as np                                  # Lib para operações vetorizadas
+import pandas as pd                                 # Lib para manipução e tratamento de dados, tabelas e dataframes
+
+
+## ------------------------ ESQUEMA DAS TABELAS DE MEMÓRIA ------------------------ ##
+
+# Colunas de poucos valores distintos, armazenadas como categóricas (os filtros comparam códigos inteiros)
+COLUNAS_CATEGORICAS = ['Rede', 'Etapa', 'Componente', 'Edição', 'Município', 'CREDE', 'Escola',
+                       'Indicação do Padrão de Desempenho']
+
+# Percentuais dos padrões de desempenho e da participação (float32 é suficiente para 2 casas decimais)
+COLUNAS_PERCENTUAIS = ['% Não Alfabetizado', '% Alfabetização Incompleta', '% Intermediário (2º Ano)',
+                       '% Suficiente', '% Desejável', '% Muito Crítico', '% Crítico', '% Intermediário',
+                       '% Adequado', 'Participação (%)']
+
+# Contagens de alunos (inteiros compactos quando não há valores ausentes)
+COLUNAS_CONTAGENS = ['Nº de Alunos Previstos', 'Nº de Alunos Avaliados']
+
+
+## Funcao que converte as colunas do dataframe para os tipos do esquema (altera e devolve o próprio dataframe)
+def aplica_esquema(dados):
+    for coluna in COLUNAS_CATEGORICAS:
+        if coluna in dados.columns and not isinstance(dados[coluna].dtype, pd.CategoricalDtype):
+            dados[coluna] = dados[coluna].astype('category')
+
+    for coluna in COLUNAS_PERCENTUAIS:
+        if coluna in dados.columns:
+            dados[coluna] = dados[coluna].astype('float32')
+
+    for coluna in COLUNAS_CONTAGENS:
+        if coluna in dados.columns:
+            if dados[coluna].isna().any():
+                dados[coluna] = dados[coluna].astype('float32')
+            else:
+                dados[coluna] = pd.to_numeric(dados[coluna], downcast='integer')
+    return dados
+
+## Funcao de leitura do CSV de memória já no esquema compacto
+def le_csv(caminho):
+    return aplica_esquema(pd.read_csv(caminho))
+
+## Funcao que acrescenta as linhas de `novas` ao fim de `dados` mantendo o esquema compacto (ex.: uma edição nova):
+# as categóricas passam a ter a união das categorias. As categorias novas entram no fim (os códigos das linhas antigas
+# não mudam) ou, se as existentes já estavam em ordem, na posição da ordem (a ordem relativa das antigas é mantida)
+def concatena_tabelas(dados, novas):
+    dados, novas = dados.copy(deep=False), novas[list(dados.columns)].copy(deep=False)
+    for coluna in dados.columns:
+        if not isinstance(dados[coluna].dtype, pd.CategoricalDtype):
+            continue
+        existentes = dados[coluna].cat.categories
+        valores = pd.Index(np.asarray(novas[coluna].dropna().unique()))
+        faltantes = valores[~valores.isin(existentes)]
+        if len(faltantes):
+            categorias = existentes.append(faltantes)
+            if existentes.is_monotonic_increasing:
+                categorias = categorias.sort_values()
+            dados[coluna] = dados[coluna].cat.set_categories(categorias)
+        novas[coluna] = novas[coluna].astype(dados[coluna].dtype)
+    return pd.concat([dados, novas], ignore_index=True)
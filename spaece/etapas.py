@@ -0,0 +1,152 @@
+from spaece.formatacao import coluna_rotulo
+from spaece.medicao import trecho
+
+
+## ------------------------ ESPECIFICAÇÃO DAS ETAPAS ------------------------ ##
+
+# Cada etapa avaliada é descrita apenas por configuração: colunas dos padrões de desempenho, pontos de corte,
+# cores e faixas do eixo y por componente. Incluir uma nova etapa (ou avaliação) = incluir um item em ETAPAS.
+
+CORES_ALFA = ['#FF0000', '#FFC000', '#FFFF00', '#C6E0B4', '#548235']
+CORES_PADROES = ['#FF0000', '#FFC000', '#C6E0B4', '#548235']
+
+PADROES = ['% Muito Crítico', '% Crítico', '% Intermediário', '% Adequado']
+
+REDES = ['Estadual', 'Municipal']
+COMPONENTES = ['Língua Portuguesa', 'Matemática']
+
+ETAPAS = [
+    {'etapa': '2º Ano do Ensino Fundamental',
+     'chave': '2',                                  # Sufixo das chaves dos widgets da etapa
+     'rotulo': '2º ANO',                            # Usado nos títulos dos gráficos
+     'arquivo': 'tabela_2º_ano',                    # Prefixo dos arquivos de download
+     'componentes': ['Língua Portuguesa'],          # Matemática não é avaliada no 2º ano
+     'redes': REDES,
+     'mostra_componente': False,                    # Uma única componente: não vai nos títulos / arquivos
+     'padroes': ['% Não Alfabetizado', '% Alfabetização Incompleta', '% Intermediário (2º Ano)', '% Suficiente', '% Desejável'],
+     'renomeia': {'% Intermediário (2º Ano)': '% Intermediário'},  # Por default na base o Intermediário vem diferente
+     'nomes_padroes': ['Não alfabetizado', 'Alfabetização incompleta', 'Intermediário', 'Suficiente', 'Desejável'],
+     'cores': CORES_ALFA,
+     'cortes': {'Língua Portuguesa': [0, 75, 100, 125, 150, 500]},
+     'eixo_y': {'estado': {'Língua Portuguesa': [50, 300]},
+                'municipio': {'Língua Portuguesa': [50, 300]}},
+     'altura_minima': 250,
+     'aviso': '**Matemática** não é uma componente avaliada para o **2º Ano do Ensino Fundamental**.'},
+
+    {'etapa': '5º Ano do Ensino Fundamental',
+     'chave': '5',
+     'rotulo': '5º ANO',
+     'arquivo': 'tabela_5º_ano_rede',
+     'componentes': COMPONENTES,
+     'redes': REDES,
+     'mostra_componente': True,
+     'padroes': PADROES,
+     'renomeia': {},
+     'nomes_padroes': PADROES,
+     'cores': CORES_PADROES,
+     'cortes': {'Língua Portuguesa': [0, 125, 175, 225, 500], 'Matemática': [0, 150, 200, 250, 500]},
+     'eixo_y': {'estado': {'Língua Portuguesa': [150, 250], 'Matemática': [150, 250]},
+                'municipio': {'Língua Portuguesa': [100, 350], 'Matemática': [130, 360]}},
+     'altura_minima': 240,
+     'aviso': None},
+
+    {'etapa': '9º Ano do Ensino Fundamental',
+     'chave': '9',
+     'rotulo': '9º ANO',
+     'arquivo': 'tabela_9º_ano_rede',
+     'componentes': COMPONENTES,
+     'redes': REDES,
+     'mostra_componente': True,
+     'padroes': PADROES,
+     'renomeia': {},
+     'nomes_padroes': PADROES,
+     'cores': CORES_PADROES,
+     'cortes': {'Língua Portuguesa': [0, 200, 250, 300, 500], 'Matemática': [0, 225, 275, 325, 500]},
+     'eixo_y': {'estado': {'Língua Portuguesa': [150, 300], 'Matemática': [150, 300]},
+                'municipio': {'Língua Portuguesa': [150, 365], 'Matemática': [160, 410]}},
+     'altura_minima': 240,
+     'aviso': None},
+
+    {'etapa': '3ª Série do Ensino Médio',
+     'chave': '3',
+     'rotulo': '3ª SÉRIE',
+     'arquivo': 'tabela_3ª_série',
+     'componentes': COMPONENTES,
+     'redes': ['Estadual'],                         # Não há oferta de ensino médio na rede municipal
+     'mostra_componente': True,
+     'padroes': PADROES,
+     'renomeia': {},
+     'nomes_padroes': PADROES,
+     'cores': CORES_PADROES,
+     'cortes': {'Língua Portuguesa': [0, 225, 275, 325, 500], 'Matemática': [0, 250, 300, 350, 500]},
+     'eixo_y': {'estado': {'Língua Portuguesa': [150, 300], 'Matemática': [150, 300]},
+                'municipio': {'Língua Portuguesa': [200, 330], 'Matemática': [210, 410]}},
+     'altura_minima': 240,
+     'aviso': 'Não há oferta para **3ª Série do Ensino Médio** na **rede municipal** do Ceará.'},
+]
+
+# Coluna com a faixa (0, 1, ...) do padrão de desempenho da proficiência média; -1 fora dos pontos de corte
+COLUNA_FAIXA = 'Faixa do Padrão'
+
+# Todas as colunas de padrões (as de outras etapas são retiradas da tabela de cada etapa)
+COLUNAS_PADROES = list(dict.fromkeys(c for espec in ETAPAS for c in espec['padroes']))
+
+
+## Funcao que informa se a etapa é avaliada para a rede e componente selecionadas
+def etapa_avaliada(espec, rede, componente):
+    return rede in espec['redes'] and componente in espec['componentes']
+
+
+## ------------------------ CÁLCULO DAS ETAPAS ------------------------ ##
+
+## Funcao que recorta a tabela exibida / exportada de uma etapa: só os padrões da etapa, com os nomes da etapa
+def tabela_etapa(linhas, espec):
+    colunas = [c for c in linhas.columns if c not in COLUNAS_PADROES or c in espec['padroes']]
+    return linhas[colunas].rename(columns=espec['renomeia'])
+
+## Funcao que calcula as métricas de uma etapa (populações somadas, taxa de participação e proficiência média)
+# ponderada=True: proficiência média ponderada pelo Nº de Alunos Avaliados de cada linha (visões agregadas, ex. CREDE)
+def metricas_etapa(dados, ponderada=False):
+    previstos = dados['Nº de Alunos Previstos'].sum()
+    avaliados = dados['Nº de Alunos Avaliados'].sum()
+    proficiencia = dados['Proficiência Média'].mean()
+    if ponderada:
+        pesos = dados['Nº de Alunos Avaliados'].where(dados['Proficiência Média'].notna(), 0)
+        if pesos.sum() > 0:
+            proficiencia = (dados['Proficiência Média'] * pesos).sum() / pesos.sum()
+    return {'previstos': previstos, 'avaliados': avaliados,
+            'participacao': (avaliados / previstos) * 100 if previstos > 0 else 0,
+            'proficiencia': proficiencia}
+
+## Funcao que devolve as colunas de rótulos pré-formatados (do cubo) das medidas
+def _rotulos(medidas):
+    return [coluna_rotulo(c) for c in medidas]
+
+## Funcao que monta as tabelas de todas as etapas em uma única passada:
+# uma seleção no índice das linhas e uma no cubo de agregados (todas as etapas de uma vez),
+# depois um único agrupamento por Etapa reparte as posições entre as etapas.
+# Devolve {etapa: {'dados', 'proficiencia', 'padroes', 'participacao'}}
+def calcula_etapas(indice, cubo, filtros, proficiencia=None, etapas=ETAPAS):
+    selecao = {**filtros, 'Etapa': [espec['etapa'] for espec in etapas]}
+    with trecho('filtragem'):
+        linhas = indice.seleciona(selecao, proficiencia)
+        agregados = cubo.seleciona(selecao, proficiencia)
+        posicoes_linhas = linhas.groupby('Etapa', observed=True).indices
+        posicoes_agregados = agregados.groupby('Etapa', observed=True).indices
+
+    tabelas = {}
+    for espec in etapas:
+        with trecho(f'agregação: {espec["rotulo"]}'):
+            dados = tabela_etapa(linhas.iloc[posicoes_linhas.get(espec['etapa'], [])], espec)
+            etapa = agregados.iloc[posicoes_agregados.get(espec['etapa'], [])].reset_index(drop=True)
+
+            # Rótulos pré-formatados do cubo acompanham as medidas (renomeados junto com os padrões)
+            renomeia = {**espec['renomeia'], **{coluna_rotulo(c): coluna_rotulo(n) for c, n in espec['renomeia'].items()}}
+
+            tabelas[espec['etapa']] = {
+                'dados': dados,
+                'proficiencia': etapa[['Edição', 'Proficiência Média', COLUNA_FAIXA] + _rotulos(['Proficiência Média'])].round({'Proficiência Média': 1}),
+                'padroes': etapa[['Edição'] + espec['padroes'] + _rotulos(espec['padroes'])].rename(columns=renomeia),
+                'participacao': etapa[['Edição', 'Participação (%)'] + _rotulos(['Participação (%)'])],
+            }
+    return tabelas
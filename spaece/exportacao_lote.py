@@ -0,0 +1,171 @@
+import argparse                                     # Lib nativa para a linha de comando
+import hashlib                                      # Lib nativa para o nome (hash) do arquivo exportado
+import itertools                                    # Lib nativa para o contador de tarefas
+import multiprocessing                              # Lib nativa para o contexto dos processos (spawn)
+import os                                           # Lib nativa para caminhos e variáveis de ambiente
+import shutil                                       # Lib nativa para remover a pasta de trabalho
+import tempfile                                     # Lib nativa para a pasta de trabalho de cada exportação
+import threading                                    # Lib nativa para travas e para a coordenação em segundo plano
+import time                                         # Módulo para medir a duração da exportação
+import zipfile                                      # Lib nativa para o pacote final (.zip)
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import xlsxwriter                                   # Lib para engine de arquivos excel
+
+from spaece.armazem import obtem_tabela, obtem_versao
+from spaece.artefatos import diretorio_lotes, escreve_planilha
+from spaece.carregamento import ARQUIVO_MUN, COLUNAS_MUN
+from spaece.etapas import ETAPAS, tabela_etapa
+
+
+## ------------------------ CONFIGURAÇÕES ------------------------ ##
+
+# Formatos da exportação em lote: um XLSX por CREDE (uma planilha por etapa e componente)
+# ou um arquivo por município, etapa e componente (CSV ou Parquet); tudo entregue em um único .zip
+FORMATOS_LOTE = {'xlsx': 'XLSX (um arquivo por CREDE)', 'csv': 'CSV (um arquivo por município)', 'parquet': 'Parquet (um arquivo por município)'}
+
+# Número máximo de processos da exportação (limitado ao número de núcleos)
+PROCESSOS_EXPORTACAO = 4
+
+
+def processos_exportacao():
+    return max(1, min(int(os.environ.get('SPAECE_PROCESSOS_EXPORTACAO', PROCESSOS_EXPORTACAO)), os.cpu_count() or 1))
+
+## Funcao que troca os caracteres inválidos em nomes de arquivo e de planilha
+def _nome_seguro(nome):
+    return ''.join('_' if c in '/\\:*?[]' else c for c in str(nome))
+
+
+## ------------------------ TAREFA DE CADA CREDE (PROCESSO SEPARADO) ------------------------ ##
+
+## Funcao executada nos processos: grava os arquivos de uma CREDE na pasta de trabalho e devolve os caminhos
+# dados: linhas da CREDE (todas as redes, etapas, componentes e municípios)
+def exporta_crede(dados, crede, formato, pasta):
+    grupos = dados.groupby(['Etapa', 'Componente'], observed=True).indices
+    tabelas = [(espec, componente, tabela_etapa(dados.iloc[grupos[(espec['etapa'], componente)]], espec))
+               for espec in ETAPAS for componente in espec['componentes'] if (espec['etapa'], componente) in grupos]
+
+    if formato == 'xlsx':
+        caminho = os.path.join(pasta, f'{_nome_seguro(crede)}.xlsx')
+        with xlsxwriter.Workbook(caminho, {'constant_memory': True, 'nan_inf_to_errors': True}) as workbook:
+            cabecalho = workbook.add_format({'border': False})
+            for espec, componente, tabela in tabelas:
+                escreve_planilha(workbook.add_worksheet(_nome_seguro(f'{espec["rotulo"]} - {componente}')[:31]), cabecalho, tabela)
+        return [caminho]
+
+    caminhos = []
+    for espec, componente, tabela in tabelas:
+        for municipio, posicoes in tabela.groupby('Município', observed=True).indices.items():
+            nome = f'{espec["arquivo"]}_{componente}_{municipio}' if espec['mostra_componente'] else f'{espec["arquivo"]}_{municipio}'
+            caminho = os.path.join(pasta, _nome_seguro(crede), f'{_nome_seguro(nome)}.{formato}')
+            os.makedirs(os.path.dirname(caminho), exist_ok=True)
+            if formato == 'parquet':
+                tabela.iloc[posicoes].to_parquet(caminho, index=False)
+            else:
+                tabela.iloc[posicoes].to_csv(caminho, index=False)
+            caminhos.append(caminho)
+    return caminhos
+
+
+## ------------------------ EXECUÇÃO EM SEGUNDO PLANO ------------------------ ##
+
+# Pool de processos único por processo do Streamlit (limitado a `processos_exportacao()`), criado no primeiro uso.
+# Os processos são iniciados com 'spawn' (não herdam as threads e o estado do servidor)
+_executor = None
+_trava = threading.Lock()
+_exportacoes = {}                                   # id -> estado da exportação
+_contador = itertools.count(1)
+
+def _pool():
+    global _executor
+    with _trava:
+        if _executor is None:
+            _executor = ProcessPoolExecutor(max_workers=processos_exportacao(), mp_context=multiprocessing.get_context('spawn'))
+        return _executor
+
+def _atualiza(exportacao, **valores):
+    with _trava:
+        exportacao.update(valores)
+
+## Funcao que divide a tabela por CREDE, distribui as CREDEs entre os processos e empacota o resultado
+def executa_exportacao(dados, formato, destino, progresso=None, executor=None):
+    progresso = progresso or (lambda concluidas, total: None)
+    pasta = tempfile.mkdtemp(prefix='spaece_lote_')
+    try:
+        grupos = dados.groupby('CREDE', observed=True).indices
+        credes = list(grupos)
+        if 'Código da CREDE' in dados.columns:      # Ordem numérica das CREDEs (1, 2, ..., 10), e não alfabética
+            credes.sort(key=lambda crede: dados['Código da CREDE'].iat[grupos[crede][0]])
+        progresso(0, len(credes))
+
+        executor = executor or _pool()
+        tarefas = [executor.submit(exporta_crede, dados.iloc[grupos[crede]], crede, formato, pasta) for crede in credes]
+        arquivos = []
+        for concluidas, tarefa in enumerate(as_completed(tarefas), start=1):
+            arquivos.extend(tarefa.result())
+            progresso(concluidas, len(credes))
+
+        # Empacota (XLSX e Parquet já são comprimidos: só são armazenados no .zip)
+        compressao = zipfile.ZIP_DEFLATED if formato == 'csv' else zipfile.ZIP_STORED
+        temporario = f'{destino}.{threading.get_ident()}.tmp'
+        with zipfile.ZipFile(temporario, 'w', compressao) as pacote:
+            for arquivo in sorted(arquivos):
+                pacote.write(arquivo, os.path.relpath(arquivo, pasta))
+        os.replace(temporario, destino)
+        return destino
+    finally:
+        shutil.rmtree(pasta, ignore_errors=True)
+
+## Funcao que inicia a exportação em segundo plano e devolve o id para acompanhar o progresso
+# O pacote é nomeado pela versão dos dados e pelo formato: se já existir, a exportação termina na hora
+def inicia_exportacao(formato, arquivo=ARQUIVO_MUN, colunas=COLUNAS_MUN):
+    if formato not in FORMATOS_LOTE:
+        raise ValueError(f'Formato de exportação inválido: {formato}')
+    versao = obtem_versao(arquivo)
+    nome = hashlib.sha256(f'{arquivo}|{versao}|{formato}'.encode('utf-8')).hexdigest()[:24]
+    destino = os.path.join(diretorio_lotes(), f'lote_{nome}.zip')
+
+    exportacao = {'id': next(_contador), 'formato': formato, 'estado': 'executando', 'concluidas': 0, 'total': 0,
+                  'caminho': None, 'erro': None, 'inicio': time.monotonic(), 'duracao': None}
+    with _trava:
+        _exportacoes[exportacao['id']] = exportacao
+
+    def coordena():
+        try:
+            if not os.path.exists(destino):
+                os.makedirs(os.path.dirname(destino), exist_ok=True)
+                # Mesma tabela compartilhada (armazém) usada pelo dashboard
+                executa_exportacao(obtem_tabela(arquivo, colunas), formato, destino,
+                                   lambda concluidas, total: _atualiza(exportacao, concluidas=concluidas, total=total))
+            _atualiza(exportacao, estado='concluida', caminho=destino)
+        except Exception as erro:
+            _atualiza(exportacao, estado='erro', erro=str(erro))
+        finally:
+            _atualiza(exportacao, duracao=time.monotonic() - exportacao['inicio'])
+
+    threading.Thread(target=coordena, name=f'exportacao_{exportacao["id"]}', daemon=True).start()
+    return exportacao['id']
+
+## Funcao que devolve uma cópia do estado da exportação ('executando', 'concluida' ou 'erro'), ou None se não existir
+def estado_exportacao(identificador):
+    with _trava:
+        exportacao = _exportacoes.get(identificador)
+        return dict(exportacao) if exportacao else None
+
+
+## ------------------------ LINHA DE COMANDO ------------------------ ##
+
+# Uso: python -m spaece.exportacao_lote --formato xlsx --destino exportacao.zip [--processos 4]
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Exporta as tabelas de todos os municípios, etapas e componentes do SPAECE')
+    parser.add_argument('--formato', choices=list(FORMATOS_LOTE), default='xlsx')
+    parser.add_argument('--destino', required=True, help='Arquivo .zip de saída')
+    parser.add_argument('--processos', type=int, default=processos_exportacao())
+    args = parser.parse_args()
+
+    inicio = time.perf_counter()
+    dados = obtem_tabela(ARQUIVO_MUN, COLUNAS_MUN)
+    with ProcessPoolExecutor(max_workers=args.processos, mp_context=multiprocessing.get_context('spawn')) as executor:
+        executa_exportacao(dados, args.formato, args.destino,
+                           lambda concluidas, total: print(f'\r{concluidas}/{total} CREDEs', end='', flush=True), executor)
+    print(f'\n{args.destino} ({time.perf_counter() - inicio:.2f} s)')
@@ -0,0 +1,86 @@
+import numpy as np                                  # Lib para operações vetorizadas
+import pandas as pd                                 # Lib para manipução e tratamento de dados, tabelas e dataframes
+
+
+## ------------------------ FORMATAÇÃO NUMÉRICA (PADRÃO BRASILEIRO) ------------------------ ##
+
+# Todas as funções aceitam um escalar (devolvem str) ou um array / Series inteiro (devolvem array / Series de str).
+# O cálculo (arredondamento, escala, casas) é vetorizado e cada valor distinto é formatado uma única vez:
+# rótulos de gráficos e tabelas têm poucos valores distintos em relação ao número de linhas.
+
+# Troca dos separadores do padrão americano (1,234.5) para o brasileiro (1.234,5)
+_TROCA_SEPARADORES = str.maketrans({',': '.', '.': ','})
+
+# Unidades de escala de `formata_numero`
+UNIDADES = ['', 'mil', 'milhões']
+
+# Nome da coluna de rótulos pré-formatados de uma coluna numérica (ex.: no cubo de agregados)
+def coluna_rotulo(coluna):
+    return f'{coluna} Formatada'
+
+
+## Funcao que aplica `funcao` (valor -> str) a cada valor distinto de `valores`, preservando a forma da entrada
+def _por_valor_distinto(valores, funcao):
+    if isinstance(valores, pd.Series):
+        return pd.Series(_por_valor_distinto(valores.to_numpy(), funcao), index=valores.index, name=valores.name)
+    matriz = np.asarray(valores)
+    if matriz.ndim == 0:
+        return funcao(matriz.item())
+    distintos, inverso = np.unique(matriz.ravel(), return_inverse=True)
+    textos = np.array([funcao(valor) for valor in distintos.tolist()], dtype=object)
+    return textos[inverso].reshape(matriz.shape)
+
+
+## Funcao para números decimais com vírgula e separador de milhar (ex.: 1234.56 -> '1.234,6')
+def formata_decimal(valores, casas=1, milhar=True):
+    padrao = f'{{:{"," if milhar else ""}.{casas}f}}'
+    numeros = valores.astype(np.float64) if isinstance(valores, pd.Series) else np.asarray(valores, dtype=np.float64)
+    return _por_valor_distinto(numeros, lambda valor: padrao.format(valor).translate(_TROCA_SEPARADORES))
+
+## Funcao para a taxa de participação e a proficiência das métricas (1 casa decimal)
+def formata_taxa(valores):
+    return formata_decimal(valores, 1, milhar=False)
+
+def formata_proficiencia(valores):
+    return formata_decimal(valores, 1, milhar=False)
+
+## Funcao para a diferença entre uma métrica e a sua referência (delta do st.metric, já formatado por `formata`):
+# None (sem delta) quando um dos dois valores não existe, ex. nenhuma proficiência no intervalo selecionado
+def formata_diferenca(valor, referencia, formata, sufixo=''):
+    if pd.isna(valor) or pd.isna(referencia):
+        return None
+    return f'{formata(valor - referencia)}{sufixo}'
+
+# Um valor já escalado (unidade: índice em UNIDADES)
+def _numero_escalado(valor, unidade, prefixo):
+    valor_str = f'{valor:.2f}'.replace('.', ',')
+    if valor.is_integer():
+        valor_str = valor_str.replace(',00', '')  # Remove o ",00" quando for um número inteiro
+    return f'{prefixo} {valor_str} {UNIDADES[unidade]}'
+
+## Funcao para as métricas de população: escala em mil / milhões, 2 casas e sem ',00' em valores inteiros
+# (ex.: 999 -> ' 999 ', 1234 -> ' 1,23 mil', 5000 -> ' 5 mil')
+def formata_numero(valores, prefixo=''):
+    serie = valores if isinstance(valores, pd.Series) else None
+    numeros = np.asarray(valores, dtype=np.float64)
+
+    # Escala vetorizada: 0 (< mil), 1 (mil) ou 2 (milhões)
+    escala = (numeros >= 1e3).astype(np.int64) + (numeros >= 1e6)
+    escalados = numeros / np.power(1000.0, escala)
+    if numeros.ndim == 0:
+        return _numero_escalado(escalados.item(), int(escala), prefixo)
+
+    # Cada escala é formatada à parte, uma vez por valor escalado distinto
+    resultado = np.empty(numeros.shape, dtype=object)
+    for unidade in range(len(UNIDADES)):
+        linhas = escala == unidade
+        if linhas.any():
+            resultado[linhas] = _por_valor_distinto(escalados[linhas], lambda valor: _numero_escalado(valor, unidade, prefixo))
+    return pd.Series(resultado, index=serie.index, name=serie.name) if serie is not None else resultado
+
+## Funcao que devolve os rótulos de uma coluna como categórica (pré-cálculo compacto, uma vez por versão dos dados)
+def rotulos_categoricos(valores, casas=1):
+    numeros = np.asarray(valores, dtype=np.float64)
+    distintos, inverso = np.unique(numeros, return_inverse=True)
+    textos = formata_decimal(distintos, casas, milhar=False)
+    return pd.Categorical(textos).take(inverso) if len(numeros) else pd.Categorical([])
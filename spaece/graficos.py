@@ -0,0 +1,154 @@
+import pandas as pd                                 # Lib para manipução e tratamento de dados, tabelas e dataframes
+import plotly.express as px                         # Lib de alto nivel para formatação rápida de gráficos
+import plotly.graph_objects as go                   # Lib de baixo nível para alteração de plotagem do plotly
+
+from spaece.classificacao import agrupa_por_faixa
+from spaece.etapas import COLUNA_FAIXA
+from spaece.formatacao import coluna_rotulo
+
+
+## ------------------------ GRÁFICOS DAS ETAPAS ------------------------ ##
+
+# Número máximo e mínimo de edições exibidas (largura das barras / altura das barras empilhadas)
+NUMERO_MAXIMO_EDICOES = 15  # Variar esse valor sempre que for atualizar o script
+NUMERO_MINIMO_EDICOES = 1
+
+# Alterando as edições localmente para que o eixo y compreenda
+MAPEAMENTO_EDICOES = {str(ano): f'({ano})' for ano in range(2019, 2006, -1)}
+
+
+# Rótulos no padrão brasileiro (atenção o locale-br não funciona em todos as aplicações):
+# pré-formatados no cubo (completa_cubo, uma vez por versão dos dados), nunca refeitos a cada rerun
+def _rotulos(tabela, coluna):
+    return tabela[coluna_rotulo(coluna)].astype(object)
+
+
+## Gráfico de LINHAS longitudinal (proficiência média ou participação)
+def grafico_linhas(tabela, coluna, coluna_texto, titulo):
+    tabela = tabela.copy()
+    tabela[coluna_texto] = _rotulos(tabela, coluna)
+
+    fig = px.line(tabela, x='Edição', y=coluna, markers=True, text=coluna_texto, title=titulo)
+    fig.update_layout(xaxis=dict(type='category', categoryorder='category ascending', title_text=''))  # Definir o tipo de eixo como categoria
+    fig.update_traces(textposition='bottom center', line=dict(color='#548235'))  # Ajustar a posição dos rótulos de dados
+    return fig
+
+## Gráfico de LINHAS com uma série por município (comparação), todas na mesma figura:
+# as colunas são repartidas entre as séries em uma única ordenação e os traços entram na figura de uma vez
+def grafico_comparacao(tabela, coluna, titulo, serie='Município'):
+    codigos, nomes = pd.factorize(tabela[serie], sort=True)
+    series = agrupa_por_faixa(codigos, len(nomes), tabela['Edição'].astype(str), tabela[coluna], _rotulos(tabela, coluna))
+
+    fig = go.Figure(data=[go.Scatter(x=edicoes, y=valores, customdata=rotulos, name=str(nome), mode='lines+markers',
+                                     hovertemplate='%{fullData.name}<br>%{x}: %{customdata}<extra></extra>')
+                          for nome, (edicoes, valores, rotulos) in zip(nomes, series)])
+    fig.update_layout(title=titulo, colorway=px.colors.qualitative.Dark24, hovermode='closest',
+                      xaxis=dict(type='category', categoryorder='category ascending', title_text=''),
+                      yaxis=dict(title_text=coluna))
+    return fig
+
+## Gráfico de BARRAS para padrões de desempenho longitudinal (cor de cada barra pelo padrão da proficiência média)
+# A faixa vem pré-calculada do cubo (COLUNA_FAIXA, classifica_padroes uma vez por versão dos dados)
+def grafico_padrao(tabela, cortes, cores, nomes, eixo_y, titulo):
+    faixas = tabela[COLUNA_FAIXA].to_numpy()
+
+    # Calculando a largura das barras com base no número de edições (regra de três)
+    num_edicoes_exibidas = len(tabela['Edição'].unique())
+    width_maximo = 0.8
+    width_minimo = 0.1
+    width_adaptavel = width_minimo + (width_maximo - width_minimo) * ((num_edicoes_exibidas - NUMERO_MINIMO_EDICOES) / (NUMERO_MAXIMO_EDICOES - NUMERO_MINIMO_EDICOES))
+
+    # Arrays (edição, proficiência, rótulo) de todas as faixas separados em uma única ordenação
+    tracos = agrupa_por_faixa(faixas, len(cortes) - 1, tabela['Edição'], tabela['Proficiência Média'], _rotulos(tabela, 'Proficiência Média'))
+
+    fig = go.Figure()
+    for i, (edicoes, proficiencias, rotulos) in enumerate(tracos):
+        fig.add_trace(go.Bar(
+            x=edicoes,
+            y=proficiencias,
+            marker=dict(color=cores[i]),
+            name=nomes[i],
+            text=rotulos,
+            textposition='outside',
+            width=width_adaptavel
+        ))
+
+    fig.update_layout(
+        xaxis=dict(type='category', categoryorder='category ascending'),
+        yaxis=dict(range=eixo_y),
+        showlegend=True,   # Força a legenda mesmo quando as barras forem de um só padrão
+        title=titulo
+    )
+    return fig
+
+## Gráfico de BARRAS EMPILHADAS para a distribuição percentual por padrão de desempenho
+# padroes: colunas exibidas (por padrão, todas exceto Edição e os rótulos pré-formatados)
+def grafico_distribuicao(tabela, cores, titulo, altura_minima=240, altura_maxima=675, padroes=None):
+    tabela = tabela.copy()
+    tabela['Edição'] = tabela['Edição'].replace(MAPEAMENTO_EDICOES)
+    if padroes is None:
+        rotulos = {coluna_rotulo(c) for c in tabela.columns}
+        padroes = [c for c in tabela.columns if c != 'Edição' and c not in rotulos]
+    mapeamento_cores = dict(zip(padroes, cores))
+
+    # Altura proporcional ao número de edições exibidas, limitada entre a altura mínima e máxima
+    altura_ideal = altura_minima + (altura_maxima - altura_minima) * (len(tabela['Edição']) / NUMERO_MAXIMO_EDICOES)
+    altura_final = max(altura_minima, min(altura_ideal, altura_maxima))
+
+    fig = go.Figure()
+    for padrao in padroes:
+        fig.add_trace(go.Bar(
+            y=tabela['Edição'],
+            x=tabela[padrao],
+            name=padrao,
+            orientation='h',
+            text=_rotulos(tabela, padrao),  # Formatação BR
+            textposition='inside',
+            textfont=dict(size=12),  # Tamanho da fonte do texto
+            insidetextanchor='middle',  # Centralizar o texto dentro da barra
+            width=0.7,
+            marker=dict(color=mapeamento_cores[padrao])
+        ))
+
+    # Agrupando as barras via layout, barmode = 'stack' (barra empilhada)
+    fig.update_layout(
+        barmode='stack',
+        title=titulo,
+        xaxis_title='', # Percentual
+        yaxis_title='', # Edição
+        showlegend=True,
+        xaxis=dict(range=[0, 100], showticklabels=False),
+        height=altura_final,
+        bargap=0.1 # ajuste de espaçamento das barras
+    )
+    return fig
+
+## Títulos dos gráficos de uma etapa (local: município, ou None para o estado)
+def titulos_etapa(espec, rede, componente, local=None):
+    titulo_rede = f'REDE {(rede).upper()} - {(local).upper()}' if local else f'REDE {(rede).upper()}'
+    titulo_completo = f'{titulo_rede} - {(componente).upper()}' if espec['mostra_componente'] else titulo_rede
+    return {'proficiencia': f'PROFICIÊNCIA MÉDIA - {espec["rotulo"]} - {titulo_completo}',
+            'participacao': f'PARTICIPAÇÃO - {espec["rotulo"]} - {titulo_rede}',
+            'padrao': f'PADRÃO DE DESEMPENHO - {espec["rotulo"]} - {titulo_completo}',
+            'distribuicao': f'DISTRIBUIÇÃO POR PADRÃO DE DESEMPENHO - {espec["rotulo"]} - {titulo_completo}'}
+
+## Funcao que monta as quatro figuras de uma etapa a partir das tabelas de `calcula_etapas`
+# titulos: {'proficiencia', 'participacao', 'padrao', 'distribuicao'}; nivel: 'estado' ou 'municipio' (faixas do eixo y)
+def graficos_etapa(espec, tabelas, componente, titulos, nivel):
+    return {
+        'proficiencia': grafico_linhas(tabelas['proficiencia'], 'Proficiência Média', 'Proficiência Média Formatada', titulos['proficiencia']),
+        'participacao': grafico_linhas(tabelas['participacao'], 'Participação (%)', 'Participação Formatada', titulos['participacao']),
+        'padrao': grafico_padrao(tabelas['proficiencia'], espec['cortes'][componente], espec['cores'], espec['nomes_padroes'],
+                                 espec['eixo_y'][nivel][componente], titulos['padrao']),
+        'distribuicao': grafico_distribuicao(tabelas['padroes'], espec['cores'], titulos['distribuicao'], espec['altura_minima'],
+                                             padroes=[espec['renomeia'].get(c, c) for c in espec['padroes']]),
+    }
+
+## Funcao que monta as duas figuras da comparação (proficiência e participação) a partir da tabela de `calcula_comparacao`
+def graficos_comparacao(tabela, titulos):
+    return {'proficiencia': grafico_comparacao(tabela, 'Proficiência Média', titulos['proficiencia']),
+            'participacao': grafico_comparacao(tabela, 'Participação (%)', titulos['participacao'])}
+
+## Figuras vazias (etapa não avaliada para a rede / componente selecionadas)
+def graficos_vazios():
+    return {'proficiencia': go.Figure(), 'participacao': go.Figure(), 'padrao': go.Figure(), 'distribuicao': go.Figure()}
@@ -0,0 +1,108 @@
+import numpy as np                                  # Lib para operações vetorizadas
+import pandas as pd                                 # Lib para manipução e tratamento de dados, tabelas e dataframes
+
+from spaece.cubo import CuboAgregados, completa_cubo
+from spaece.esquema import COLUNAS_PERCENTUAIS, COLUNAS_CONTAGENS
+from spaece.indice import IndiceFiltro
+
+
+## ------------------------ HIERARQUIA MUNICÍPIO -> CREDE -> ESTADO ------------------------ ##
+
+# Chaves de cada nível; cada nível é agregado a partir das somas do nível anterior
+CHAVES_MUNICIPIO = ['Rede', 'Componente', 'Etapa', 'Código da CREDE', 'CREDE', 'Município', 'Edição']
+CHAVES_CREDE = ['Rede', 'Componente', 'Etapa', 'Código da CREDE', 'CREDE', 'Edição']
+CHAVES_ESTADO = ['Rede', 'Componente', 'Etapa', 'Edição']
+
+# Chaves das células de cada nível agregado (também as dos agregados por município e por CREDE das escolas)
+CHAVES_NIVEIS = {'municipio': CHAVES_MUNICIPIO, 'crede': CHAVES_CREDE, 'estado': CHAVES_ESTADO}
+
+# Chaves dos índices dos cubos (o código da CREDE acompanha o nome e não é filtrado)
+CHAVES_CUBOS = {'crede': ['Rede', 'Componente', 'Etapa', 'CREDE', 'Edição'],
+                'estado': CHAVES_ESTADO}
+
+# Médias ponderadas pelo Nº de Alunos Avaliados; a participação é recalculada de previstos / avaliados
+MEDIDAS_PONDERADAS = ['Proficiência Média'] + [c for c in COLUNAS_PERCENTUAIS if c != 'Participação (%)']
+PESO = 'Nº de Alunos Avaliados'
+
+# Índice das linhas da tabela municipal com a CREDE entre as chaves (tabela exibida na visão por CREDE)
+CHAVES_INDICE_CREDE = ['Rede', 'Componente', 'Etapa', 'CREDE', 'Município', 'Edição']
+
+
+def _coluna_peso(coluna):
+    return f'{coluna} (peso)'
+
+## Funcao que soma, por célula das `chaves`, as medidas multiplicadas pelo peso e os pesos de cada medida
+# (linhas sem a medida, como os padrões de outras etapas, não entram no peso dela)
+def somas_ponderadas(dados, chaves):
+    medidas = [c for c in MEDIDAS_PONDERADAS if c in dados.columns]
+    peso = dados[PESO].astype('float64').fillna(0).to_numpy()[:, None]
+    valores = dados[medidas].to_numpy('float64')
+    presentes = ~np.isnan(valores)
+
+    somas = pd.DataFrame(np.where(presentes, valores * peso, 0), columns=medidas, index=dados.index)
+    somas[[_coluna_peso(c) for c in medidas]] = np.where(presentes, peso, 0)
+    somas[COLUNAS_CONTAGENS] = dados[COLUNAS_CONTAGENS].astype('float64')
+    somas['Nº de Linhas'] = 1
+    somas[chaves] = dados[chaves]
+    return somas.groupby(chaves, observed=True, sort=True).sum()
+
+## Funcao que converte as somas de um nível nas medidas (médias ponderadas e participação recalculada)
+def medidas_ponderadas(somas):
+    medidas = [c for c in MEDIDAS_PONDERADAS if c in somas.columns]
+    pesos = somas[[_coluna_peso(c) for c in medidas]].to_numpy()
+    tabela = somas.drop(columns=[_coluna_peso(c) for c in medidas])
+    tabela[medidas] = somas[medidas].to_numpy() / np.where(pesos > 0, pesos, np.nan)
+    previstos = tabela['Nº de Alunos Previstos']
+    tabela['Participação (%)'] = tabela['Nº de Alunos Avaliados'] / previstos.where(previstos > 0) * 100
+    return tabela.reset_index()
+
+## Funcao que materializa os três níveis em uma passada vetorizada: somas ponderadas por município
+# (um único groupby das linhas) e, a partir delas, por CREDE e pelo estado (groupby das somas, bem menores)
+# Devolve {'municipio', 'crede', 'estado'}: tabelas com as medidas e as contagens somadas de cada célula
+def constroi_hierarquia(dados):
+    municipio = somas_ponderadas(dados, CHAVES_MUNICIPIO)
+    crede = municipio.groupby(CHAVES_CREDE, observed=True, sort=True).sum()
+    estado = crede.groupby(CHAVES_ESTADO, observed=True, sort=True).sum()
+    return {'municipio': medidas_ponderadas(municipio), 'crede': medidas_ponderadas(crede), 'estado': medidas_ponderadas(estado)}
+
+## Funcao que devolve os cubos da CREDE e do estado (mesma interface do CuboAgregados das páginas), construídos uma vez
+# por versão dos dados via armazém: obtem_derivado(arquivo, colunas, 'hierarquia', cubos_hierarquia).
+# No nível município (uma linha por célula na tabela municipal) as páginas seguem com o cubo da própria tabela
+def cubos_hierarquia(dados):
+    niveis = constroi_hierarquia(dados)
+    return {nivel: CuboAgregados(niveis[nivel], CHAVES_CUBOS[nivel], pre_agregado=True) for nivel in ['crede', 'estado']}
+
+class CuboLinhas:
+    # Cubo de um nível agregado (CREDE / estado sobre as linhas dos municípios, ou município / CREDE sobre as linhas das
+    # escolas) com o filtro de proficiência aplicado às linhas, a mesma regra da tabela exibida (e não às médias das
+    # células). Se o intervalo não retira nenhuma linha, as células são as do cubo materializado; senão, só as linhas
+    # selecionadas são somadas direto no nível (mesmas médias ponderadas, completadas com a faixa do padrão e os rótulos
+    # como as do cubo).
+    # Mesma interface do CuboAgregados; construído a cada rerun sobre o cubo e o índice já prontos (custo nulo)
+
+    def __init__(self, cubo, indice, nivel):
+        self.cubo, self.indice, self.nivel = cubo, indice, nivel
+
+    def seleciona(self, filtros, proficiencia=None, colunas=None):
+        if proficiencia is not None:
+            linhas = self.indice.seleciona(filtros, proficiencia)
+            if len(linhas) < self.indice.conta(filtros):
+                if linhas.empty:
+                    return self.cubo.seleciona(filtros, colunas=colunas).iloc[:0]
+                celulas = completa_cubo(medidas_ponderadas(somas_ponderadas(linhas, CHAVES_NIVEIS[self.nivel])))
+                return celulas[colunas] if colunas is not None else celulas
+        return self.cubo.seleciona(filtros, colunas=colunas)
+
+## Funcao que acrescenta aos cubos as células das linhas `novas` (uma edição nova, via armazém): as células da CREDE e do
+# estado são de uma única edição, então só as linhas novas são agregadas
+def acrescenta_hierarquia(cubos, dados, novas):
+    niveis = constroi_hierarquia(novas)
+    return {nivel: cubo.acrescenta(niveis[nivel], pre_agregado=True) for nivel, cubo in cubos.items()}
+
+## Funcao que devolve o índice das linhas da tabela municipal filtrável por CREDE
+def indice_crede(dados):
+    return IndiceFiltro(dados, CHAVES_INDICE_CREDE)
+
+## Funcao que acrescenta ao índice as linhas novas, já concatenadas ao fim de `dados`
+def acrescenta_indice_crede(indice, dados, novas):
+    return indice.acrescenta(dados)
@@ -0,0 +1,92 @@
+import copy                                         # Lib nativa para copiar o índice ao acrescentar linhas
+
+import numpy as np                                  # Lib para operações vetorizadas
+import pandas as pd                                 # Lib para manipução e tratamento de dados, tabelas e dataframes
+
+
+## ------------------------ ÍNDICE DOS FILTROS ------------------------ ##
+
+# Chaves dos filtros de cada tabela (as que não existirem na tabela são ignoradas)
+CHAVES_FILTRO = ['Rede', 'Componente', 'Etapa', 'Município', 'Edição']
+
+
+class IndiceFiltro:
+    # Índice da combinação de chaves categóricas -> posições das linhas, construído uma vez por versão dos dados.
+    # Os códigos das categorias de cada chave são combinados em um único inteiro (base mista) e as linhas
+    # ordenadas por ele; uma seleção vira buscas binárias (searchsorted) + um único `take`, sem varrer as colunas.
+
+    def __init__(self, dados, chaves=CHAVES_FILTRO):
+        self.dados = dados
+        self.chaves = [c for c in chaves if c in dados.columns]
+
+        chave_linhas = self._combina(dados)
+        self._ordem = np.argsort(chave_linhas, kind='stable')
+        self._chaves_ordenadas = chave_linhas[self._ordem]
+
+    def _combina(self, dados):
+        # Chave inteira (base mista dos códigos das categorias) de cada linha
+        self.categorias = {}
+        chave_linhas = np.zeros(len(dados), dtype=np.int64)
+        self._pesos = []
+        peso = 1
+        for coluna in reversed(self.chaves):
+            serie = dados[coluna] if isinstance(dados[coluna].dtype, pd.CategoricalDtype) else dados[coluna].astype('category')
+            self.categorias[coluna] = serie.cat.categories
+            chave_linhas += serie.cat.codes.to_numpy(np.int64) * peso  # Código -1 (ausente) nunca é consultado
+            self._pesos.insert(0, peso)
+            peso *= len(serie.cat.categories) + 1
+        return chave_linhas
+
+    def acrescenta(self, dados):
+        # Índice de `dados` = as linhas já indexadas seguidas de linhas novas (esquema.concatena_tabelas). As chaves são
+        # recombinadas (vetorizado), mas só as linhas novas são ordenadas e depois intercaladas na ordem das antigas
+        antigas = len(self.dados)
+        indice = copy.copy(self)
+        indice.dados = dados
+        chave_linhas = indice._combina(dados)
+
+        chaves_antigas = chave_linhas[self._ordem]
+        if np.any(chaves_antigas[1:] < chaves_antigas[:-1]):   # Categorias antigas reordenadas: ordena tudo de novo
+            indice._ordem = np.argsort(chave_linhas, kind='stable')
+        else:
+            novas = antigas + np.argsort(chave_linhas[antigas:], kind='stable')
+            indice._ordem = np.insert(self._ordem, np.searchsorted(chaves_antigas, chave_linhas[novas], side='right'), novas)
+        indice._chaves_ordenadas = chave_linhas[indice._ordem]
+        return indice
+
+    def _codigos(self, coluna, valor):
+        categorias = self.categorias[coluna]
+        if valor is None:
+            return np.arange(len(categorias))
+        valores = [valor] if isinstance(valor, str) or not hasattr(valor, '__iter__') else list(valor)
+        codigos = categorias.get_indexer(valores) if len(valores) else np.array([], dtype=np.intp)
+        return codigos[codigos >= 0]
+
+    def posicoes(self, filtros):
+        # filtros: {chave: valor ou lista de valores}; chaves ausentes não filtram
+        chaves = np.zeros(1, dtype=np.int64)
+        for coluna, peso in zip(self.chaves, self._pesos):
+            codigos = self._codigos(coluna, filtros.get(coluna))
+            chaves = (chaves[:, None] + codigos[None, :].astype(np.int64) * peso).ravel()
+
+        inicio = np.searchsorted(self._chaves_ordenadas, chaves, side='left')
+        fim = np.searchsorted(self._chaves_ordenadas, chaves, side='right')
+        tamanhos = fim - inicio
+        total = tamanhos.sum()
+        if total == 0:
+            return np.array([], dtype=np.intp)
+
+        # Concatena os intervalos [inicio, fim) de todas as combinações sem laço em Python
+        deslocamento = np.repeat(inicio - np.cumsum(tamanhos) + tamanhos, tamanhos)
+        return np.sort(self._ordem[deslocamento + np.arange(total)])  # Mantém a ordem original das linhas
+
+    def conta(self, filtros):
+        return len(self.posicoes(filtros))
+
+    def seleciona(self, filtros, proficiencia=None, colunas=None):
+        dados = self.dados.take(self.posicoes(filtros))
+        if colunas is not None:
+            dados = dados[colunas]
+        if proficiencia is not None:
+            dados = dados[dados['Proficiência Média'].between(proficiencia[0], proficiencia[1])]
+        return dados
@@ -0,0 +1,117 @@
+import argparse                                     # Lib nativa para a linha de comando da ingestão
+import hashlib                                      # Lib nativa para gerar a versão (hash) do acréscimo
+import time                                         # Módulo para medir o tempo da ingestão
+
+import pandas as pd                                 # Lib para manipução e tratamento de dados, tabelas e dataframes
+import pyarrow as pa                                # Lib para tabelas colunares (Arrow)
+import pyarrow.dataset as ds                        # Lib para leitura / escrita de datasets Parquet particionados
+
+from spaece.carregamento import le_memoria, ARQUIVO_CE, ARQUIVO_MUN
+from spaece.esquema import COLUNAS_PERCENTUAIS, COLUNAS_CONTAGENS
+from spaece.indice import CHAVES_FILTRO
+from spaece.snapshot import (PARTICOES, PREFIXO_ACRESCIMO, _caminho_dataset, _grava_metadados, _le_metadados,
+                             constroi_snapshot, edicoes_snapshot, existe_snapshot)
+
+
+## ------------------------ INGESTÃO DE UMA EDIÇÃO NOVA ------------------------ ##
+
+# Uma edição nova entra no snapshot só com as suas linhas: os arquivos Parquet existentes não são regravados.
+# Os metadados registram a versão base (CSV de origem) e a cadeia de acréscimos {edicoes, versao}; a versão do
+# snapshot passa a ser 'base+acréscimo1+...'. O armazém (spaece/armazem.py) reconhece a cadeia, lê só as linhas das
+# edições novas e atualiza índice e cubos; os caches de etapas / figuras das edições anteriores seguem válidos
+# (chaveados pela versão das edições selecionadas, snapshot.versao_edicoes).
+
+TABELAS = {'ce': ARQUIVO_CE, 'mun': ARQUIVO_MUN}
+
+
+## Funcao que devolve as combinações (Rede, Componente, Etapa) já particionadas no snapshot
+def _particoes(dataset):
+    return {tuple(str(ds.get_partition_keys(fragmento.partition_expression)[c]) for c in PARTICOES)
+            for fragmento in dataset.get_fragments()}
+
+## Funcao que valida as linhas novas contra o snapshot e devolve a lista de problemas encontrados (vazia se válidas)
+def valida_edicao(novas, colunas, edicoes_existentes, particoes):
+    faltantes = [c for c in colunas if c not in novas.columns]
+    sobrando = [c for c in novas.columns if c not in colunas]
+    if faltantes or sobrando:
+        return [f'Colunas diferentes das do snapshot (faltando: {faltantes}, sobrando: {sobrando})']
+
+    problemas = []
+    if novas['Edição'].isna().any():
+        problemas.append('Há linhas sem Edição')
+    repetidas = sorted({int(e) for e in novas['Edição'].dropna().unique()} & set(edicoes_existentes))
+    if repetidas:
+        problemas.append(f'Edições já presentes no snapshot: {repetidas} (para corrigir uma edição, reconstrua o snapshot)')
+
+    combinacoes = {tuple(str(v) for v in linha) for linha in novas[PARTICOES].drop_duplicates().itertuples(index=False)}
+    desconhecidas = sorted(combinacoes - particoes)
+    if desconhecidas:
+        problemas.append(f'Combinações de {"/".join(PARTICOES)} ausentes do snapshot: {desconhecidas}')
+
+    chaves = [c for c in CHAVES_FILTRO if c in novas.columns]
+    duplicadas = int(novas.duplicated(chaves).sum())
+    if duplicadas:
+        problemas.append(f'{duplicadas} linhas repetidas para as chaves {chaves}')
+
+    for coluna in [c for c in COLUNAS_PERCENTUAIS if c in novas.columns]:
+        fora = int((novas[coluna].notna() & ~novas[coluna].between(0, 100)).sum())
+        if fora:
+            problemas.append(f'{fora} valores fora de 0 a 100 em {coluna}')
+    for coluna in [c for c in COLUNAS_CONTAGENS if c in novas.columns]:
+        negativos = int((novas[coluna] < 0).sum())
+        if negativos:
+            problemas.append(f'{negativos} valores negativos em {coluna}')
+    return problemas
+
+## Funcao que acrescenta ao snapshot da tabela `arquivo` as linhas de uma ou mais edições novas (CSV no formato das
+# tabelas de memória). Constrói o snapshot antes, se ainda não existir. Devolve a nova versão do snapshot
+def acrescenta_edicao(arquivo, caminho_csv):
+    if not existe_snapshot(arquivo):
+        constroi_snapshot(arquivo)
+    caminho = _caminho_dataset(arquivo)
+    metadados = _le_metadados(caminho)
+    dataset = ds.dataset(caminho, format='parquet', partitioning='hive')
+
+    existentes = edicoes_snapshot(arquivo)
+    novas = le_memoria(caminho_csv)                 # Mesma leitura (esquema e nomes normalizados) do snapshot
+    problemas = valida_edicao(novas, metadados['colunas'], existentes, _particoes(dataset))
+    if problemas:
+        raise ValueError(f'Edição rejeitada para {arquivo}:\n- ' + '\n- '.join(problemas))
+
+    # Tipos dos arquivos existentes (as partições vão como texto para a pasta de cada Rede / Componente / Etapa)
+    esquema = dataset.schema.remove_metadata()
+    novas = novas[esquema.names].astype({c: object for c in novas.columns if isinstance(novas[c].dtype, pd.CategoricalDtype)})
+    try:
+        tabela = pa.Table.from_pandas(novas, schema=esquema, preserve_index=False)
+    except (pa.ArrowInvalid, pa.ArrowTypeError) as erro:
+        raise ValueError(f'Edição rejeitada para {arquivo}: valores fora dos tipos do snapshot ({erro}); reconstrua o snapshot') from erro
+
+    edicoes = sorted(int(e) for e in novas['Edição'].unique())
+    with open(caminho_csv, 'rb') as f:
+        versao = hashlib.sha256(f.read()).hexdigest()[:16]
+    ds.write_dataset(tabela, caminho, format='parquet',
+                     partitioning=PARTICOES, partitioning_flavor='hive',
+                     basename_template=f'{PREFIXO_ACRESCIMO}{"-".join(map(str, edicoes))}-{versao}-{{i}}.parquet',
+                     existing_data_behavior='overwrite_or_ignore')
+
+    # Só depois dos arquivos gravados as edições passam a ser visíveis (metadados substituídos de uma vez)
+    acrescimos = metadados.get('acrescimos', []) + [{'edicoes': edicoes, 'versao': versao}]
+    versao_base = metadados.get('versao_base', metadados['versao'])
+    _grava_metadados(caminho, {**metadados, 'versao_base': versao_base, 'acrescimos': acrescimos,
+                               'versao': '+'.join([versao_base] + [a['versao'] for a in acrescimos]),
+                               'edicoes': sorted(existentes + edicoes)})
+    return _le_metadados(caminho)['versao']
+
+
+## ------------------------ LINHA DE COMANDO ------------------------ ##
+
+# Uso: python -m spaece.ingestao --tabela mun --csv nova_edicao.csv
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Acrescenta uma edição nova ao snapshot de uma tabela de memória do SPAECE')
+    parser.add_argument('--tabela', choices=sorted(TABELAS), required=True, help='Tabela de memória (ce ou mun)')
+    parser.add_argument('--csv', required=True, help='CSV com as linhas da edição nova (mesmas colunas da tabela de memória)')
+    args = parser.parse_args()
+
+    inicio = time.perf_counter()
+    versao = acrescenta_edicao(TABELAS[args.tabela], args.csv)
+    print(f'{args.csv} -> {_caminho_dataset(TABELAS[args.tabela])} (versão {versao}, {time.perf_counter() - inicio:.2f} s)')
@@ -0,0 +1,103 @@
+import pandas as pd                                 # Lib para manipução e tratamento de dados, tabelas e dataframes
+import streamlit as st                              # Lib para construção de deashboards interativos
+
+from spaece.artefatos import obtem_artefato, le_artefato, FORMATOS  # Arquivos de download gerados sob demanda
+from spaece.exportacao_lote import inicia_exportacao, estado_exportacao, FORMATOS_LOTE  # Exportação de todos os municípios em segundo plano
+from spaece.medicao import trecho                   # Tempos de cada estágio do rerun (opcional)
+from spaece.paginacao import TabelaPaginada, TAMANHOS_PAGINA        # Tabela paginada (só a página visível é enviada ao navegador)
+from spaece.renderizacao import cache_da_sessao     # Resultados da sessão descartados quando os filtros mudam
+
+
+## ------------------------ COMPONENTES COMUNS ÀS PÁGINAS ------------------------ ##
+
+# Downloads, tabela paginada e painel de tempos usados por todas as páginas (único módulo do pacote que usa o Streamlit;
+# `nome` distingue as chaves dos widgets e da sessão de cada etapa / página)
+
+DOWNLOADS = [('csv', 'Formato em CSV :page_facing_up:'), ('xlsx', 'Formato em XSLS :page_with_curl:'),
+             ('parquet', 'Formato em Parquet :card_file_box:'), ('arrow', 'Formato em Arrow IPC :zap:')]  # Parquet / Arrow: binários tipados, menores e mais rápidos de gerar
+
+
+# Funcao para dowload de arquivos
+# Os arquivos só são gerados quando o usuário pede (botão "Preparar"), e não a cada interação; ficam no armazém
+# de artefatos (spaece/artefatos.py), então o mesmo conteúdo pedido de novo, nesta ou em outra sessão, não é regerado
+def exibe_downloads(dados, arquivo, nome, chave):
+    preparados = cache_da_sessao(st.session_state, f'downloads_{nome}', chave)  # Descartados quando filtros / colunas mudam
+    for formato, rotulo in DOWNLOADS:
+        if formato not in preparados and st.button(f'Preparar {rotulo}', key=f'preparar_{formato}_{nome}'):
+            with st.spinner('Gerando o arquivo...'):
+                preparados[formato] = obtem_artefato(dados, formato)
+        conteudo = le_artefato(preparados[formato]) if formato in preparados else None
+        if conteudo is not None:
+            st.download_button(rotulo, data = conteudo, file_name = f'{arquivo}.{FORMATOS[formato]["extensao"]}', mime = FORMATOS[formato]['mime'],
+                               key=f'download_{formato}_{nome}')
+        elif formato in preparados:
+            del preparados[formato]                 # Removido pelo limite de espaço: volta a oferecer o botão "Preparar"
+
+# Funcao que exibe a tabela paginada: só a página visível (e só as colunas selecionadas) é enviada ao navegador.
+# A busca em uma coluna e a ordenação são feitas aqui, sobre as posições das linhas (spaece/paginacao.py),
+# e guardadas na sessão: trocar de página não refaz a busca nem a ordenação
+def exibe_tabela(dados, colunas, nome, chave):
+    if not colunas:
+        st.warning('Selecione ao menos uma coluna.', icon="⚠️")
+        return
+    coluna_busca, coluna_termo, coluna_ordem, coluna_sentido = st.columns([2, 3, 2, 1])
+    busca_em = coluna_busca.selectbox('Buscar na coluna', colunas, key=f'busca_coluna_{nome}')
+    termo = coluna_termo.text_input('Buscar', key=f'busca_termo_{nome}', placeholder='Digite parte do valor')
+    ordem = coluna_ordem.selectbox('Ordenar por', ['Ordem original'] + colunas, key=f'ordem_{nome}')
+    decrescente = coluna_sentido.checkbox('Decrescente', key=f'decrescente_{nome}')
+
+    visoes = cache_da_sessao(st.session_state, f'tabela_{nome}', chave)  # Descartadas quando os filtros mudam
+    chave_visao = (busca_em, termo, ordem, decrescente)
+    if chave_visao not in visoes:
+        visao = TabelaPaginada(dados).busca(busca_em, termo)
+        if ordem != 'Ordem original':
+            visao = visao.ordena(ordem, not decrescente)
+        visoes.clear()
+        visoes[chave_visao] = visao
+        st.session_state[f'pagina_{nome}'] = 1     # Nova busca / ordenação volta para a primeira página
+    visao = visoes[chave_visao]
+
+    coluna_tamanho, coluna_pagina, _ = st.columns([1, 1, 4])
+    tamanho = coluna_tamanho.selectbox('Linhas por página', TAMANHOS_PAGINA, key=f'tamanho_{nome}')
+    paginas = visao.paginas(tamanho)
+    if st.session_state.get(f'pagina_{nome}', 1) > paginas:
+        st.session_state[f'pagina_{nome}'] = paginas
+    numero = coluna_pagina.number_input(f'Página (de {paginas})', min_value=1, max_value=paginas, step=1, key=f'pagina_{nome}')
+
+    with trecho('envio da tabela'):
+        st.dataframe(visao.pagina(numero, tamanho, colunas), hide_index = True)
+    encontradas = f' (:blue[{len(visao)}] encontradas na busca)' if len(visao) != len(dados) else ''
+    st.markdown(f'A tabela possui :blue[{len(dados)}] linhas{encontradas} e :blue[{len(colunas)}] colunas.')
+
+# Funcao que exibe a exportação em lote (todos os municípios, etapas e componentes): formato, início, progresso e download.
+# A exportação roda em segundo plano; a sessão guarda só o identificador (chave `exportacao_lote_{nome}`)
+def exibe_exportacao_lote(nome):
+    formato_lote = st.selectbox('Formato', list(FORMATOS_LOTE), format_func=FORMATOS_LOTE.get, key=f'formato_lote_{nome}')
+    exportacao = estado_exportacao(st.session_state.get(f'exportacao_lote_{nome}'))
+
+    if exportacao is None or exportacao['estado'] != 'executando':
+        if st.button('Iniciar exportação', key=f'iniciar_lote_{nome}'):
+            st.session_state[f'exportacao_lote_{nome}'] = inicia_exportacao(formato_lote)
+            exportacao = estado_exportacao(st.session_state[f'exportacao_lote_{nome}'])
+
+    if exportacao is not None and exportacao['estado'] == 'executando':
+        st.progress(exportacao['concluidas'] / exportacao['total'] if exportacao['total'] else 0.0,
+                    text=f'{exportacao["concluidas"]} de {exportacao["total"] or "?"} CREDEs exportadas')
+        st.button('Atualizar progresso', key=f'atualizar_lote_{nome}')  # Cada clique refaz a página com o progresso atual
+    elif exportacao is not None and exportacao['estado'] == 'erro':
+        st.error(f'Falha na exportação: {exportacao["erro"]}', icon="🚨")
+    elif exportacao is not None:
+        conteudo = le_artefato(exportacao['caminho'])
+        if conteudo is not None:
+            st.download_button(f'Baixar exportação ({FORMATOS_LOTE[exportacao["formato"]]})', data = conteudo,
+                               file_name = f'spaece_municipios_{exportacao["formato"]}.zip', mime = 'application/zip', key=f'download_lote_{nome}')
+
+## Funcao que exibe no sidebar os tempos do rerun encerrado (`medicao` de finaliza_medicao)
+def exibe_medicao(medicao):
+    with st.sidebar.expander('Tempos deste rerun :stopwatch:'):
+        st.markdown(f'Total: **{medicao["total_ms"]:.1f} ms**')
+        trechos = pd.DataFrame(medicao['trechos'], columns=['nome', 'nivel', 'inicio_ms', 'duracao_ms'])
+        # Trechos internos indentados (espaços não separáveis: espaços comuns no início da célula são descartados na exibição)
+        trechos['nome'] = ['\u00a0\u00a0' * nivel + nome for nome, nivel in zip(trechos['nome'], trechos['nivel'])]
+        st.dataframe(trechos[['nome', 'inicio_ms', 'duracao_ms']].rename(columns={'nome': 'Trecho', 'inicio_ms': 'Início (ms)', 'duracao_ms': 'Duração (ms)'}),
+                     hide_index = True)
@@ -0,0 +1,83 @@
+import contextlib                                   # Lib nativa para o gerenciador de contexto nulo (medição desligada)
+import json                                         # Lib nativa para o registro em JSON lines
+import os                                           # Lib nativa para variáveis de ambiente
+import threading                                    # Lib nativa para a medição de cada sessão (thread) e a trava do arquivo
+import time                                         # Módulo para medição de tempo
+
+
+## ------------------------ CONFIGURAÇÕES ------------------------ ##
+
+# Medição dos estágios de cada rerun (carga, filtragem, agregação, figuras, tabela, conversões para download).
+# Desligada por padrão: `trecho()` devolve um gerenciador de contexto nulo, sem relógio nem alocação.
+# SPAECE_MEDICAO=1 liga a medição e o painel no sidebar; SPAECE_ARQUIVO_MEDICAO grava um registro JSON por rerun
+# (e também liga a medição, mesmo sem o painel)
+
+def medicao_ativa():
+    return painel_medicao() or bool(arquivo_medicao())
+
+def painel_medicao():
+    return os.environ.get('SPAECE_MEDICAO', '').lower() in ('1', 'true', 'sim')
+
+def arquivo_medicao():
+    return os.environ.get('SPAECE_ARQUIVO_MEDICAO')
+
+
+## ------------------------ MEDIÇÃO DE UM RERUN ------------------------ ##
+
+class Medicao:
+    # Trechos medidos em um rerun de uma página: nome, nível de aninhamento, início e duração (em ms, relativos ao rerun)
+
+    def __init__(self, pagina):
+        self.pagina = pagina
+        self.data = time.time()
+        self.trechos = []
+        self._inicio = time.perf_counter()
+        self._nivel = 0
+
+    @contextlib.contextmanager
+    def trecho(self, nome):
+        registro = {'nome': nome, 'nivel': self._nivel, 'inicio_ms': round((time.perf_counter() - self._inicio) * 1000, 3), 'duracao_ms': None}
+        self.trechos.append(registro)           # Na ordem de início (o trecho externo antes dos internos)
+        self._nivel += 1
+        inicio = time.perf_counter()
+        try:
+            yield registro
+        finally:
+            registro['duracao_ms'] = round((time.perf_counter() - inicio) * 1000, 3)
+            self._nivel -= 1
+
+    def registro(self):
+        return {'pagina': self.pagina, 'data': time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(self.data)),
+                'total_ms': round((time.perf_counter() - self._inicio) * 1000, 3), 'trechos': self.trechos}
+
+
+# Medição em andamento de cada thread: o Streamlit executa o script de cada sessão na sua própria thread,
+# então os módulos (etapas, artefatos) marcam seus trechos sem receber a medição como argumento
+_local = threading.local()
+_NULO = contextlib.nullcontext()
+_trava_arquivo = threading.Lock()
+
+## Funcao que inicia a medição do rerun da página (None quando desligada)
+def inicia_medicao(pagina):
+    _local.medicao = Medicao(pagina) if medicao_ativa() else None
+    return _local.medicao
+
+## Funcao que marca um trecho da medição em andamento (`with trecho('figuras'):`); sem custo quando desligada
+def trecho(nome):
+    medicao = getattr(_local, 'medicao', None)
+    return _NULO if medicao is None else medicao.trecho(nome)
+
+## Funcao que encerra a medição do rerun, grava o registro no arquivo JSON lines (se configurado) e o devolve
+def finaliza_medicao():
+    medicao = getattr(_local, 'medicao', None)
+    _local.medicao = None
+    if medicao is None:
+        return None
+    registro = medicao.registro()
+    arquivo = arquivo_medicao()
+    if arquivo:
+        linha = json.dumps(registro, ensure_ascii=False) + '\n'
+        with _trava_arquivo:                        # Sessões simultâneas gravam linhas inteiras, sem se misturar
+            with open(arquivo, 'a', encoding='utf-8') as f:
+                f.write(linha)
+    return registro
@@ -0,0 +1,34 @@
+import pandas as pd                                 # Lib para manipução e tratamento de dados, tabelas e dataframes
+
+
+## ------------------------ NORMALIZAÇÃO DOS NOMES ------------------------ ##
+
+# Palavras que não serão capitalizadas
+PALAVRAS_NAO_CAPITALIZADAS = ['da', 'de', 'do', 'das', 'dos', 'e']
+
+# Funcao para capitalizar nomes completos (aqui usar nos numicípios)
+def capitalizar_nome(nome_completo):
+    # Divide o nome completo em palavras
+    palavras = nome_completo.lower().split()
+
+    # Capitaliza todas as palavras que não estão na lista de palavras não capitalizadas
+    nome_capitalizado = ' '.join([palavra.capitalize() if palavra not in PALAVRAS_NAO_CAPITALIZADAS else palavra for palavra in palavras])
+
+    return nome_capitalizado
+
+## Funcao que aplica `funcao` uma vez por categoria (e não por linha) de uma coluna categórica
+def normaliza_categorias(serie, funcao):
+    if not isinstance(serie.dtype, pd.CategoricalDtype):
+        serie = serie.astype('category')
+    mapeamento = {categoria: funcao(categoria) for categoria in serie.cat.categories}
+    return serie.map(mapeamento).astype('category')  # Nomes que colidem após a normalização viram uma única categoria
+
+## Funcao de normalização das tabelas de memória, executada uma única vez por versão dos dados
+def normaliza_memoria(dados):
+    if 'Rede' in dados.columns:
+        dados['Rede'] = normaliza_categorias(dados['Rede'], str.capitalize)
+    if 'Município' in dados.columns:
+        dados['Município'] = normaliza_categorias(dados['Município'], capitalizar_nome)
+    if 'Escola' in dados.columns:
+        dados['Escola'] = normaliza_categorias(dados['Escola'], capitalizar_nome)
+    return dados
@@ -0,0 +1,60 @@
+import unicodedata                                  # Lib nativa para a busca sem acentos
+
+import numpy as np                                  # Lib para operações vetorizadas
+import pandas as pd                                 # Lib para manipução e tratamento de dados, tabelas e dataframes
+
+
+## ------------------------ TABELA PAGINADA ------------------------ ##
+
+# Tamanhos de página oferecidos nas páginas (linhas enviadas ao navegador por rerun)
+TAMANHOS_PAGINA = [25, 50, 100, 500]
+
+
+## Funcao que remove acentos e caixa de um texto (busca por "ceara" encontra "Ceará")
+def _texto_busca(valor):
+    return unicodedata.normalize('NFKD', str(valor)).encode('ascii', 'ignore').decode('ascii').lower()
+
+## Funcao que marca os valores de uma coluna que contêm `termo`, comparando cada valor distinto uma única vez
+def _contem(serie, termo):
+    codigos, distintos = pd.factorize(serie)        # Categóricas: só as categorias presentes; demais: valores distintos
+    casam = np.array([termo in _texto_busca(valor) for valor in distintos], dtype=bool)
+    return np.append(casam, False)[codigos]         # Código -1 (ausente) aponta para o False acrescentado
+
+
+class TabelaPaginada:
+    # Visão de um recorte da tabela (posições das linhas em `dados`) que nunca é materializado inteiro:
+    # a busca e a ordenação trabalham só com a coluna envolvida e reordenam as posições; a página
+    # exibida é o único `take` das linhas (e só das colunas pedidas)
+
+    def __init__(self, dados, posicoes=None):
+        self.dados = dados
+        self.posicoes = np.arange(len(dados)) if posicoes is None else np.asarray(posicoes)
+
+    def __len__(self):
+        return len(self.posicoes)
+
+    def _coluna(self, coluna):
+        return self.dados[coluna].take(self.posicoes)
+
+    def busca(self, coluna, termo):
+        # Linhas cujo valor da coluna contém o termo (sem diferenciar acentos e maiúsculas); termo vazio não filtra
+        termo = _texto_busca(termo).strip()
+        if not termo:
+            return self
+        return TabelaPaginada(self.dados, self.posicoes[_contem(self._coluna(coluna), termo)])
+
+    def ordena(self, coluna, crescente=True):
+        # Ordenação estável pela coluna (ordem das categorias, números ou texto); valores ausentes sempre no fim
+        codigos, _ = pd.factorize(self._coluna(coluna), sort=True)
+        ordem = np.lexsort((codigos if crescente else -codigos, codigos < 0))
+        return TabelaPaginada(self.dados, self.posicoes[ordem])
+
+    def paginas(self, tamanho):
+        return max(1, -(-len(self) // tamanho))
+
+    def pagina(self, numero, tamanho, colunas=None):
+        # Linhas da página `numero` (a partir de 1), já limitada ao número de páginas
+        numero = min(max(1, numero), self.paginas(tamanho))
+        posicoes = self.posicoes[(numero - 1) * tamanho:numero * tamanho]
+        dados = self.dados if colunas is None else self.dados[colunas]
+        return dados.take(posicoes)
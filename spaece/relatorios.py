@@ -0,0 +1,138 @@
+import argparse                                     # Lib nativa para a linha de comando
+import html                                         # Lib nativa para escapar textos no HTML
+import os                                           # Lib nativa para caminhos e variáveis de ambiente
+import time                                         # Módulo para medir a duração da geração
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from plotly.offline import get_plotlyjs            # Código do plotly.js (gravado uma única vez na pasta dos relatórios)
+
+from spaece.armazem import obtem_tabela, obtem_indice, obtem_cubo
+from spaece.carregamento import ARQUIVO_CE, ARQUIVO_MUN, COLUNAS_CE, COLUNAS_MUN
+from spaece.etapas import ETAPAS, REDES, COMPONENTES, calcula_etapas, etapa_avaliada, metricas_etapa
+from spaece.formatacao import formata_numero, formata_taxa, formata_proficiencia
+from spaece.graficos import graficos_etapa, titulos_etapa
+
+
+## ------------------------ CONFIGURAÇÕES ------------------------ ##
+
+# Intervalo de proficiência padrão das páginas ("Todas as proficiências médias")
+PROFICIENCIA = (0, 500)
+
+# Número padrão de processos da geração (um relatório por tarefa)
+PROCESSOS_RELATORIOS = os.cpu_count() or 1
+
+ESTILO = """
+body { font-family: sans-serif; margin: 2em auto; max-width: 1200px; color: #262730; }
+h1 { color: #548235; } h2 { border-bottom: 2px solid #548235; padding-bottom: .2em; margin-top: 2em; }
+.metricas { display: flex; gap: 2em; margin: 1em 0; }
+.metrica span { display: block; font-size: .85em; color: #666; } .metrica b { font-size: 1.8em; font-weight: normal; }
+.graficos { display: grid; grid-template-columns: 1fr 1fr; } .largo { grid-column: 1 / 3; }
+table { border-collapse: collapse; font-size: .8em; } td, th { border: 1px solid #ddd; padding: 2px 6px; }
+.tabela { max-height: 400px; overflow: auto; margin-bottom: 2em; }
+"""
+
+
+## Funcao que devolve o nome do arquivo do relatório (sem caracteres inválidos)
+def nome_relatorio(local):
+    return ''.join('_' if c in '/\\:*?"<>|' else c for c in local) + '.html'
+
+
+## ------------------------ MONTAGEM DO HTML ------------------------ ##
+
+## Funcao que monta o HTML de uma etapa / rede / componente: métricas, os quatro gráficos e a tabela
+def _secao(titulo, tabelas, figuras):
+    metricas = metricas_etapa(tabelas['dados'])
+    valores = [('População prevista', formata_numero(metricas['previstos'])),
+               ('População avaliada', formata_numero(metricas['avaliados'])),
+               ('Taxa de participação', f'{formata_taxa(metricas["participacao"])}%'),
+               ('Proficiência Média', formata_proficiencia(metricas['proficiencia']))]
+
+    # Figuras sem o plotly.js embutido (o arquivo é compartilhado por todos os relatórios)
+    div = lambda nome: figuras[nome].to_html(full_html=False, include_plotlyjs=False)
+    return (f'<h3>{html.escape(titulo)}</h3>'
+            '<div class="metricas">' + ''.join(f'<div class="metrica"><span>{r}</span><b>{html.escape(v)}</b></div>' for r, v in valores) + '</div>'
+            f'<div class="graficos"><div>{div("participacao")}</div><div>{div("proficiencia")}</div>'
+            f'<div class="largo">{div("padrao")}</div><div class="largo">{div("distribuicao")}</div></div>'
+            f'<div class="tabela">{tabelas["dados"].to_html(index=False, na_rep="", float_format=lambda x: f"{x:.2f}")}</div>')
+
+## Funcao que monta o relatório de um local (estado: municipio=None) com todas as etapas, redes e componentes
+# Mesmos cálculos (índice, cubo, calcula_etapas) e gráficos (graficos_etapa) das páginas do dashboard
+def relatorio_html(municipio=None, redes=REDES, componentes=COMPONENTES):
+    arquivo, colunas, nivel = (ARQUIVO_MUN, COLUNAS_MUN, 'municipio') if municipio else (ARQUIVO_CE, COLUNAS_CE, 'estado')
+    indice, cubo = obtem_indice(arquivo, colunas), obtem_cubo(arquivo, colunas)
+
+    secoes = {espec['etapa']: [] for espec in ETAPAS}
+    for rede in redes:
+        for componente in componentes:
+            filtros = {'Rede': rede, 'Componente': componente, 'Município': municipio} if municipio else {'Rede': rede, 'Componente': componente}
+            avaliadas = [espec for espec in ETAPAS if etapa_avaliada(espec, rede, componente)]
+            tabelas = calcula_etapas(indice, cubo, filtros, PROFICIENCIA, avaliadas)
+            for espec in avaliadas:
+                if tabelas[espec['etapa']]['dados'].empty:
+                    continue
+                figuras = graficos_etapa(espec, tabelas[espec['etapa']], componente, titulos_etapa(espec, rede, componente, municipio), nivel)
+                titulo = f'Rede {rede} - {componente}' if espec['mostra_componente'] else f'Rede {rede}'
+                secoes[espec['etapa']].append(_secao(titulo, tabelas[espec['etapa']], figuras))
+
+    titulo = f'SPAECE - {municipio}' if municipio else 'SPAECE - Estado do Ceará'
+    corpo = ''.join(f'<h2>{html.escape(etapa)}</h2>' + (''.join(partes) or '<p>Dados não encontrados.</p>') for etapa, partes in secoes.items())
+    return (f'<!DOCTYPE html><html lang="pt-BR"><head><meta charset="utf-8"><title>{html.escape(titulo)}</title>'
+            f'<script src="{"../" if municipio else ""}plotly.min.js"></script><style>{ESTILO}</style></head>'
+            f'<body><h1>{html.escape(titulo)}</h1>{corpo}'
+            '<p><i>Os dados são fornecidos pelo Centro de Políticas Públicas e Avaliação da Educação da Universidade Federal de Juiz de Fora (CAEd/UFJF).</i></p>'
+            '</body></html>')
+
+
+## ------------------------ GERAÇÃO EM LOTE ------------------------ ##
+
+## Funcao executada nos processos: grava o relatório de um local e devolve o caminho
+# Cada processo carrega as tabelas (e o índice / cubo) uma única vez, pelo armazém, e as reaproveita nas tarefas seguintes
+def gera_relatorio(destino, municipio=None, redes=REDES, componentes=COMPONENTES):
+    caminho = os.path.join(destino, 'municipios', nome_relatorio(municipio)) if municipio else os.path.join(destino, 'estado.html')
+    with open(caminho, 'w', encoding='utf-8') as f:
+        f.write(relatorio_html(municipio, redes, componentes))
+    return caminho
+
+## Funcao que gera os relatórios do estado e dos municípios em um pool de processos, com o índice (index.html)
+def gera_relatorios(destino, municipios=None, estado=True, processos=None, redes=REDES, componentes=COMPONENTES, progresso=None):
+    progresso = progresso or (lambda concluidos, total: None)
+    os.makedirs(os.path.join(destino, 'municipios'), exist_ok=True)
+    with open(os.path.join(destino, 'plotly.min.js'), 'w', encoding='utf-8') as f:
+        f.write(get_plotlyjs())
+
+    if municipios is None:
+        municipios = sorted(obtem_tabela(ARQUIVO_MUN, ['Município'])['Município'].unique())
+    locais = ([None] if estado else []) + list(municipios)
+
+    caminhos = []
+    with ProcessPoolExecutor(max_workers=processos or PROCESSOS_RELATORIOS) as executor:
+        tarefas = [executor.submit(gera_relatorio, destino, local, redes, componentes) for local in locais]
+        for concluidos, tarefa in enumerate(as_completed(tarefas), start=1):
+            caminhos.append(tarefa.result())
+            progresso(concluidos, len(tarefas))
+
+    links = (['<li><a href="estado.html">Estado do Ceará</a></li>'] if estado else []) + \
+            [f'<li><a href="municipios/{html.escape(nome_relatorio(m))}">{html.escape(m)}</a></li>' for m in municipios]
+    with open(os.path.join(destino, 'index.html'), 'w', encoding='utf-8') as f:
+        f.write(f'<!DOCTYPE html><html lang="pt-BR"><head><meta charset="utf-8"><title>Relatórios SPAECE</title><style>{ESTILO}</style></head>'
+                f'<body><h1>Relatórios SPAECE</h1><ul>{"".join(links)}</ul></body></html>')
+    return caminhos
+
+
+## ------------------------ LINHA DE COMANDO ------------------------ ##
+
+# Uso: python -m spaece.relatorios --destino relatorios [--municipios Fortaleza Sobral] [--sem-estado] [--processos 4]
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Gera os relatórios HTML estáticos do SPAECE (estado e municípios) sem o servidor do Streamlit')
+    parser.add_argument('--destino', default='relatorios', help='Pasta de saída')
+    parser.add_argument('--municipios', nargs='+', help='Municípios (padrão: todos)')
+    parser.add_argument('--sem-estado', action='store_true', help='Não gera o relatório do estado')
+    parser.add_argument('--redes', nargs='+', default=REDES, choices=REDES)
+    parser.add_argument('--componentes', nargs='+', default=COMPONENTES, choices=COMPONENTES)
+    parser.add_argument('--processos', type=int, default=PROCESSOS_RELATORIOS)
+    args = parser.parse_args()
+
+    inicio = time.perf_counter()
+    caminhos = gera_relatorios(args.destino, args.municipios, not args.sem_estado, args.processos, args.redes, args.componentes,
+                               lambda concluidos, total: print(f'\r{concluidos}/{total} relatórios', end='', flush=True))
+    print(f'\n{len(caminhos)} relatórios em {args.destino} ({time.perf_counter() - inicio:.2f} s)')
@@ -0,0 +1,24 @@
+import os                                           # Lib nativa para variáveis de ambiente
+
+
+## ------------------------ MODO DE RENDERIZAÇÃO DAS ETAPAS ------------------------ ##
+
+# 'sob_demanda': só a etapa selecionada é calculada, desenhada e convertida para download (as demais quando selecionadas)
+# 'abas': todas as etapas em abas (st.tabs), calculadas a cada rerun mesmo sem estarem visíveis
+MODOS_ETAPAS = ['sob_demanda', 'abas']
+MODO_ETAPAS = 'sob_demanda'
+
+
+def modo_etapas():
+    modo = os.environ.get('SPAECE_MODO_ETAPAS', MODO_ETAPAS)
+    return modo if modo in MODOS_ETAPAS else MODO_ETAPAS
+
+
+## Funcao que devolve o dicionário da sessão com os resultados já calculados para os filtros `chave`
+# (etapas abertas uma vez não são recalculadas ao voltar para elas; o conteúdo é descartado quando os filtros mudam)
+def cache_da_sessao(estado, nome, chave):
+    entrada = estado.get(nome)
+    if entrada is None or entrada['chave'] != chave:
+        entrada = {'chave': chave, 'valores': {}}
+        estado[nome] = entrada
+    return entrada['valores']
@@ -0,0 +1,191 @@
+import argparse                                     # Lib nativa para a linha de comando do construtor
+import json                                         # Lib nativa para gravar os metadados do snapshot
+import numbers                                      # Lib nativa para reconhecer filtros numéricos
+import os                                           # Lib nativa para caminhos e variáveis de ambiente
+import shutil                                       # Lib nativa para descartar o dataset anterior
+import threading                                    # Lib nativa para travas entre sessões simultâneas
+import time                                         # Módulo para medir o tempo de construção
+
+import pyarrow as pa                                # Lib para tabelas colunares (Arrow)
+import pyarrow.dataset as ds                        # Lib para leitura / escrita de datasets Parquet particionados
+
+from spaece.carregamento import carrega_memoria, versao_memoria, ARQUIVO_CE, ARQUIVO_MUN
+from spaece.esquema import aplica_esquema, COLUNAS_CONTAGENS
+from spaece.normalizacao import normaliza_memoria
+
+
+## ------------------------ CONFIGURAÇÕES ------------------------ ##
+
+# Colunas usadas para particionar os datasets (uma pasta por Rede / Componente / Etapa)
+PARTICOES = ['Rede', 'Componente', 'Etapa']
+
+# Pasta padrão dos snapshots (os dashboards só leem os snapshots se a pasta existir)
+DIRETORIO_SNAPSHOT = 'snapshot'
+
+# Prefixo dos arquivos de edições acrescentadas ao snapshot depois da construção (spaece/ingestao.py)
+PREFIXO_ACRESCIMO = 'edicao-'
+
+
+def diretorio_snapshot():
+    return os.environ.get('SPAECE_DIRETORIO_SNAPSHOT', DIRETORIO_SNAPSHOT)
+
+def _caminho_dataset(arquivo, diretorio=None):
+    return os.path.join(diretorio or diretorio_snapshot(), os.path.splitext(arquivo)[0])
+
+def _le_metadados(caminho):
+    try:
+        with open(os.path.join(caminho, '_metadados.json'), encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def _grava_metadados(caminho, metadados):
+    # Grava em um arquivo temporário e substitui: quem lê nunca encontra metadados pela metade
+    with open(os.path.join(caminho, '_metadados.json.tmp'), 'w', encoding='utf-8') as f:
+        json.dump(metadados, f, ensure_ascii=False)
+    os.replace(os.path.join(caminho, '_metadados.json.tmp'), os.path.join(caminho, '_metadados.json'))
+
+
+## ------------------------ CONSTRUÇÃO ------------------------ ##
+
+## Funcao que converte uma tabela de memória (CSV) em um dataset Parquet particionado
+def constroi_snapshot(arquivo, diretorio=None):
+    dados = carrega_memoria(arquivo)
+    caminho = _caminho_dataset(arquivo, diretorio)
+    # O dataset é gravado inteiro em uma pasta nova: partições que não existem mais no CSV e edições acrescentadas
+    # depois (spaece/ingestao.py) saem junto com o dataset antigo; o CSV de origem passa a ser a referência
+    temporario = f'{caminho}.{threading.get_ident()}.tmp'
+    shutil.rmtree(temporario, ignore_errors=True)
+
+    # Contagens gravadas com pelo menos 32 bits (o Parquet guarda INT32 de qualquer forma): edições acrescentadas
+    # depois com mais alunos continuam cabendo no tipo do dataset; a leitura volta a compactá-las
+    tabela = pa.Table.from_pandas(dados, preserve_index=False)
+    for coluna in [c for c in COLUNAS_CONTAGENS if c in tabela.column_names]:
+        if pa.types.is_integer(tabela.schema.field(coluna).type) and tabela.schema.field(coluna).type.bit_width < 32:
+            tabela = tabela.set_column(tabela.column_names.index(coluna), coluna, tabela.column(coluna).cast(pa.int32()))
+    ds.write_dataset(tabela, temporario, format='parquet', partitioning=PARTICOES, partitioning_flavor='hive')
+
+    # Metadados: versão do CSV de origem, ordem original das colunas (as partições vão para o fim no Parquet)
+    # e edições publicadas (a leitura ignora linhas de edições ainda não registradas aqui)
+    _grava_metadados(temporario, {'versao': versao_memoria(arquivo), 'colunas': list(dados.columns),
+                                  'edicoes': sorted(int(e) for e in dados['Edição'].unique())})
+
+    # Troca o dataset de uma vez (as sessões nunca leem um dataset pela metade)
+    antigo = f'{caminho}.{threading.get_ident()}.antigo'
+    if os.path.exists(caminho):
+        os.replace(caminho, antigo)
+    os.replace(temporario, caminho)
+    shutil.rmtree(antigo, ignore_errors=True)
+    return caminho
+
+
+## ------------------------ LEITURA ------------------------ ##
+
+# Leituras completas (sem filtros) já feitas, chave: (arquivo, colunas, versão). As leituras filtradas (ex.: só as
+# linhas de uma edição acrescentada) não ficam guardadas: cada combinação de filtros manteria um dataframe vivo
+# até o fim do processo. Uma leitura de versão nova descarta as guardadas das versões anteriores do mesmo arquivo
+_lidos = {}
+_trava = threading.Lock()
+
+## Funcao que informa se existe snapshot para a tabela de memória
+def existe_snapshot(arquivo):
+    return _le_metadados(_caminho_dataset(arquivo)) is not None
+
+## Funcao para ler apenas as partições e colunas necessárias do snapshot
+# filtros: dict {coluna de partição: valor ou lista de valores}, ex. {'Rede': 'ESTADUAL', 'Etapa': [...]}
+def le_snapshot(arquivo, colunas=None, filtros=None):
+    caminho = _caminho_dataset(arquivo)
+    metadados = _le_metadados(caminho)
+    if metadados is None:
+        raise FileNotFoundError(f'Snapshot não encontrado para {arquivo} em {caminho}')
+
+    filtros = filtros or {}
+    chave = (arquivo, tuple(colunas or ()), metadados['versao'])
+    with _trava:
+        for antiga in [k for k in _lidos if k[0] == arquivo and k[2] != metadados['versao']]:
+            del _lidos[antiga]
+        if not filtros and chave in _lidos:
+            return _lidos[chave]
+
+    # Só as edições registradas nos metadados (um acréscimo em gravação ainda não é visível)
+    expressao = ds.field('Edição').isin(metadados['edicoes']) if 'edicoes' in metadados else None
+    for coluna, valor in filtros.items():
+        condicao = ds.field(coluna).isin(list(valor)) if isinstance(valor, (list, tuple, set)) else ds.field(coluna) == valor
+        if isinstance(valor, (list, tuple, set)) and valor and all(isinstance(v, numbers.Real) for v in valor):
+            # Limites explícitos: o isin sozinho não descarta arquivos pelas estatísticas (ex.: só a edição acrescentada)
+            condicao = (ds.field(coluna) >= min(valor)) & (ds.field(coluna) <= max(valor)) & condicao
+        expressao = condicao if expressao is None else expressao & condicao
+
+    dataset = ds.dataset(caminho, format='parquet', partitioning='hive')
+    colunas = [c for c in metadados['colunas'] if colunas is None or c in colunas]
+    dados = dataset.to_table(columns=colunas, filter=expressao).to_pandas()
+    dados = normaliza_memoria(aplica_esquema(dados))  # Partições voltam como texto; snapshots antigos sem normalização
+
+    if not filtros:
+        with _trava:
+            for antiga in [k for k in _lidos if k[0] == arquivo and k[2] != metadados['versao']]:
+                del _lidos[antiga]
+            _lidos[chave] = dados
+    return dados
+
+
+## Funcao que devolve a versão dos dados: a gravada no snapshot, se existir, ou a do CSV em cache
+def versao_tabela(arquivo):
+    metadados = _le_metadados(_caminho_dataset(arquivo))
+    return metadados['versao'] if metadados else versao_memoria(arquivo)
+
+## Funcao que devolve a versão atual do snapshot e as edições acrescentadas a ele depois da versão `versao_anterior`
+# (edições = None quando não há snapshot ou a versão anterior não é um estado anterior dele: a tabela é relida inteira)
+def edicoes_acrescidas(arquivo, versao_anterior):
+    metadados = _le_metadados(_caminho_dataset(arquivo))
+    if metadados is None:
+        return versao_memoria(arquivo), None
+    acrescimos = metadados.get('acrescimos', [])
+    versao = metadados.get('versao_base', metadados['versao'])
+    for i in range(len(acrescimos) + 1):
+        if i:
+            versao = f'{versao}+{acrescimos[i - 1]["versao"]}'
+        if versao == versao_anterior:
+            return metadados['versao'], [e for acrescimo in acrescimos[i:] for e in acrescimo['edicoes']]
+    return metadados['versao'], None
+
+## Funcao que devolve a versão dos dados das edições pedidas: a versão base do snapshot mais a dos acréscimos que
+# contêm alguma delas. Chave dos caches de etapas / figuras: acrescentar uma edição não invalida os das anteriores
+def versao_edicoes(arquivo, edicoes):
+    metadados = _le_metadados(_caminho_dataset(arquivo))
+    if metadados is None or 'acrescimos' not in metadados:
+        return metadados['versao'] if metadados else versao_memoria(arquivo)
+    pedidas = {int(e) for e in edicoes}
+    return '+'.join([metadados['versao_base']] + [a['versao'] for a in metadados['acrescimos'] if pedidas & set(a['edicoes'])])
+
+## Funcao que devolve as edições presentes no snapshot (as registradas nos metadados ou, em snapshots antigos, as lidas do dataset)
+def edicoes_snapshot(arquivo):
+    caminho = _caminho_dataset(arquivo)
+    metadados = _le_metadados(caminho)
+    if metadados is None:
+        raise FileNotFoundError(f'Snapshot não encontrado para {arquivo} em {caminho}')
+    if 'edicoes' in metadados:
+        return list(metadados['edicoes'])
+    edicoes = ds.dataset(caminho, format='parquet', partitioning='hive').to_table(columns=['Edição']).column('Edição')
+    return sorted(int(e) for e in edicoes.unique().to_pylist())
+
+## Funcao para carregar a tabela de memória: do snapshot, se existir, ou do CSV (com cache)
+def carrega_tabela(arquivo, colunas=None):
+    if existe_snapshot(arquivo):
+        return le_snapshot(arquivo, colunas)
+    dados = carrega_memoria(arquivo)
+    return dados if colunas is None else dados[[c for c in dados.columns if c in colunas]]
+
+
+## ------------------------ LINHA DE COMANDO ------------------------ ##
+
+# Uso: python -m spaece.snapshot [--destino snapshot]
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Converte as tabelas de memória do SPAECE em datasets Parquet particionados')
+    parser.add_argument('--destino', default=diretorio_snapshot(), help='Pasta de saída dos snapshots')
+    args = parser.parse_args()
+
+    for arquivo in [ARQUIVO_CE, ARQUIVO_MUN]:
+        inicio = time.perf_counter()
+        caminho = constroi_snapshot(arquivo, args.destino)
+        print(f'{arquivo} -> {caminho} ({time.perf_counter() - inicio:.2f} s)')
@@ -0,0 +1,63 @@
+import functools
+import os
+import http.server                                  # Lib nativa para o servidor HTTP local (no lugar do GitHub)
+import threading
+
+import pytest
+
+from benchmarks.sintetico import gera_memoria
+from spaece import armazem, carregamento, snapshot
+from spaece.carregamento import CacheMemoria, ARQUIVO_MUN
+from spaece.snapshot import constroi_snapshot
+
+
+# Fixtures comuns: tabela municipal sintética publicada em um servidor HTTP local (sem acesso à rede), com o snapshot,
+# o cache das tabelas e o armazém do processo trocados por instâncias vazias durante o teste
+
+
+class _Silencioso(http.server.SimpleHTTPRequestHandler):
+
+    def log_message(self, *args):
+        pass
+
+@pytest.fixture
+def pasta_servidor(tmp_path, monkeypatch):
+    # Pasta servida (as tabelas publicadas são os CSVs gravados nela); revalidação a cada carga
+    pasta = tmp_path / 'servidor'
+    pasta.mkdir()
+    servidor = http.server.ThreadingHTTPServer(('127.0.0.1', 0), functools.partial(_Silencioso, directory=str(pasta)))
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+
+    monkeypatch.setenv('SPAECE_DIRETORIO_SNAPSHOT', str(tmp_path / 'snapshot'))
+    monkeypatch.setattr(carregamento, '_cache_padrao', CacheMemoria(url_base=f'http://127.0.0.1:{servidor.server_address[1]}',
+                                                                     diretorio=str(tmp_path / 'cache'), intervalo=0))
+    monkeypatch.setattr(armazem, '_armazem', {})
+    monkeypatch.setattr(snapshot, '_lidos', {})
+    yield pasta
+    servidor.shutdown()
+    servidor.server_close()
+
+@pytest.fixture
+def publica(pasta_servidor):
+    # Grava a tabela municipal na pasta servida. O servidor só responde com Last-Modified (resolução de segundos):
+    # cada publicação avança a data do arquivo, senão uma troca no mesmo segundo seria respondida com 304
+    publicacoes = []
+
+    def grava(dados):
+        caminho = pasta_servidor / ARQUIVO_MUN
+        dados.to_csv(caminho, index=False)
+        publicacoes.append(caminho)
+        os.utime(caminho, (os.path.getmtime(caminho) + 10 * len(publicacoes),) * 2)
+    return grava
+
+@pytest.fixture
+def dados_mun():
+    # Tabela municipal crua (como o CSV do GitHub) com 4 municípios em 4 CREDEs e 13 edições
+    return gera_memoria(1, municipios=4)
+
+@pytest.fixture
+def tabela_mun(publica, dados_mun):
+    # Tabela completa publicada e snapshot construído
+    publica(dados_mun)
+    constroi_snapshot(ARQUIVO_MUN)
+    return dados_mun
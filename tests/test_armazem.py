@@ -0,0 +1,95 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from spaece import armazem
+from spaece.carregamento import ARQUIVO_MUN, COLUNAS_MUN
+from spaece.hierarquia import cubos_hierarquia, acrescenta_hierarquia, indice_crede, acrescenta_indice_crede, CHAVES_CUBOS
+from spaece.ingestao import acrescenta_edicao
+from spaece.snapshot import constroi_snapshot
+
+
+# Armazém compartilhado sobre o snapshot da tabela municipal sintética (fixture `tabela_mun`, tests/conftest.py):
+# o mesmo dataframe para todas as sessões, somente leitura, e uma edição acrescentada (spaece/ingestao.py) que deixa
+# tabela, índices e cubos iguais aos da reconstrução completa. Uso: python -m pytest -q tests
+
+
+def test_sessoes_recebem_os_mesmos_arrays(tabela_mun):
+    primeira = armazem.obtem_tabela(ARQUIVO_MUN, COLUNAS_MUN)
+    segunda = armazem.obtem_tabela(ARQUIVO_MUN, COLUNAS_MUN)
+
+    assert primeira is not segunda                  # Visões rasas: colunas acrescentadas em uma não aparecem na outra
+    for coluna in ['Proficiência Média', 'Nº de Alunos Avaliados', '% Adequado']:
+        assert np.shares_memory(primeira[coluna].to_numpy(), segunda[coluna].to_numpy())
+    assert np.shares_memory(primeira['Município'].cat.codes.to_numpy(), segunda['Município'].cat.codes.to_numpy())
+
+def test_alteracao_no_lugar_e_recusada(tabela_mun):
+    dados = armazem.obtem_tabela(ARQUIVO_MUN, COLUNAS_MUN)
+    original = dados['Proficiência Média'].iloc[0]
+
+    with pytest.raises(ValueError, match='read-only'):
+        dados.loc[dados.index[0], 'Proficiência Média'] = -1.0
+    with pytest.raises(ValueError, match='read-only'):
+        dados['Nº de Alunos Avaliados'].fillna(0, inplace=True)
+    with pytest.raises(ValueError, match='read-only'):
+        dados.iloc[0, dados.columns.get_loc('Município')] = dados['Município'].iloc[1]
+
+    # Substituir a coluna inteira fica só na visão desta sessão
+    dados['Proficiência Média'] = 0.0
+    assert armazem.obtem_tabela(ARQUIVO_MUN, COLUNAS_MUN)['Proficiência Média'].iloc[0] == original
+
+
+## ------------------------ EDIÇÃO ACRESCENTADA X RECONSTRUÇÃO COMPLETA ------------------------ ##
+
+CHAVES_LINHA = ['Rede', 'Componente', 'Etapa', 'Município', 'Edição']
+
+## Funcao que pede ao armazém a tabela e os derivados usados pelas páginas (como uma sessão)
+def _derivados():
+    return {'dados': armazem.obtem_tabela(ARQUIVO_MUN, COLUNAS_MUN),
+            'indice': armazem.obtem_indice(ARQUIVO_MUN, COLUNAS_MUN),
+            'cubo': armazem.obtem_cubo(ARQUIVO_MUN, COLUNAS_MUN),
+            'hierarquia': armazem.obtem_derivado(ARQUIVO_MUN, COLUNAS_MUN, 'hierarquia', cubos_hierarquia, acrescenta_hierarquia),
+            'indice_crede': armazem.obtem_derivado(ARQUIVO_MUN, COLUNAS_MUN, 'indice_crede', indice_crede, acrescenta_indice_crede)}
+
+## Funcao que compara duas tabelas pelas linhas (a ordem das linhas e das categorias pode diferir)
+def _mesmas_linhas(primeira, segunda, chaves):
+    ordena = lambda tabela: tabela.sort_values(chaves).reset_index(drop=True)
+    pd.testing.assert_frame_equal(ordena(primeira), ordena(segunda), check_categorical=False)
+
+def test_edicao_acrescentada_igual_a_reconstrucao(publica, dados_mun, tmp_path, monkeypatch):
+    ultima = dados_mun['Edição'] == dados_mun['Edição'].max()
+    publica(dados_mun[~ultima])
+    dados_mun[ultima].to_csv(tmp_path / 'nova_edicao.csv', index=False)
+    constroi_snapshot(ARQUIVO_MUN)
+    _derivados()
+
+    # O armazém lê só as linhas da edição nova e atualiza os derivados (sem reler a tabela inteira)
+    leituras = []
+    le_snapshot = armazem.le_snapshot
+    monkeypatch.setattr(armazem, 'le_snapshot', lambda *args: leituras.append(args[2:]) or le_snapshot(*args))
+    acrescenta_edicao(ARQUIVO_MUN, str(tmp_path / 'nova_edicao.csv'))
+    incremental = _derivados()
+    assert leituras == [({'Edição': [int(dados_mun['Edição'].max())]},)]
+    assert len(incremental['dados']) == len(dados_mun)
+    monkeypatch.setattr(armazem, 'le_snapshot', le_snapshot)
+
+    # Reconstrução completa: CSV inteiro publicado, snapshot refeito e armazém vazio
+    publica(dados_mun)
+    constroi_snapshot(ARQUIVO_MUN)
+    armazem._armazem.clear()
+    completo = _derivados()
+
+    _mesmas_linhas(incremental['dados'], completo['dados'], CHAVES_LINHA)
+    _mesmas_linhas(incremental['cubo'].tabela, completo['cubo'].tabela, CHAVES_LINHA)
+    for nivel in ['crede', 'estado']:
+        _mesmas_linhas(incremental['hierarquia'][nivel].tabela, completo['hierarquia'][nivel].tabela, CHAVES_CUBOS[nivel])
+
+    edicoes = sorted(dados_mun['Edição'].unique())
+    municipio = completo['dados']['Município'].iloc[0]
+    crede = completo['dados']['CREDE'].iloc[0]
+    for filtros in [{'Rede': 'Municipal', 'Componente': 'Matemática', 'Edição': edicoes[-2:]},
+                    {'Município': municipio, 'Edição': edicoes}, {'Edição': edicoes[-1]}]:
+        _mesmas_linhas(incremental['indice'].seleciona(filtros), completo['indice'].seleciona(filtros), CHAVES_LINHA)
+        _mesmas_linhas(incremental['cubo'].seleciona(filtros, (150, 250)), completo['cubo'].seleciona(filtros, (150, 250)), CHAVES_LINHA)
+        _mesmas_linhas(incremental['indice_crede'].seleciona({**filtros, 'CREDE': crede}),
+                       completo['indice_crede'].seleciona({**filtros, 'CREDE': crede}), CHAVES_LINHA)
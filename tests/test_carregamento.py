@@ -0,0 +1,155 @@
+import http.server                                  # Lib nativa para o servidor HTTP local (no lugar do GitHub)
+import threading
+
+import pandas as pd                                 # Lib para manipução e tratamento de dados, tabelas e dataframes
+import pytest
+
+from spaece.carregamento import CacheMemoria
+
+
+# CacheMemoria contra um servidor HTTP local: revalidação com ETag / Last-Modified, recarga quando o arquivo muda
+# e cópia em disco quando o servidor não responde. Uso: python -m pytest -q tests
+
+ARQUIVO = 'memoria_teste.csv'
+
+
+## Servidor HTTP com um único arquivo em memória; responde 304 quando o If-None-Match / If-Modified-Since confere
+class _Servidor(http.server.ThreadingHTTPServer):
+
+    def __init__(self):
+        super().__init__(('127.0.0.1', 0), _Arquivo)
+        self.conteudo, self.etag, self.last_modified = b'', None, None
+        self.requisicoes = []                       # (status, cabeçalhos recebidos) de cada GET
+
+    def publica(self, conteudo, etag=None, last_modified=None):
+        self.conteudo, self.etag, self.last_modified = conteudo, etag, last_modified
+
+    @property
+    def url(self):
+        return f'http://127.0.0.1:{self.server_address[1]}'
+
+class _Arquivo(http.server.BaseHTTPRequestHandler):
+
+    def do_GET(self):
+        servidor = self.server
+        if self.path != f'/{ARQUIVO}':
+            status = 404
+        elif servidor.etag and self.headers.get('If-None-Match') == servidor.etag:
+            status = 304
+        elif not servidor.etag and servidor.last_modified and self.headers.get('If-Modified-Since') == servidor.last_modified:
+            status = 304
+        else:
+            status = 200
+        servidor.requisicoes.append((status, dict(self.headers)))
+        self.send_response(status)
+        if status == 200:
+            if servidor.etag:
+                self.send_header('ETag', servidor.etag)
+            if servidor.last_modified:
+                self.send_header('Last-Modified', servidor.last_modified)
+            self.send_header('Content-Length', str(len(servidor.conteudo)))
+        self.end_headers()
+        if status == 200:
+            self.wfile.write(servidor.conteudo)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def servidor():
+    servidor = _Servidor()
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    yield servidor
+    servidor.shutdown()
+    servidor.server_close()
+
+## Leitor que conta as leituras do arquivo em disco (cada leitura é um dataframe novo)
+class _Leitor:
+
+    def __init__(self):
+        self.leituras = 0
+
+    def __call__(self, caminho):
+        self.leituras += 1
+        return pd.read_csv(caminho)
+
+def _cache(servidor, diretorio, leitor=None):
+    return CacheMemoria(url_base=servidor.url, diretorio=str(diretorio), intervalo=0, leitor=leitor or _Leitor())
+
+
+def test_304_mantem_o_dataframe_em_memoria(servidor, tmp_path):
+    servidor.publica(b'Edicao,Valor\n2022,1\n', etag='"v1"')
+    cache = _cache(servidor, tmp_path)
+
+    primeiro = cache.carrega(ARQUIVO)
+    segundo = cache.carrega(ARQUIVO)
+
+    assert segundo is primeiro
+    assert cache.leitor.leituras == 1
+    assert [status for status, _ in servidor.requisicoes] == [200, 304]
+    assert servidor.requisicoes[1][1].get('If-None-Match') == '"v1"'
+
+def test_last_modified_sem_etag(servidor, tmp_path):
+    servidor.publica(b'Edicao,Valor\n2022,1\n', last_modified='Mon, 02 Jan 2023 10:00:00 GMT')
+    cache = _cache(servidor, tmp_path)
+
+    primeiro = cache.carrega(ARQUIVO)
+
+    assert cache.carrega(ARQUIVO) is primeiro
+    assert [status for status, _ in servidor.requisicoes] == [200, 304]
+    assert servidor.requisicoes[1][1].get('If-Modified-Since') == 'Mon, 02 Jan 2023 10:00:00 GMT'
+
+def test_etag_novo_recarrega_e_muda_a_versao(servidor, tmp_path):
+    servidor.publica(b'Edicao,Valor\n2022,1\n', etag='"v1"')
+    cache = _cache(servidor, tmp_path)
+    primeiro = cache.carrega(ARQUIVO)
+    versao = cache.versao(ARQUIVO)
+
+    servidor.publica(b'Edicao,Valor\n2022,1\n2023,2\n', etag='"v2"')
+    segundo = cache.carrega(ARQUIVO)
+
+    assert segundo is not primeiro
+    assert segundo['Edicao'].tolist() == [2022, 2023]
+    assert cache.leitor.leituras == 2
+    assert cache.versao(ARQUIVO) != versao
+    assert (tmp_path / ARQUIVO).read_bytes() == b'Edicao,Valor\n2022,1\n2023,2\n'
+
+def test_servidor_fora_do_ar_usa_a_copia_em_disco(servidor, tmp_path):
+    servidor.publica(b'Edicao,Valor\n2022,1\n', etag='"v1"')
+    cache = _cache(servidor, tmp_path)
+    em_memoria = cache.carrega(ARQUIVO)
+    versao = cache.versao(ARQUIVO)
+    servidor.shutdown()
+    servidor.server_close()
+
+    # Mesmo processo: segue com o dataframe em memória; processo novo: lê a cópia em disco
+    assert cache.carrega(ARQUIVO) is em_memoria
+    novo = _cache(servidor, tmp_path)
+    assert novo.carrega(ARQUIVO)['Edicao'].tolist() == [2022]
+    assert novo.versao(ARQUIVO) == versao
+
+def test_servidor_fora_do_ar_sem_copia_em_disco(servidor, tmp_path):
+    url = servidor.url
+    servidor.shutdown()
+    servidor.server_close()
+    cache = CacheMemoria(url_base=url, diretorio=str(tmp_path), intervalo=0, leitor=_Leitor())
+
+    with pytest.raises(ConnectionError, match=f'{ARQUIVO}.*não há cópia em cache'):
+        cache.carrega(ARQUIVO)
+
+@pytest.mark.parametrize('metadados', [None, b'{"etag": ', b'{}'])
+def test_servidor_fora_do_ar_com_copia_em_disco_sem_metadados(servidor, tmp_path, metadados):
+    servidor.publica(b'Edicao,Valor\n2022,1\n', etag='"v1"')
+    versao = _cache(servidor, tmp_path).versao(ARQUIVO)
+    servidor.shutdown()
+    servidor.server_close()
+    if metadados is None:
+        (tmp_path / f'{ARQUIVO}.json').unlink()
+    else:
+        (tmp_path / f'{ARQUIVO}.json').write_bytes(metadados)
+
+    # Metadados ausentes ou corrompidos: lê a cópia em disco, com a versão calculada do conteúdo (a mesma do download)
+    cache = _cache(servidor, tmp_path)
+    assert cache.carrega(ARQUIVO)['Edicao'].tolist() == [2022]
+    assert cache.versao(ARQUIVO) == versao
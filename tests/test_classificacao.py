@@ -0,0 +1,48 @@
+import numpy as np
+import pandas as pd
+
+from spaece.classificacao import agrupa_por_faixa, classifica_padroes
+from spaece.etapas import ETAPAS
+
+
+# Classificação vetorizada nos padrões de desempenho contra o pd.cut de cada (Etapa, Componente), inclusive nos pontos
+# de corte, fora deles e em combinações sem cortes. Uso: python -m pytest -q tests
+
+
+def _tabela():
+    linhas = []
+    for espec in ETAPAS:
+        for componente in ['Língua Portuguesa', 'Matemática']:
+            cortes = espec['cortes'].get(componente, [0, 500])
+            valores = sorted({c + d for c in cortes for d in (-0.06, -0.04, 0, 0.04, 0.06)}) + [-10, 510, np.nan]
+            linhas += [(espec['etapa'], componente, v) for v in valores]
+    linhas.append(('Etapa sem cortes', 'Língua Portuguesa', 200.0))
+    return pd.DataFrame(linhas, columns=['Etapa', 'Componente', 'Proficiência Média'])
+
+def _pd_cut(tabela):
+    esperado = np.full(len(tabela), -1)
+    for espec in ETAPAS:
+        for componente, cortes in espec['cortes'].items():
+            linhas = ((tabela['Etapa'] == espec['etapa']) & (tabela['Componente'] == componente)).to_numpy()
+            faixas = pd.cut(tabela.loc[linhas, 'Proficiência Média'].round(1), cortes, labels=False)
+            esperado[linhas] = faixas.fillna(-1).to_numpy()
+    return esperado
+
+def test_igual_ao_pd_cut():
+    tabela = _tabela()
+    assert classifica_padroes(tabela).tolist() == _pd_cut(tabela).tolist()
+
+def test_igual_ao_pd_cut_com_categoricas():
+    tabela = _tabela().astype({'Etapa': 'category', 'Componente': 'category'}).iloc[::-1].reset_index(drop=True)
+    assert classifica_padroes(tabela).tolist() == _pd_cut(tabela).tolist()
+
+def test_sem_linhas_e_sem_cortes():
+    assert len(classifica_padroes(_tabela().iloc[:0])) == 0
+    assert (classifica_padroes(_tabela(), etapas=[]) == -1).all()
+
+def test_agrupa_por_faixa():
+    faixas = np.array([1, -1, 0, 1, 0])
+    grupos = agrupa_por_faixa(faixas, 3, np.array([10, 11, 12, 13, 14]), ['a', 'b', 'c', 'd', 'e'])
+
+    assert [g[0].tolist() for g in grupos] == [[12, 14], [10, 13], []]      # Sem faixa (-1) fica de fora
+    assert [g[1].tolist() for g in grupos] == [['c', 'e'], ['a', 'd'], []]
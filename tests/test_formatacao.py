@@ -0,0 +1,46 @@
+import numpy as np
+import pandas as pd
+
+from spaece.formatacao import (formata_decimal, formata_diferenca, formata_numero, formata_proficiencia, formata_taxa,
+                               rotulos_categoricos)
+
+
+# Formatação no padrão brasileiro: escalares, arrays e Series devem dar os mesmos textos. Uso: python -m pytest -q tests
+
+
+def test_formata_decimal():
+    assert formata_decimal(1234.56) == '1.234,6'
+    assert formata_decimal(1234.5, milhar=False) == '1234,5'
+    assert formata_decimal(np.array([[1.25, 1234.5]]), 2).tolist() == [['1,25', '1.234,50']]
+    assert formata_taxa(89.64) == '89,6'
+    assert formata_proficiencia(250.0) == '250,0'
+
+def test_formata_decimal_preserva_a_series():
+    serie = pd.Series([0.5, 1000.0, 0.5], index=[10, 20, 30], name='Proficiência Média')
+    formatada = formata_decimal(serie)
+
+    assert formatada.tolist() == ['0,5', '1.000,0', '0,5']
+    assert formatada.index.tolist() == [10, 20, 30]
+    assert formatada.name == 'Proficiência Média'
+
+def test_formata_numero():
+    assert formata_numero(999) == ' 999 '
+    assert formata_numero(1234) == ' 1,23 mil'
+    assert formata_numero(5000) == ' 5 mil'
+    assert formata_numero(2500000) == ' 2,50 milhões'
+    assert formata_numero(np.array([999, 5000])).tolist() == [' 999 ', ' 5 mil']
+    assert formata_numero(pd.Series([1234, 0], index=[7, 8])).to_dict() == {7: ' 1,23 mil', 8: ' 0 '}
+
+def test_formata_diferenca():
+    assert formata_diferenca(10, 8.5, formata_decimal, ' p.p.') == '1,5 p.p.'
+    assert formata_diferenca(150.0, 160.0, formata_proficiencia) == '-10,0'
+    assert formata_diferenca(np.nan, 1.0, formata_decimal) is None    # Nenhuma proficiência no intervalo: sem delta
+    assert formata_diferenca(1.0, None, formata_decimal) is None
+
+def test_rotulos_categoricos():
+    rotulos = rotulos_categoricos([1.0, 1234.5, 1.0])
+
+    assert isinstance(rotulos, pd.Categorical)
+    assert list(rotulos) == ['1,0', '1234,5', '1,0']
+    assert len(rotulos.categories) == 2
+    assert len(rotulos_categoricos([])) == 0
@@ -0,0 +1,66 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmarks.sintetico import gera_memoria
+from spaece.esquema import aplica_esquema
+from spaece.hierarquia import CHAVES_CREDE, CHAVES_ESTADO, CuboLinhas, constroi_hierarquia, cubos_hierarquia, indice_crede
+from spaece.normalizacao import normaliza_memoria
+
+
+# Hierarquia município -> CREDE -> estado contra médias ponderadas calculadas direto das linhas dos municípios, e o
+# filtro de proficiência do CuboLinhas aplicado às linhas (não às médias das células). Uso: python -m pytest -q tests
+
+
+@pytest.fixture
+def dados():
+    return normaliza_memoria(aplica_esquema(gera_memoria(1, municipios=8)))
+
+## Funcao que agrega as linhas no nível `chaves` com pandas: médias ponderadas pelos avaliados, contagens somadas
+# e participação recalculada das contagens
+def _esperado(dados, chaves):
+    linhas = dados.assign(**{'Nº de Alunos Avaliados': dados['Nº de Alunos Avaliados'].astype('float64'),
+                             'Nº de Alunos Previstos': dados['Nº de Alunos Previstos'].astype('float64')})
+    grupos = linhas.groupby(chaves, observed=True, sort=True)
+    esperado = grupos[['Nº de Alunos Previstos', 'Nº de Alunos Avaliados']].sum()
+    for coluna in ['Proficiência Média', '% Adequado']:
+        peso = linhas['Nº de Alunos Avaliados'].where(linhas[coluna].notna(), 0)
+        esperado[coluna] = (linhas[coluna] * peso).groupby([linhas[c] for c in chaves], observed=True).sum() / \
+            peso.groupby([linhas[c] for c in chaves], observed=True).sum()
+    esperado['Participação (%)'] = esperado['Nº de Alunos Avaliados'] / esperado['Nº de Alunos Previstos'] * 100
+    return esperado.reset_index()
+
+def _compara(obtido, esperado):
+    colunas = list(esperado.columns)
+    for coluna in colunas[-5:]:
+        np.testing.assert_allclose(obtido[coluna].to_numpy('float64'), esperado[coluna].to_numpy('float64'), rtol=1e-5)
+    assert obtido[colunas[:-5]].astype(str).values.tolist() == esperado[colunas[:-5]].astype(str).values.tolist()
+
+def test_niveis_ponderados(dados):
+    niveis = constroi_hierarquia(dados)
+
+    assert len(niveis['municipio']) == len(dados)   # Uma linha por célula na tabela municipal
+    _compara(niveis['crede'], _esperado(dados, CHAVES_CREDE))
+    _compara(niveis['estado'], _esperado(dados, CHAVES_ESTADO))
+    assert niveis['estado']['Nº de Linhas'].sum() == len(dados)
+
+def test_cubo_linhas_filtra_as_linhas(dados):
+    cubos = cubos_hierarquia(dados)
+    indice = indice_crede(dados)
+    crede = dados['CREDE'].cat.categories[0]
+    filtros = {'Rede': 'Municipal', 'Componente': 'Língua Portuguesa', 'CREDE': crede}
+
+    # Intervalo que não retira linhas: as células do cubo materializado
+    cubo = CuboLinhas(cubos['crede'], indice, 'crede')
+    pd.testing.assert_frame_equal(cubo.seleciona(filtros, (0, 500)), cubos['crede'].seleciona(filtros))
+
+    # Intervalo que retira linhas: só as linhas dentro dele entram nas médias de cada célula
+    linhas = indice.seleciona(filtros, (180, 260))
+    assert 0 < len(linhas) < indice.conta(filtros)
+    _compara(cubo.seleciona(filtros, (180, 260)).sort_values(CHAVES_CREDE).reset_index(drop=True), _esperado(linhas, CHAVES_CREDE))
+    estado = CuboLinhas(cubos['estado'], indice, 'estado').seleciona(filtros, (180, 260))
+    _compara(estado, _esperado(linhas, CHAVES_ESTADO))
+
+    # Nenhuma linha no intervalo: seleção vazia com as colunas do cubo
+    vazio = cubo.seleciona(filtros, (600, 700))
+    assert vazio.empty and list(vazio.columns) == list(cubos['crede'].tabela.columns)
@@ -0,0 +1,64 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmarks.sintetico import gera_memoria
+from spaece.esquema import aplica_esquema, concatena_tabelas
+from spaece.indice import IndiceFiltro
+from spaece.normalizacao import normaliza_memoria
+
+
+# Seleção pelo índice dos filtros (buscas binárias sobre as chaves combinadas) contra a mesma seleção por máscaras
+# booleanas, e índice acrescentado igual ao índice refeito. Uso: python -m pytest -q tests
+
+
+@pytest.fixture
+def dados():
+    dados = normaliza_memoria(aplica_esquema(gera_memoria(1, municipios=4)))
+    dados.loc[::17, 'Proficiência Média'] = np.nan   # Linhas sem proficiência: o filtro de proficiência as descarta
+    return dados
+
+def _mascara(dados, filtros, proficiencia=None):
+    linhas = np.ones(len(dados), dtype=bool)
+    for coluna, valor in filtros.items():
+        if valor is not None:
+            valores = [valor] if isinstance(valor, str) or not hasattr(valor, '__iter__') else list(valor)
+            linhas &= dados[coluna].isin(valores).to_numpy()
+    if proficiencia is not None:
+        linhas &= dados['Proficiência Média'].between(*proficiencia).to_numpy()
+    return dados[linhas]
+
+def _filtros(dados):
+    municipios = list(dados['Município'].cat.categories)
+    return [{},
+            {'Rede': 'Municipal', 'Componente': 'Matemática'},
+            {'Município': municipios[:2], 'Edição': [2008, 2022], 'Etapa': None},
+            {'Rede': 'Estadual', 'Município': municipios[-1], 'Edição': 2015},
+            {'Município': 'Município inexistente'},
+            {'Edição': []}]
+
+def test_seleciona_igual_as_mascaras(dados):
+    indice = IndiceFiltro(dados)
+    for filtros in _filtros(dados):
+        for proficiencia in [None, (150, 250)]:
+            pd.testing.assert_frame_equal(indice.seleciona(filtros, proficiencia), _mascara(dados, filtros, proficiencia))
+            assert indice.conta(filtros) == len(_mascara(dados, filtros))
+
+def test_seleciona_colunas(dados):
+    indice = IndiceFiltro(dados)
+    selecao = indice.seleciona({'Rede': 'Municipal'}, (0, 500), ['Município', 'Proficiência Média'])
+
+    assert list(selecao.columns) == ['Município', 'Proficiência Média']
+    pd.testing.assert_frame_equal(selecao, _mascara(dados, {'Rede': 'Municipal'}, (0, 500))[['Município', 'Proficiência Média']])
+
+def test_acrescenta_igual_ao_indice_refeito(dados):
+    ultima = (dados['Edição'] == 2022).to_numpy()
+    novas = dados[ultima].copy()
+    novas['Município'] = novas['Município'].astype(str).str.replace('Municipio 000', 'Municipio Novo')  # Categoria nova
+    todas = concatena_tabelas(dados[~ultima].reset_index(drop=True), novas)
+
+    acrescentado = IndiceFiltro(dados[~ultima].reset_index(drop=True)).acrescenta(todas)
+    refeito = IndiceFiltro(todas)
+    assert acrescentado.conta({'Município': 'Municipio Novo de Teste'}) == (novas['Município'] == 'Municipio Novo de Teste').sum() > 0
+    for filtros in _filtros(todas) + [{'Município': 'Municipio Novo de Teste', 'Edição': 2022}]:
+        pd.testing.assert_frame_equal(acrescentado.seleciona(filtros), refeito.seleciona(filtros))
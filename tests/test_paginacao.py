@@ -0,0 +1,44 @@
+import numpy as np
+import pandas as pd
+
+from spaece.paginacao import TabelaPaginada
+
+
+# Tabela paginada: busca sem acentos, ordenação estável com ausentes no fim e páginas limitadas. Uso: python -m pytest -q tests
+
+
+def _tabela():
+    return pd.DataFrame({'Município': pd.Categorical(['Fortaleza', 'Caucaia', 'Ceará-Mirim', 'Crato', None]),
+                         'Proficiência Média': [150.0, np.nan, 140.0, 150.0, 120.0],
+                         'Edição': [2019, 2019, 2022, 2022, 2022]})
+
+def test_busca_sem_acentos_e_sem_caixa():
+    tabela = TabelaPaginada(_tabela())
+
+    assert tabela.busca('Município', 'CEARA').pagina(1, 25)['Município'].tolist() == ['Ceará-Mirim']
+    assert len(tabela.busca('Município', 'a')) == 4                 # O município ausente nunca casa
+    assert tabela.busca('Município', '  ') is tabela                # Termo vazio não filtra
+    assert len(tabela.busca('Edição', '2022')) == 3
+
+def test_ordena_estavel_com_ausentes_no_fim():
+    tabela = TabelaPaginada(_tabela())
+
+    crescente = tabela.ordena('Proficiência Média').pagina(1, 25)
+    assert crescente['Proficiência Média'].tolist()[:4] == [120.0, 140.0, 150.0, 150.0]
+    assert crescente['Município'].tolist()[2:4] == ['Fortaleza', 'Crato']   # Empate: ordem original
+    assert np.isnan(crescente['Proficiência Média'].iloc[-1])
+
+    decrescente = tabela.ordena('Proficiência Média', crescente=False).pagina(1, 25)
+    assert decrescente['Município'].tolist()[:2] == ['Fortaleza', 'Crato']
+    assert np.isnan(decrescente['Proficiência Média'].iloc[-1])
+    assert tabela.ordena('Município').pagina(1, 25)['Município'].isna().tolist()[-1]
+
+def test_paginas():
+    tabela = TabelaPaginada(_tabela())
+
+    assert tabela.paginas(2) == 3
+    assert TabelaPaginada(_tabela().iloc[:0]).paginas(25) == 1
+    assert tabela.pagina(2, 2, ['Edição'])['Edição'].tolist() == [2022, 2022]
+    assert tabela.pagina(9, 2).index.tolist() == [4]                  # Além da última: última página
+    assert tabela.pagina(0, 2).index.tolist() == [0, 1]
+    assert tabela.busca('Município', 'cra').ordena('Edição').pagina(1, 25).index.tolist() == [3]
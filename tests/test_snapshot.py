@@ -0,0 +1,63 @@
+import os
+
+from spaece.carregamento import ARQUIVO_MUN, versao_memoria
+from spaece.ingestao import acrescenta_edicao
+from spaece.snapshot import (PREFIXO_ACRESCIMO, _caminho_dataset, constroi_snapshot, edicoes_acrescidas, le_snapshot,
+                             versao_edicoes, versao_tabela)
+
+
+# Versões do snapshot da tabela municipal sintética (fixtures em tests/conftest.py) com edições acrescentadas depois
+# da construção (spaece/ingestao.py) e reconstrução a partir do CSV. Uso: python -m pytest -q tests
+
+
+## Funcao que publica a tabela sem as duas últimas edições, constrói o snapshot e acrescenta as duas, uma de cada vez
+# Devolve as versões: base, depois do primeiro e depois do segundo acréscimo, e as duas edições acrescentadas
+def _acrescenta_duas(publica, dados, pasta):
+    penultima, ultima = sorted(dados['Edição'].unique())[-2:]
+    publica(dados[dados['Edição'] < penultima])
+    constroi_snapshot(ARQUIVO_MUN)
+    versoes = [versao_tabela(ARQUIVO_MUN)]
+    for edicao in [penultima, ultima]:
+        dados[dados['Edição'] == edicao].to_csv(pasta / f'edicao_{edicao}.csv', index=False)
+        acrescenta_edicao(ARQUIVO_MUN, str(pasta / f'edicao_{edicao}.csv'))
+        versoes.append(versao_tabela(ARQUIVO_MUN))
+    return versoes, [int(penultima), int(ultima)]
+
+
+def test_edicoes_acrescidas(publica, dados_mun, tmp_path):
+    (base, primeira, segunda), (penultima, ultima) = _acrescenta_duas(publica, dados_mun, tmp_path)
+
+    assert len({base, primeira, segunda}) == 3
+    assert edicoes_acrescidas(ARQUIVO_MUN, base) == (segunda, [penultima, ultima])
+    assert edicoes_acrescidas(ARQUIVO_MUN, primeira) == (segunda, [ultima])
+    assert edicoes_acrescidas(ARQUIVO_MUN, segunda) == (segunda, [])
+    assert edicoes_acrescidas(ARQUIVO_MUN, 'outra') == (segunda, None)     # Não é um estado anterior: relê tudo
+
+def test_versao_edicoes(publica, dados_mun, tmp_path):
+    (base, primeira, segunda), (penultima, ultima) = _acrescenta_duas(publica, dados_mun, tmp_path)
+    anteriores = sorted(int(e) for e in dados_mun['Edição'].unique())[:-2]
+
+    # Edições anteriores aos acréscimos mantêm a versão base (os caches delas seguem válidos)
+    assert versao_edicoes(ARQUIVO_MUN, anteriores) == base
+    assert versao_edicoes(ARQUIVO_MUN, anteriores + [penultima]) == primeira
+    assert versao_edicoes(ARQUIVO_MUN, [ultima]) != versao_edicoes(ARQUIVO_MUN, [penultima])
+    assert versao_edicoes(ARQUIVO_MUN, anteriores + [penultima, ultima]) == segunda
+
+def test_versoes_sem_snapshot(publica, dados_mun):
+    publica(dados_mun)
+    versao = versao_memoria(ARQUIVO_MUN)
+
+    assert versao_tabela(ARQUIVO_MUN) == versao
+    assert versao_edicoes(ARQUIVO_MUN, [2022]) == versao
+    assert edicoes_acrescidas(ARQUIVO_MUN, versao) == (versao, None)
+
+def test_reconstrucao_descarta_acrescimos_e_particoes_antigas(publica, dados_mun, tmp_path):
+    _acrescenta_duas(publica, dados_mun, tmp_path)
+    publica(dados_mun[dados_mun['Rede'] == 'ESTADUAL'])
+    constroi_snapshot(ARQUIVO_MUN)
+
+    caminho = _caminho_dataset(ARQUIVO_MUN)
+    arquivos = [nome for _, _, nomes in os.walk(caminho) for nome in nomes]
+    assert not [nome for nome in arquivos if nome.startswith(PREFIXO_ACRESCIMO)]
+    assert sorted(os.listdir(caminho)) == ['Rede=Estadual', '_metadados.json']
+    assert le_snapshot(ARQUIVO_MUN, ['Rede'])['Rede'].unique().tolist() == ['Estadual']